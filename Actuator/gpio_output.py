@@ -0,0 +1,149 @@
+"""
+GPIO 출력 뱅크 (섀도 레지스터 + 쓰기 묶음 처리)
+
+모든 액추에이터 출력 핀의 현재 상태를 섀도 레지스터에 보관하고,
+- 이미 같은 값인 핀은 다시 쓰지 않음
+- batch() 구간의 변경은 모아 두었다가 한 번의 gpio.output(핀 리스트, 값 리스트) 호출로 적용
+  (같은 액추에이터의 핀들이 파이썬 코드 사이사이가 아니라 한 번에 바뀜)
+- 실제 GPIO 호출 횟수(write_count)를 기록
+"""
+import threading
+from contextlib import contextmanager
+
+HIGH = 1
+LOW = 0
+
+
+class GPIOOutputBank:
+    """출력 핀 섀도 레지스터 (스레드 안전)"""
+
+    def __init__(self, gpio_module=None):
+        """
+        Args:
+            gpio_module: RPi.GPIO 호환 모듈 (기본값: HAL 백엔드의 gpio)
+        """
+        if gpio_module is None:
+            from hal.backend import gpio as gpio_module
+        self.gpio = gpio_module
+        self._levels = {}  # 핀 -> 현재 출력 값
+        # batch()는 스레드마다 따로 (제어 주기/정지가 여러 스레드에서 동시에 batch 가능)
+        self._pending = {}  # 스레드 id -> batch() 중 적용 대기 값
+        self._batch_depth = {}  # 스레드 id -> batch() 중첩 깊이
+        self._lock = threading.RLock()
+
+        # 통계
+        self.write_count = 0  # gpio.output 호출 수
+        self.pin_writes = 0  # 실제로 바뀐 핀 수
+        self.skipped = 0  # 같은 값이라 생략한 핀 수
+
+        try:
+            self.gpio.setmode(self.gpio.BCM)
+        except (RuntimeError, ValueError):
+            pass  # 이미 설정됨
+
+    def setup(self, pins, initial=LOW):
+        """출력 핀 설정 (초기값을 바로 씀)"""
+        with self._lock:
+            for pin in pins:
+                self.gpio.setup(pin, self.gpio.OUT, initial=initial)
+                self._levels[pin] = initial
+
+    def level(self, pin):
+        """섀도 레지스터의 현재 값 (이 스레드의 batch 대기 값 포함), 설정 안 된 핀은 None"""
+        with self._lock:
+            pending = self._pending.get(threading.get_ident(), {})
+            return pending.get(pin, self._levels.get(pin))
+
+    def write(self, levels):
+        """
+        핀 값 쓰기 (batch 중이면 모아 두었다가 batch 끝에 적용)
+
+        Args:
+            levels: {핀: HIGH/LOW} - 한 액추에이터의 핀들은 함께 넘김
+        """
+        with self._lock:
+            ident = threading.get_ident()
+            if ident in self._batch_depth:
+                self._pending[ident].update(levels)
+                return
+            # batch 밖의 쓰기(예: 비상 정지)는 즉시 적용, 다른 스레드의 대기 값은 버려서 덮어쓰지 않게 함
+            self._discard_pending(levels)
+            self._apply(levels)
+
+    def _discard_pending(self, pins):
+        for pending in self._pending.values():
+            for pin in pins:
+                pending.pop(pin, None)
+
+    def _apply(self, levels):
+        pins = []
+        values = []
+        for pin, value in levels.items():
+            if self._levels.get(pin) == value:
+                self.skipped += 1
+                continue
+            pins.append(pin)
+            values.append(value)
+        if not pins:
+            return
+        if len(pins) == 1:
+            self.gpio.output(pins[0], values[0])
+        else:
+            self.gpio.output(pins, values)
+        self.write_count += 1
+        self.pin_writes += len(pins)
+        for pin, value in zip(pins, values):
+            self._levels[pin] = value
+
+    @contextmanager
+    def batch(self):
+        """구간 안의 쓰기를 모아 한 번에 적용 (중첩 가능, 스레드마다 따로 모음)"""
+        ident = threading.get_ident()
+        with self._lock:
+            depth = self._batch_depth.get(ident, 0)
+            if not depth:
+                self._pending[ident] = {}
+            self._batch_depth[ident] = depth + 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth[ident] -= 1
+                if not self._batch_depth[ident]:
+                    del self._batch_depth[ident]
+                    self._apply(self._pending.pop(ident))
+
+    def release(self, pins):
+        """핀 정리 (gpio.cleanup 후 섀도 레지스터에서 제거)"""
+        with self._lock:
+            for pin in pins:
+                self._levels.pop(pin, None)
+            self._discard_pending(pins)
+            self.gpio.cleanup(list(pins))
+
+    def stats(self):
+        """쓰기 통계"""
+        return {
+            'write_count': self.write_count,
+            'pin_writes': self.pin_writes,
+            'skipped': self.skipped,
+        }
+
+
+# 프로세스 공유 출력 뱅크 (처음 사용할 때 생성)
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_output_bank():
+    """공유 GPIO 출력 뱅크 반환"""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = GPIOOutputBank()
+        return _bank
+
+
+def as_pin_list(pin):
+    """핀 번호(int) 또는 리스트를 리스트로"""
+    return list(pin) if isinstance(pin, (list, tuple)) else [pin]
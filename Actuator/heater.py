@@ -1,43 +1,27 @@
-import RPi.GPIO as gpio
+from Actuator.gpio_output import HIGH, LOW, get_output_bank, as_pin_list
 
 class Heater:
-    def __init__(self, pin):
-        try:
-            gpio.setmode(gpio.BCM)
-        except RuntimeError:
-            pass  # 이미 설정됨
-        
+    def __init__(self, pin, bank=None):
         # 항상 self.pin을 설정
         self.pin = pin
-        
-        if isinstance(pin, int):
-            gpio.setup(self.pin, gpio.OUT)
-            gpio.output(self.pin, gpio.LOW)
-        elif isinstance(pin, list):
-            for p in self.pin:
-                gpio.setup(p, gpio.OUT)
-                gpio.output(p, gpio.LOW)
+        self.pins = as_pin_list(pin)
+
+        # 공유 GPIO 출력 뱅크 (핀 여러 개를 한 번에 씀)
+        self.bank = bank or get_output_bank()
+        self.bank.setup(self.pins, LOW)
         
         self.is_on = False
 
     def turn_on(self):
-        if isinstance(self.pin, list):
-            for p in self.pin:
-                gpio.output(p, gpio.HIGH)
-        else:
-            gpio.output(self.pin, gpio.HIGH)
+        self.bank.write(dict.fromkeys(self.pins, HIGH))
         self.is_on = True
 
     def turn_off(self):
-        if isinstance(self.pin, list):
-            for p in self.pin:
-                gpio.output(p, gpio.LOW)
-        else:
-            gpio.output(self.pin, gpio.LOW)
+        self.bank.write(dict.fromkeys(self.pins, LOW))
         self.is_on = False
 
     def cleanup(self):
-        gpio.cleanup(self.pin)
+        self.bank.release(self.pins)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,21 @@
-import RPi.GPIO as gpio
+from hal.backend import gpio
+import threading
 import time
+from concurrent.futures import Future
+from service.metrics import timer
 
 class ServoMotor:
-    def __init__(self, pin):
+    """서보모터 제어 (각도 명령은 백그라운드 작업 스레드에서 처리)"""
+    def __init__(self, pin, settle_time=1.0):
+        """
+        서보모터 초기화
+
+        Args:
+            pin: GPIO 핀 번호
+            settle_time: 각도 이동 후 PWM을 유지하는 시간 (초)
+        """
         self.pin = pin
+        self.settle_time = settle_time
         try:
             gpio.setmode(gpio.BCM)
         except RuntimeError:
@@ -12,15 +24,85 @@ class ServoMotor:
         self.pwm = gpio.PWM(self.pin, 50)  # 50Hz 주파수
         self.pwm.start(0)
 
-    def set_angle(self, angle):
+        self.angle = None  # 마지막으로 이동 완료한 각도
+        self._cond = threading.Condition()
+        self._pending = None  # (각도, Future) - 아직 실행되지 않은 최신 명령
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name=f"servo-{pin}", daemon=True)
+        self._worker.start()
+
+    def set_angle(self, angle, callback=None, wait=False):
+        """
+        목표 각도 명령 (즉시 반환)
+
+        아직 실행되지 않은 이전 명령은 새 명령으로 대체되고 취소됩니다.
+
+        Args:
+            angle: 목표 각도 (0~180)
+            callback: function(future) - 이동 완료(또는 취소) 시 호출
+            wait: True면 이동이 끝날 때까지 대기
+
+        Returns:
+            Future: 이동 완료 시 각도가 결과로 설정됨 (cleanup() 이후에는 RuntimeError로 완료)
+        """
+        future = Future()
+        if callback:
+            future.add_done_callback(callback)
+        with self._cond:
+            if not self._running:
+                # 작업 스레드가 끝났으므로 아무도 완료시키지 않음 - 바로 실패 처리
+                future.set_exception(RuntimeError(f"서보모터(GPIO {self.pin})가 이미 정리됨"))
+                if wait:
+                    future.result()
+                return future
+            if self._pending is not None:
+                self._pending[1].cancel()  # 대체된 명령
+            self._pending = (angle, future)
+            self._cond.notify()
+        if wait:
+            future.result()
+        return future
+
+    def _move(self, angle):
         duty_cycle = angle / 18 + 2  # 각도를 듀티 사이클로 변환
         gpio.output(self.pin, True)
         self.pwm.ChangeDutyCycle(duty_cycle)
-        time.sleep(1)
+        time.sleep(self.settle_time)
         gpio.output(self.pin, False)
         self.pwm.ChangeDutyCycle(0)
 
+    def _run(self):
+        """명령 처리 루프 (종료 요청 후에도 남은 명령은 처리)"""
+        while True:
+            with self._cond:
+                while self._pending is None and self._running:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                angle, future = self._pending
+                self._pending = None
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                with timer("actuator.servo.move"):
+                    self._move(angle)
+                self.angle = angle
+                future.set_result(angle)
+            except Exception as e:
+                future.set_exception(e)
+
     def cleanup(self):
+        # 남은 명령을 마치고 작업 스레드 종료
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._worker.join()
+        with self._cond:
+            if self._pending is not None:
+                self._pending[1].cancel()  # 작업 스레드가 처리하지 못한 명령
+                self._pending = None
+
         self.pwm.start(12.5)
         time.sleep(0.5)
         self.pwm.stop()
@@ -1,59 +1,47 @@
-import RPi.GPIO as GPIO
+from Actuator.gpio_output import HIGH, LOW, get_output_bank, as_pin_list
+from service.log import get_logger, fields
+
+log = get_logger("actuator.fan")
 
 class VentilationFan:
     """환기팬 제어 (ULN2003 릴레이 모듈 사용)"""
-    def __init__(self, pin):
+    def __init__(self, pin, bank=None):
         """
         환기팬 초기화
         
         Args:
             pin: GPIO 핀 번호 (int) 또는 핀 리스트 (list)
+            bank: GPIO 출력 뱅크 (기본값: 공유 뱅크)
         """
-        try:
-            GPIO.setmode(GPIO.BCM)
-        except RuntimeError:
-            pass  # 이미 설정됨
-        
         # 항상 self.pin을 설정
         self.pin = pin
-        
-        if isinstance(pin, int):
-            GPIO.setup(self.pin, GPIO.OUT)
-            GPIO.output(self.pin, GPIO.LOW)
-        elif isinstance(pin, list):
-            for p in self.pin:
-                GPIO.setup(p, GPIO.OUT)
-                GPIO.output(p, GPIO.LOW)
+        self.pins = as_pin_list(pin)
+
+        # 공유 GPIO 출력 뱅크 (핀 여러 개를 한 번에 씀)
+        self.bank = bank or get_output_bank()
+        self.bank.setup(self.pins, LOW)
         
         self.is_on = False
-        print(f"🌀 환기팬 초기화 완료 (GPIO {pin})")
+        log.info("환기팬 초기화 완료 (GPIO %s)", pin)
 
     def turn_on(self):
         """환기팬 켜기"""
-        if isinstance(self.pin, list):
-            for p in self.pin:
-                GPIO.output(p, GPIO.HIGH)
-        else:
-            GPIO.output(self.pin, GPIO.HIGH)
+        self.bank.write(dict.fromkeys(self.pins, HIGH))
         self.is_on = True
-        print(f"💨 환기팬 ON")
+        log.debug("환기팬 ON", extra=fields(actuator="fan"))
 
     def turn_off(self):
         """환기팬 끄기"""
-        if isinstance(self.pin, list):
-            for p in self.pin:
-                GPIO.output(p, GPIO.LOW)
-        else:
-            GPIO.output(self.pin, GPIO.LOW)
+        self.bank.write(dict.fromkeys(self.pins, LOW))
         self.is_on = False
-        print(f"🛑 환기팬 OFF")
+        log.debug("환기팬 OFF", extra=fields(actuator="fan"))
 
     def cleanup(self):
         """GPIO 정리"""
         if self.is_on:
             self.turn_off()
-        GPIO.cleanup(self.pin)
-        print(f"🧹 환기팬 GPIO 정리 완료")
+        self.bank.release(self.pins)
+        log.info("환기팬 GPIO 정리 완료")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+"""
+벤치마크용 디바이스 조립 (시뮬레이션 HAL + 로컬 브로커)
+
+main.py와 같은 구성 요소(MqttConnection, MqttClient, ActuatorController, 센서 캐시, ControlLoop)를
+슬롯 수만큼 만들어 줍니다. 하드웨어 모듈을 쓰기 전에 시뮬레이션 백엔드를 선택합니다.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from hal.backend import set_backend, SIM
+
+set_backend(SIM)
+
+from hal import sim  # noqa: E402
+from mqtt.mqtt_client import MqttClient  # noqa: E402
+from mqtt.mqtt_connection import MqttConnection  # noqa: E402
+from service.actuator_control import ActuatorController  # noqa: E402
+from service.control_loop import ControlLoop  # noqa: E402
+from service.read_sensors import init_sensor_caches, init_ultrasonic_sensor, stop_sensor_caches  # noqa: E402
+from service.water_tank_monitor import WaterTankMonitor  # noqa: E402
+from Actuator.heater import Heater  # noqa: E402
+from Actuator.water_pump import WaterPump  # noqa: E402
+from Actuator.ventilation_fan import VentilationFan  # noqa: E402
+from Actuator.servomotor import ServoMotor  # noqa: E402
+from Actuator.led import LED  # noqa: E402
+
+ADC_CHANNELS = 8  # MCP3008 채널 수
+ULTRASONIC_PINS = (23, 24)
+WATER_TANK_PIN = sim.board.D26
+
+
+def slot_pins(slot, has_co2=True):
+    """
+    슬롯별 가상 핀 배치
+
+    Returns:
+        (액추에이터 핀, 센서 핀)
+    """
+    base = 100 + slot * 10  # 실제 보드에 없는 번호라 슬롯 수 제한 없음
+    actuator_pins = {
+        'heater': [base, base + 1],
+        'led': [base + 2, base + 3, base + 4],
+        'water_ib1': base + 5,
+        'water_ib2': base + 6,
+        'fan': [base + 7, base + 8],
+        'servo': base + 9 if has_co2 else None,
+    }
+    sensor_pins = {
+        'dht11_pin': sim.SimPin(1000 + slot),
+        'photo_channel': (slot * 2) % ADC_CHANNELS,
+        'soil_channel': (slot * 2 + 1) % ADC_CHANNELS,
+        'co2_port': f'/dev/sim{slot}' if has_co2 else None,
+    }
+    return actuator_pins, sensor_pins
+
+
+class SimDevice:
+    """시뮬레이션 디바이스 (슬롯 N개)"""
+
+    def __init__(self, n_slots, broker, device_serial="A4900", has_co2=True, interval=10,
+                 offline_queue=None, publisher=None):
+        """
+        Args:
+            n_slots: 슬롯 수
+            broker: LocalBroker
+            has_co2: CO2 센서/서보 사용 여부
+            offline_queue: OfflineQueue (옵션)
+        """
+        self.slots = list(range(1, n_slots + 1))
+        self.device_serial = device_serial
+        self.has_co2 = has_co2
+        self.clients = {}
+        self.controllers = {}
+        self.servos = []
+        self.devices = []
+        self.sensor_pin_map = {}
+
+        self.connection = MqttConnection("local", offline_queue=offline_queue, client_factory=broker.client)
+        water_monitor = None
+        for slot in self.slots:
+            act_pins, sens_pins = slot_pins(slot, has_co2)
+            self.sensor_pin_map[slot] = sens_pins
+            heater = Heater(act_pins['heater'])
+            water_pump = WaterPump(act_pins['water_ib1'], act_pins['water_ib2'])
+            fan = VentilationFan(act_pins['fan'])
+            led = LED(act_pins['led'])
+            self.devices += [heater, water_pump, fan, led]
+            servo = None
+            if act_pins['servo'] is not None:
+                servo = ServoMotor(act_pins['servo'], settle_time=0.0)
+                self.servos.append(servo)
+
+            client = MqttClient(f"{device_serial}:{slot}", connection=self.connection)
+            if water_monitor is None:
+                water_monitor = WaterTankMonitor(client, device_serial)
+            self.clients[slot] = client
+            self.controllers[slot] = ActuatorController(heater, water_pump, fan, led, water_monitor, co2_servo=servo,
+                                                        slot=slot, device=device_serial)
+            init_sensor_caches(slot, sens_pins, has_co2=has_co2)
+        self.water_monitor = water_monitor
+        init_ultrasonic_sensor(*ULTRASONIC_PINS)
+
+        self.loop = ControlLoop(
+            self.slots, self.clients, self.controllers, water_monitor, self.sensor_pin_map, has_co2,
+            interval=interval, ultrasonic_pins=ULTRASONIC_PINS, water_tank_pin=WATER_TANK_PIN,
+            publisher=publisher,
+        )
+
+    def request_presets(self, timeout=10.0):
+        """
+        모든 슬롯 프리셋 요청 후 응답 대기
+
+        Returns:
+            bool: 제한 시간 안에 모두 받았는지
+        """
+        for client in self.clients.values():
+            client.request_preset()
+        deadline = time.monotonic() + timeout
+        return all([c.wait_preset(max(deadline - time.monotonic(), 0.0)) for c in self.clients.values()])
+
+    def close(self):
+        """센서 캐시, 서보, 핀, MQTT 정리"""
+        self.loop.close()
+        stop_sensor_caches()
+        if self.servos:
+            # 서보 정리는 원위치 대기(0.5초)가 있으므로 동시에
+            with ThreadPoolExecutor(max_workers=len(self.servos)) as pool:
+                list(pool.map(lambda servo: servo.cleanup(), self.servos))
+        for device in self.devices:
+            device.cleanup()
+        for client in self.clients.values():
+            client.close()
+        self.connection.close()
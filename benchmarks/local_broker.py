@@ -0,0 +1,183 @@
+"""
+프로세스 내부 MQTT 브로커 (벤치마크용)
+
+paho Client와 같은 인터페이스의 LocalClient를 만들어 주고,
+발행된 메시지를 구독자에게 전달 스레드 1개로 비동기 전달합니다.
+DB 서버 역할(프리셋 요청에 응답)도 등록할 수 있습니다.
+
+    broker = LocalBroker()
+    broker.add_preset_responder()
+    MqttConnection("local", client_factory=broker.client)
+"""
+import queue
+import threading
+import time
+from collections import namedtuple
+from mqtt.mqtt_connection import topic_matches, MQTT_ERR_SUCCESS
+
+MQTT_ERR_NO_CONN = 4  # paho.mqtt.client.MQTT_ERR_NO_CONN
+
+DEFAULT_PRESET_PAYLOAD = "OptimalTemp=25;OptimalHumidity=60;LightIntensity=3000;SoilMoisture=2000;Co2Level=800"
+
+LocalMessage = namedtuple('LocalMessage', 'topic payload qos retain')
+PublishInfo = namedtuple('PublishInfo', 'rc mid')
+
+
+class LocalClient:
+    """paho.mqtt.client.Client 대체 (MqttConnection이 쓰는 메서드만)"""
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.on_connect = None
+        self.on_disconnect = None
+        self.on_message = None
+        self.connected = False
+        self._connect_requested = False
+        self._subscriptions = {}  # 토픽 필터 -> QoS
+        self._mid = 0
+
+    def connect(self, host, port=1883, keepalive=60):
+        self._connect_requested = True
+        return MQTT_ERR_SUCCESS
+
+    connect_async = connect
+
+    def loop_start(self):
+        if self._connect_requested and not self.connected:
+            self.reconnect()
+
+    def loop_stop(self):
+        pass
+
+    def reconnect(self):
+        """브로커 (재)연결 후 on_connect 호출"""
+        self.connected = True
+        self.broker.attach(self)
+        if self.on_connect:
+            self.on_connect(self, None, {}, 0)
+
+    def disconnect(self, rc=0):
+        """연결 끊기 (rc != 0이면 비정상 종료처럼 동작)"""
+        if not self.connected:
+            return
+        self.connected = False
+        self.broker.detach(self)
+        self._subscriptions.clear()
+        if self.on_disconnect:
+            self.on_disconnect(self, None, rc)
+
+    def subscribe(self, topic, qos=0):
+        topics = topic if isinstance(topic, list) else [(topic, qos)]
+        for t, q in topics:
+            self._subscriptions[t] = q
+        return MQTT_ERR_SUCCESS, self._next_mid()
+
+    def unsubscribe(self, topic):
+        self._subscriptions.pop(topic, None)
+        return MQTT_ERR_SUCCESS, self._next_mid()
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        mid = self._next_mid()
+        if not self.connected:
+            return PublishInfo(MQTT_ERR_NO_CONN, mid)
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        self.broker.route(LocalMessage(topic, payload or b"", qos, retain))
+        return PublishInfo(MQTT_ERR_SUCCESS, mid)
+
+    def matches(self, topic):
+        return any(topic_matches(sub, topic) for sub in list(self._subscriptions))
+
+    def _next_mid(self):
+        self._mid += 1
+        return self._mid
+
+
+class LocalBroker:
+    """메모리 브로커 (전달 스레드 1개)"""
+
+    def __init__(self, delivery_latency=0.0):
+        """
+        Args:
+            delivery_latency: 메시지당 전달 지연 (초) - 네트워크 왕복 흉내
+        """
+        self.delivery_latency = delivery_latency
+        self._clients = []
+        self._observers = []  # (토픽 필터, function(topic, payload)) - 발행 스레드에서 즉시 호출
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self.published = 0
+        self.published_bytes = 0
+        self.delivered = 0
+        self._thread = threading.Thread(target=self._deliver_loop, name="local-broker", daemon=True)
+        self._thread.start()
+
+    def client(self):
+        """MqttConnection(client_factory=broker.client)용 클라이언트 생성"""
+        return LocalClient(self)
+
+    def attach(self, client):
+        with self._lock:
+            if client not in self._clients:
+                self._clients.append(client)
+
+    def detach(self, client):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def add_observer(self, topic_filter, callback):
+        """발행 감시 (구독 없이 통계/대기용)"""
+        with self._lock:
+            self._observers.append((topic_filter, callback))
+
+    def add_responder(self, topic_filter, respond):
+        """
+        요청-응답 등록 (DB 서버 흉내)
+
+        Args:
+            respond: function(topic, payload) -> [(응답 토픽, 응답 페이로드)]
+        """
+        def on_publish(topic, payload):
+            for reply_topic, reply in respond(topic, payload):
+                self.route(LocalMessage(reply_topic, reply.encode('utf-8'), 1, False))
+        self.add_observer(topic_filter, on_publish)
+
+    def add_preset_responder(self, payload=DEFAULT_PRESET_PAYLOAD):
+        """프리셋 요청(smartfarm/{uid}/preset/request)에 응답"""
+        def respond(topic, _):
+            return [(topic[:-len("/request")] + "/response", payload)]
+        self.add_responder("smartfarm/+/preset/request", respond)
+
+    def route(self, message):
+        with self._lock:
+            self.published += 1
+            self.published_bytes += len(message.payload)
+            observers = [cb for f, cb in self._observers if topic_matches(f, message.topic)]
+        for callback in observers:
+            callback(message.topic, message.payload)
+        self._queue.put(message)
+
+    def wait_idle(self, timeout=10.0):
+        """대기 중인 메시지를 모두 전달할 때까지 대기"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return not self._queue.unfinished_tasks
+
+    def _deliver_loop(self):
+        while True:
+            message = self._queue.get()
+            try:
+                if self.delivery_latency:
+                    time.sleep(self.delivery_latency)
+                with self._lock:
+                    targets = [c for c in self._clients if c.matches(message.topic)]
+                for client in targets:
+                    if client.on_message:
+                        client.on_message(client, None, message)
+                    self.delivered += 1
+            except Exception as e:
+                print(f"❌ 로컬 브로커 전달 오류 ({message.topic}): {e}")
+            finally:
+                self._queue.task_done()
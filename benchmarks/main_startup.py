@@ -0,0 +1,64 @@
+"""
+main.main() 시작 시간 측정용 실행기 (run_benchmarks.py가 별도 프로세스로 실행)
+
+SMARTFARM_HAL=sim 환경에서 로컬 브로커를 MQTT 클라이언트로 끼워 넣고 main.main()을 실행한 뒤,
+첫 센서 데이터가 발행되는 시점까지의 시간을 JSON 한 줄로 출력하고 종료합니다.
+
+    SMARTFARM_HAL=sim python -m benchmarks.main_startup
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+START = time.perf_counter()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    from benchmarks.local_broker import LocalBroker
+    from mqtt.mqtt_connection import set_client_factory
+
+    broker = LocalBroker()
+    broker.add_preset_responder()
+    set_client_factory(broker.client)
+
+    marks = {}
+    first_publish = threading.Event()
+
+    def on_sensor(topic, payload):
+        if not first_publish.is_set():
+            marks['first_publish_s'] = round(time.perf_counter() - START, 4)
+            first_publish.set()
+
+    def on_preset(topic, payload):
+        marks.setdefault('first_preset_request_s', round(time.perf_counter() - START, 4))
+
+    broker.add_observer("smartfarm/+/sensor/#", on_sensor)
+    broker.add_observer("smartfarm/+/preset/request", on_preset)
+
+    result_out = sys.__stdout__
+
+    def report():
+        ok = first_publish.wait(args.timeout)
+        marks['ok'] = ok
+        result_out.write(json.dumps(marks) + "\n")
+        result_out.flush()
+        os._exit(0 if ok else 1)
+
+    threading.Thread(target=report, name="startup-report", daemon=True).start()
+
+    sys.stdout = open(os.devnull, 'w')  # main.py 로그 버림
+    import_start = time.perf_counter()
+    import main as smartfarm_main
+    marks['import_s'] = round(time.perf_counter() - import_start, 4)
+    smartfarm_main.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+제어 주기 종단간 벤치마크
+
+시뮬레이션 HAL(hal/sim.py)과 프로세스 내부 브로커(benchmarks/local_broker.py)로
+라즈베리파이/브로커 없이 다음을 슬롯 수(기본 1/4/16/64)별로 측정하고 JSON으로 출력합니다.
+
+- cycle: ControlLoop.run_cycle() 1주기 지연 (p50/p99)
+- stages: 같은 주기 동안 service/metrics.py 계측 구간별 히스토그램 요약
+- slot_path: 슬롯별 read_slot_sensors + ActuatorController.control + MqttClient.send_sensor_data 지연
+- publish: 센서 데이터 전송 처리량 (슬롯별 메시지 / 묶음 text / 묶음 binary / 오프라인 대기열)
+- memory: 긴 실행 중 메모리 증가량 (tracemalloc)
+- startup: 디바이스 조립 + 프리셋 수신 시간, main.main() 첫 센서 전송까지 시간 (별도 프로세스)
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --slots 1,4 --cycles 10 --compare bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.harness import SimDevice, sim
+from benchmarks.local_broker import LocalBroker
+from mqtt.device_publisher import DevicePublisher
+from mqtt.offline_queue import OfflineQueue
+from service.read_sensors import read_slot_sensors, get_slot_sample_age
+from service import metrics
+from service.log import configure_logging, shutdown_logging
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SLOTS = (1, 4, 16, 64)
+
+# --compare 에서 회귀로 판단할 지표 (값이 클수록 나쁨)
+LATENCY_KEYS = ('p50_ms', 'p99_ms')
+
+
+def percentile(values, pct):
+    """nearest-rank 백분위수"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(seconds):
+    """지연 목록(초) -> ms 요약"""
+    ms = [s * 1000.0 for s in seconds]
+    return {
+        'count': len(ms),
+        'mean_ms': round(sum(ms) / len(ms), 3) if ms else None,
+        'p50_ms': round(percentile(ms, 50), 3) if ms else None,
+        'p99_ms': round(percentile(ms, 99), 3) if ms else None,
+        'max_ms': round(max(ms), 3) if ms else None,
+    }
+
+
+@contextlib.contextmanager
+def quiet(enabled=True):
+    """측정 중 print 출력 버리기"""
+    if not enabled:
+        yield
+        return
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def build(n_slots, args, **kwargs):
+    """시뮬레이션 상태 초기화 후 디바이스 조립 + 프리셋 수신"""
+    sim.reset_world(seed=args.seed, latency_scale=args.latency_scale)
+    broker = LocalBroker()
+    broker.add_preset_responder()
+    start = time.perf_counter()
+    device = SimDevice(n_slots, broker, **kwargs)
+    assembled = time.perf_counter()
+    ready = device.request_presets()
+    presets = time.perf_counter()
+    startup = {
+        'assemble_s': round(assembled - start, 4),
+        'preset_ready_s': round(presets - assembled, 4),
+        'presets_ok': ready,
+    }
+    return device, broker, startup
+
+
+def bench_cycle(device, cycles, warmup):
+    """ControlLoop.run_cycle() 지연"""
+    async def run():
+        for _ in range(warmup):
+            await device.loop.run_cycle()
+        samples = []
+        for _ in range(cycles):
+            start = time.perf_counter()
+            await device.loop.run_cycle()
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    return summarize(asyncio.run(run()))
+
+
+def bench_slot_path(device, cycles):
+    """슬롯별 읽기 → 제어 → 전송 (순차) 단계별 지연"""
+    stages = {'read': [], 'control': [], 'publish': [], 'total': []}
+    for _ in range(cycles):
+        for slot in device.slots:
+            client = device.clients[slot]
+            t0 = time.perf_counter()
+            readings = read_slot_sensors(slot, device.sensor_pin_map[slot], has_co2=device.has_co2)
+            t1 = time.perf_counter()
+            temp, hum, light, soil, co2 = readings
+            device.controllers[slot].control(
+                {'temp': temp, 'humidity': hum, 'light': light, 'soil': soil, 'co2': co2},
+                client.get_preset(),
+            )
+            t2 = time.perf_counter()
+            client.send_sensor_data(*readings, age=get_slot_sample_age(slot))
+            t3 = time.perf_counter()
+            stages['read'].append(t1 - t0)
+            stages['control'].append(t2 - t1)
+            stages['publish'].append(t3 - t2)
+            stages['total'].append(t3 - t0)
+    return {name: summarize(samples) for name, samples in stages.items()}
+
+
+def bench_publish(device, broker, messages):
+    """전송 처리량 (메시지/초, 슬롯 샘플/초)"""
+    results = {}
+    readings = {slot: (24.0, 60, 30000, 32000, 800) for slot in device.slots}
+    rounds = max(messages // len(device.slots), 1)
+
+    # 1. 슬롯별 메시지
+    sink = broker.client()
+    received = []
+    sink.on_message = lambda c, u, msg: received.append(1)
+    sink.reconnect()
+    sink.subscribe("smartfarm/+/sensor/#")
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for slot in device.slots:
+            device.clients[slot].send_sensor_data(*readings[slot], age=1.0)
+    published = time.perf_counter() - start
+    broker.wait_idle()
+    delivered = time.perf_counter() - start
+    count = rounds * len(device.slots)
+    results['per_slot'] = {
+        'messages': count,
+        'publish_msgs_per_s': round(count / published, 1),
+        'delivered_msgs_per_s': round(len(received) / delivered, 1),
+        'slot_samples_per_s': round(count / published, 1),
+    }
+
+    # 2. 디바이스 묶음 전송 (text / binary)
+    for encoding in ('text', 'binary'):
+        publisher = DevicePublisher(device.clients[device.slots[0]], device.device_serial, encoding=encoding)
+        before = broker.published_bytes
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for slot in device.slots:
+                publisher.add(slot, *readings[slot], age=1.0)
+            publisher.flush()
+        elapsed = time.perf_counter() - start
+        results[f'batch_{encoding}'] = {
+            'messages': rounds,
+            'publish_msgs_per_s': round(rounds / elapsed, 1),
+            'slot_samples_per_s': round(count / elapsed, 1),
+            'bytes_per_slot': round((broker.published_bytes - before) / count, 1),
+        }
+    broker.wait_idle()
+    sink.disconnect()
+
+    # 3. 브로커 끊김 → 오프라인 대기열 (SQLite) 저장 처리량
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = OfflineQueue(os.path.join(tmp, "bench_queue.db"), max_messages=count + 1)
+        connection = device.connection
+        saved_queue, saved_connected = connection.offline_queue, connection.connected
+        connection.offline_queue, connection.connected = queue, False
+        try:
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for slot in device.slots:
+                    device.clients[slot].send_sensor_data(*readings[slot], age=1.0)
+            elapsed = time.perf_counter() - start
+        finally:
+            connection.offline_queue, connection.connected = saved_queue, saved_connected
+            queue.close()
+        results['offline_queue'] = {
+            'messages': count,
+            'publish_msgs_per_s': round(count / elapsed, 1),
+        }
+    return results
+
+
+def bench_memory(device, cycles, warmup):
+    """긴 실행 중 메모리 증가 (지연 없이 주기 반복)"""
+    async def run(n):
+        for _ in range(n):
+            await device.loop.run_cycle()
+
+    asyncio.run(run(warmup))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        asyncio.run(run(cycles))
+        gc.collect()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'cycles': cycles,
+        'growth_bytes': after - before,
+        'growth_bytes_per_cycle': round((after - before) / cycles, 1),
+        'peak_bytes': peak,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def bench_main_startup(args):
+    """main.main() 시작 ~ 첫 센서 전송까지 (별도 프로세스, 시뮬레이션 HAL)"""
+    env = dict(os.environ, SMARTFARM_HAL="sim", SMARTFARM_SIM_SEED=str(args.seed),
+               SMARTFARM_SIM_LATENCY=str(args.latency_scale))
+    with tempfile.TemporaryDirectory() as tmp:
+        env['SMARTFARM_OFFLINE_QUEUE'] = os.path.join(tmp, "offline_queue.db")
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.main_startup", "--timeout", str(args.startup_timeout)],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=args.startup_timeout + 30,
+        )
+        wall = time.perf_counter() - start
+    result = {'process_wall_s': round(wall, 4), 'returncode': proc.returncode}
+    for line in proc.stdout.splitlines():
+        if line.startswith('{'):
+            result.update(json.loads(line))
+    if proc.returncode != 0:
+        result['stderr'] = proc.stderr[-2000:]
+    return result
+
+
+def run_slot_count(n_slots, args):
+    print(f"▶ {n_slots}슬롯 ...", file=sys.stderr)
+    with quiet(not args.verbose):
+        device, broker, startup = build(n_slots, args)
+        try:
+            result = {'startup': startup}
+            metrics.enable_metrics()
+            metrics.get_registry().reset()
+            result['cycle'] = bench_cycle(device, args.cycles, args.warmup)
+            result['stages'] = {
+                name: {k: timer[k] for k in ('count', 'mean_ms', 'p50_ms', 'p99_ms', 'max_ms')}
+                for name, timer in metrics.snapshot()['timers'].items()
+            }
+            metrics.enable_metrics(False)
+            result['slot_path'] = bench_slot_path(device, args.cycles)
+            result['publish'] = bench_publish(device, broker, args.messages)
+        finally:
+            device.close()
+
+        # 메모리는 지연 없이 오래 돌림
+        saved_scale = args.latency_scale
+        args.latency_scale = 0.0
+        device, broker, _ = build(n_slots, args)
+        args.latency_scale = saved_scale
+        try:
+            result['memory'] = bench_memory(device, args.memory_cycles, args.warmup)
+            result['gpio'] = device.controllers[device.slots[0]].output_bank.stats()
+            result['broker'] = {'published': broker.published, 'delivered': broker.delivered}
+        finally:
+            device.close()
+    return result
+
+
+def flatten(result, prefix=""):
+    """중첩 dict -> {'a.b.c': 값}"""
+    flat = {}
+    for key, value in result.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline_path, threshold):
+    """
+    이전 결과와 지연 지표 비교
+
+    Returns:
+        list: 회귀 항목 [(지표, 이전, 현재, 배율)]
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = flatten(baseline.get('results', {}))
+    new = flatten(current['results'])
+    regressions = []
+    for name, value in sorted(new.items()):
+        if not name.endswith(LATENCY_KEYS) or name not in old:
+            continue
+        if '.stages.' in name:
+            continue  # 히스토그램 버킷 상한값이라 비교에서 제외 (mean_ms 참고)
+        before = old[name]
+        if not before or value is None:
+            continue
+        ratio = value / before
+        marker = "❌" if ratio > threshold else "  "
+        print(f"{marker} {name}: {before} -> {value} ({ratio:.2f}x)", file=sys.stderr)
+        if ratio > threshold:
+            regressions.append((name, before, value, ratio))
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="스마트팜 제어 주기 벤치마크 (시뮬레이션 HAL)")
+    parser.add_argument("--slots", default=",".join(map(str, DEFAULT_SLOTS)), help="슬롯 수 목록 (쉼표 구분)")
+    parser.add_argument("--cycles", type=int, default=20, help="지연 측정 주기 수")
+    parser.add_argument("--warmup", type=int, default=2, help="측정 전 워밍업 주기 수")
+    parser.add_argument("--messages", type=int, default=5000, help="처리량 측정 메시지 수")
+    parser.add_argument("--memory-cycles", type=int, default=500, help="메모리 측정 주기 수")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="센서 지연 배율 (0이면 지연 없음)")
+    parser.add_argument("--seed", type=int, default=0, help="시뮬레이션 난수 시드")
+    parser.add_argument("--skip-main", action="store_true", help="main.main() 시작 시간 측정 생략")
+    parser.add_argument("--startup-timeout", type=float, default=60.0, help="main.main() 시작 제한 시간 (초)")
+    parser.add_argument("--output", help="결과 JSON 파일 (없으면 표준 출력)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.2, help="회귀로 판단할 지연 배율")
+    parser.add_argument("--verbose", action="store_true", help="측정 중 로그 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    slot_counts = [int(n) for n in args.slots.split(",") if n.strip()]
+    # 운영 기본값과 같은 로깅 (INFO, RAM 링 버퍼), 화면 출력은 --verbose일 때만
+    configure_logging(level="INFO", sink="ram", console_level=logging.WARNING if args.verbose else None)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': 'sim',
+            'latency_scale': args.latency_scale,
+            'seed': args.seed,
+            'cycles': args.cycles,
+            'messages': args.messages,
+            'memory_cycles': args.memory_cycles,
+        },
+        'results': {},
+    }
+    for n_slots in slot_counts:
+        report['results'][str(n_slots)] = run_slot_count(n_slots, args)
+    if not args.skip_main:
+        print("▶ main.main() 시작 시간 ...", file=sys.stderr)
+        report['main_startup'] = bench_main_startup(args)
+
+    shutdown_logging()
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        regressions = compare(report, args.compare, args.threshold)
+        if regressions:
+            print(f"❌ 지연 회귀 {len(regressions)}건 (기준 {args.threshold}x)", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+스마트팜 게이트웨이 (디바이스 여러 대를 프로세스 하나로 실행)
+
+사용 방법:
+    1. smartfarm.example.toml을 복사해서 디바이스 목록(시리얼, 모델, 핀 배치, 브로커, 제어 튜닝값) 작성
+    2. python gateway.py smartfarm.toml 실행
+    3. 튜닝값 수정 후 kill -HUP <pid> 하면 재시작 없이 반영 (핀/브로커/디바이스 목록은 재시작 필요)
+
+라즈베리파이 없이 실행 (시뮬레이션 센서/액추에이터, hal/sim.py):
+    SMARTFARM_HAL=sim python gateway.py smartfarm.example.toml
+
+디바이스 1대만 쓰면 main.py를 그대로 사용하면 됩니다.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from service.config import load_config, ConfigReloader
+from service.gateway import Gateway
+from service.metrics import enable_metrics, install_dump_signal, register_gauge
+from service.startup import StartupTimer
+from service import log as smartfarm_log
+from Actuator.gpio_output import get_output_bank
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스마트팜 게이트웨이")
+    parser.add_argument("config", help="설정 파일 (.toml 또는 .json)")
+    args = parser.parse_args(argv)
+
+    startup = StartupTimer()  # 시작 단계별 시간 (첫 제어 주기 후 출력)
+    config = load_config(args.config)
+    startup.mark("config")
+
+    smartfarm_log.configure_logging(
+        level=os.environ.get("SMARTFARM_LOG_LEVEL", "INFO"),
+        sink=os.environ.get("SMARTFARM_LOG_SINK", "ram"),
+        rate_limit=60,
+    )
+    smartfarm_log.install_dump_signal()
+
+    print("=" * 60)
+    print("🌱 스마트팜 게이트웨이 시작")
+    print("=" * 60)
+    print(f"🛰️  게이트웨이: {config.gateway_id}")
+    print(f"🌐 MQTT 브로커: {config.broker}")
+    print(f"📟 디바이스: {', '.join(device.serial for device in config.devices)}")
+    print("=" * 60)
+
+    gateway = Gateway(config)
+    try:
+        if config.metrics_enabled:
+            enable_metrics()
+            install_dump_signal()
+            register_gauge("gpio", lambda: get_output_bank().stats())
+            register_gauge("startup", startup.as_dict)
+            gateway.enable_metrics_reporter(interval=config.metrics_interval)
+
+        gateway.setup()
+        ConfigReloader(args.config, config, gateway.apply_config).install()
+        print(f"\n✅ 디바이스 {len(gateway.devices)}대, 슬롯 {gateway.slot_count()}개 초기화 완료")
+        startup.mark("slots")
+
+        # 프리셋 요청 후 센서 첫 값과 프리셋 응답을 기한까지만 대기 (둘 다 받는 즉시 진행)
+        print(f"\n📡 DB 서버에 프리셋 요청 중...")
+        gateway.request_presets()
+        pending = gateway.wait_sensors()
+        if pending:
+            print(f"⚠️ 첫 값을 받지 못한 센서: {', '.join(pending)} (값이 들어오면 반영)")
+        startup.mark("sensors")
+        if not gateway.wait_presets(config.preset_timeout):
+            print("⚠️ 일부 슬롯은 프리셋 응답이 없어 기본값으로 동작")
+        startup.mark("presets")
+        for device in gateway.devices:
+            device.print_presets()
+
+        gateway.create_loops(on_first_cycle=lambda: startup.finish("first_cycle"))
+        print("\n✅ 센서 데이터 전송 및 자동 제어 시작...\n")
+        try:
+            asyncio.run(gateway.run())
+        except KeyboardInterrupt:
+            print("\n\n🛑 사용자에 의해 중단됨")
+
+    finally:
+        print("\n🧹 게이트웨이 정리 중...")
+        gateway.close()
+        time.sleep(1)
+        smartfarm_log.shutdown_logging()
+        print("✅ 프로그램 종료\n")
+
+
+if __name__ == "__main__":
+    main()
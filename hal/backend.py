@@ -0,0 +1,116 @@
+"""
+하드웨어 추상화 계층 (HAL) 백엔드 선택
+
+센서/액추에이터 드라이버는 board, busio, RPi.GPIO 같은 하드웨어 모듈을 직접 import하지 않고
+이 모듈에서 가져옵니다.
+
+    from hal.backend import board, gpio
+
+- "real": 라즈베리파이 실제 모듈 (기본값)
+- "sim": hal/sim.py의 시뮬레이션 모듈 (파형 스크립트, 센서 지연 재현) - CI/벤치마크용
+
+백엔드는 환경변수 SMARTFARM_HAL 또는 하드웨어 모듈을 처음 사용하기 전에 set_backend()로 선택합니다.
+from hal.backend import board 는 대리 객체만 돌려주고, 실제 모듈(board, adafruit_dht 등 import가
+느린 라이브러리)은 속성을 처음 읽을 때 import합니다. 드라이버를 import만 해서는 하드웨어 모듈을 불러오지 않습니다.
+"""
+import importlib
+import os
+import threading
+import types
+
+REAL = "real"
+SIM = "sim"
+BACKENDS = (REAL, SIM)
+
+# HAL 이름 -> 실제 모듈 경로
+REAL_MODULES = {
+    'board': 'board',
+    'busio': 'busio',
+    'digitalio': 'digitalio',
+    'gpio': 'RPi.GPIO',
+    'adafruit_dht': 'adafruit_dht',
+    'mh_z19': 'mh_z19',
+    'hcsr04_sensor': 'hcsr04sensor.sensor',
+    'serial': 'serial',  # pyserial
+}
+
+_backend = os.environ.get("SMARTFARM_HAL", REAL).strip().lower() or REAL
+_modules = {}  # 이미 불러온 모듈 (백엔드 고정 이후)
+_proxies = {}  # HAL 이름 -> LazyModule
+_lock = threading.Lock()
+
+
+def backend_name():
+    """현재 백엔드 이름 ("real" 또는 "sim")"""
+    return _backend
+
+
+def is_simulated():
+    """시뮬레이션 백엔드 여부"""
+    return _backend == SIM
+
+
+def set_backend(name):
+    """
+    백엔드 선택 (하드웨어 모듈을 처음 사용하기 전에만 바꿀 수 있음)
+
+    Raises:
+        ValueError: 알 수 없는 백엔드
+        RuntimeError: 이미 다른 백엔드 모듈을 사용 중
+    """
+    global _backend
+    name = name.strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 HAL 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+    with _lock:
+        if _modules and name != _backend:
+            raise RuntimeError(f"HAL 백엔드가 이미 '{_backend}'로 사용 중입니다")
+        _backend = name
+
+
+def load(name):
+    """HAL 모듈 반환 (처음 호출 시 import)"""
+    with _lock:
+        module = _modules.get(name)
+        if module is None:
+            if name not in REAL_MODULES:
+                raise AttributeError(f"알 수 없는 HAL 모듈: {name}")
+            if _backend == SIM:
+                from hal import sim
+                module = getattr(sim, name)
+            else:
+                module = importlib.import_module(REAL_MODULES[name])
+            _modules[name] = module
+        return module
+
+
+class LazyModule:
+    """HAL 모듈 대리 객체 (속성을 처음 읽을 때 load(), 실제 모듈의 속성은 대리 객체에 캐시)"""
+
+    def __init__(self, name):
+        self.__dict__['_hal_name'] = name
+
+    def __getattr__(self, attr):
+        module = load(self._hal_name)
+        value = getattr(module, attr)
+        if isinstance(module, types.ModuleType):
+            # 다음부터는 일반 속성 조회 (시뮬레이션 객체는 상태가 바뀌므로 매번 위임)
+            self.__dict__[attr] = value
+        return value
+
+    def __setattr__(self, attr, value):
+        setattr(load(self._hal_name), attr, value)
+
+    def __repr__(self):
+        loaded = "loaded" if self._hal_name in _modules else "not loaded"
+        return f"<hal module {self._hal_name!r} ({loaded})>"
+
+
+def __getattr__(name):
+    # from hal.backend import board 같은 import를 처리 (PEP 562) - 대리 객체 반환
+    if name in REAL_MODULES:
+        proxy = _proxies.get(name)
+        if proxy is None:
+            proxy = _proxies.setdefault(name, LazyModule(name))
+        return proxy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,745 @@
+"""
+시뮬레이션 HAL 백엔드
+
+라즈베리파이 없이 전체 제어 루프를 돌리기 위한 가짜 하드웨어 모듈입니다.
+board, busio, digitalio, RPi.GPIO, adafruit_dht, mh_z19, hcsr04sensor, serial(pyserial)과 같은 인터페이스를 제공하고,
+센서 값은 SimWorld에 등록한 파형(시간 함수)에서 읽습니다.
+
+- 파형: constant, sine, ramp, steps, noisy 조합 (set_signal로 센서별로 교체 가능)
+- 지연: DHT11 / MH-Z19B / HC-SR04 / SPI 통신 시간을 time.sleep으로 재현 (latency_scale로 배율 조정, 0이면 지연 없음)
+- 실패: DHT11 체크섬 오류 등 센서별 실패 확률 (seed 고정 난수로 재현 가능)
+- 에지 감지: RPi.GPIO add_event_detect 콜백 (파형 입력 핀은 5ms마다 확인,
+  초음파 TRIG 펄스가 끝나면 연결된 ECHO 핀에 거리만큼의 HIGH 펄스를 만들어 줌)
+
+환경변수:
+    SMARTFARM_SIM_SEED: 난수 시드 (기본값 0)
+    SMARTFARM_SIM_LATENCY: 지연 배율 (기본값 1.0)
+"""
+import math
+import os
+import queue
+import random
+import threading
+import time
+import traceback
+from types import SimpleNamespace
+
+# 센서별 1회 측정 지연 (초) - 데이터시트 기준 통신 시간
+DEFAULT_LATENCY = {
+    'dht11': 0.023,  # 시작 신호 18ms + 40비트 응답 약 5ms
+    'mh_z19': 0.030,  # 9600bps 9바이트 요청/응답 약 19ms + 센서 응답 대기
+    'hcsr04_trigger': 0.00001,  # 트리거 펄스 10us (에코 시간은 거리로 계산)
+}
+
+# 센서별 측정 실패 확률
+DEFAULT_FAILURE_RATE = {
+    'dht11': 0.1,  # 체크섬/타이밍 오류 (adafruit_dht RuntimeError)
+    'mh_z19': 0.0,
+    'hcsr04': 0.0,
+}
+
+SPEED_OF_SOUND = 34300.0  # cm/s
+HCSR04_TIMEOUT = 0.038  # 에코가 없을 때 센서 타임아웃 (초)
+HCSR04_ECHO_DELAY = 0.0002  # 트리거 후 에코 시작까지 (40kHz 8사이클 버스트)
+
+EDGE_POLL_INTERVAL = 0.005  # 파형 입력 핀의 에지 확인 주기 (초)
+
+
+# ========================================
+# 파형 (경과 시간(초) -> 값)
+# ========================================
+
+def constant(value):
+    """고정 값"""
+    return lambda t: value
+
+
+def sine(mean, amplitude, period, phase=0.0):
+    """사인파"""
+    return lambda t: mean + amplitude * math.sin(2 * math.pi * (t / period) + phase)
+
+
+def ramp(start, end, duration):
+    """duration 동안 start에서 end로 직선 변화 후 유지"""
+    def wave(t):
+        if t >= duration:
+            return end
+        return start + (end - start) * (t / duration)
+    return wave
+
+
+def steps(points, initial=None):
+    """
+    계단 파형
+
+    Args:
+        points: [(시각, 값)] - 시각 순서대로
+        initial: 첫 시각 이전 값 (기본값: 첫 값)
+    """
+    points = sorted(points)
+    first = points[0][1] if initial is None else initial
+
+    def wave(t):
+        value = first
+        for at, v in points:
+            if t < at:
+                break
+            value = v
+        return value
+    return wave
+
+
+def noisy(wave, sigma, seed=0):
+    """가우시안 잡음 추가 (seed 고정)"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def noisy_wave(t):
+        with lock:
+            noise = rng.gauss(0.0, sigma)
+        return wave(t) + noise
+    return noisy_wave
+
+
+# ========================================
+# 시뮬레이션 상태
+# ========================================
+
+class SimWorld:
+    """시뮬레이션 하드웨어 상태 (센서 파형, 출력 핀, 지연/실패 설정)"""
+
+    def __init__(self, seed=0, latency_scale=1.0, clock=time.monotonic):
+        """
+        Args:
+            seed: 난수 시드 (잡음, 실패 재현용)
+            latency_scale: 지연 배율 (0이면 지연 없음)
+            clock: 시각 함수 (초)
+        """
+        self.seed = seed
+        self.latency_scale = latency_scale
+        self.latency = dict(DEFAULT_LATENCY)
+        self.failure_rate = dict(DEFAULT_FAILURE_RATE)
+        self._clock = clock
+        self.start = clock()
+        self._lock = threading.Lock()
+        self._rngs = {}
+
+        # (종류, 키) -> 파형, 키가 None이면 종류 전체 기본값
+        #   temp/humidity: DHT11 핀 번호, adc: MCP3008 채널(0~1023),
+        #   co2: 시리얼 포트, distance: 초음파 트리거 핀(cm), digital: 입력 핀(bool)
+        self._signals = {
+            ('temp', None): noisy(sine(24.0, 3.0, 900.0), 0.2, seed),
+            ('humidity', None): noisy(sine(60.0, 10.0, 1200.0), 1.0, seed + 1),
+            ('adc', None): noisy(sine(512.0, 200.0, 300.0), 4.0, seed + 2),
+            ('co2', None): noisy(sine(800.0, 200.0, 1800.0), 10.0, seed + 3),
+            ('distance', None): noisy(constant(10.0), 0.1, seed + 4),
+            ('digital', None): constant(False),
+        }
+
+        self.outputs = {}  # GPIO 출력 핀 -> 값
+        self.inputs = {}  # 시뮬레이터가 직접 구동하는 입력 핀 -> 값 (초음파 ECHO 등, 파형보다 우선)
+        self.ultrasonic_wiring = {23: 24}  # 초음파 TRIG 핀 -> ECHO 핀 (main.py 기본 배선)
+        self.pwm = {}  # PWM 핀 -> 듀티비
+        self.counters = {}  # 이름 -> 호출 수 (gpio_output, spi_transfer, dht11_read ...)
+
+    def wire_ultrasonic(self, trig_pin, echo_pin):
+        """초음파 센서 배선 등록 (TRIG 펄스가 끝나면 ECHO 핀에 에코 펄스 생성)"""
+        self.ultrasonic_wiring[trig_pin] = echo_pin
+
+    def now(self):
+        """시뮬레이션 경과 시간 (초)"""
+        return self._clock() - self.start
+
+    def set_signal(self, kind, key, wave):
+        """
+        센서 파형 교체
+
+        Args:
+            kind: 'temp', 'humidity', 'adc', 'co2', 'distance', 'digital'
+            key: 핀 번호/채널/포트 (None이면 같은 종류 전체 기본값)
+            wave: function(경과 시간) -> 값, 또는 숫자(고정 값)
+        """
+        if not callable(wave):
+            wave = constant(wave)
+        with self._lock:
+            self._signals[(kind, key)] = wave
+
+    def value(self, kind, key=None):
+        """현재 시각의 센서 값"""
+        with self._lock:
+            wave = self._signals.get((kind, key)) or self._signals[(kind, None)]
+        return wave(self.now())
+
+    def rng(self, name):
+        """이름별 고정 시드 난수 생성기"""
+        with self._lock:
+            rng = self._rngs.get(name)
+            if rng is None:
+                rng = self._rngs[name] = random.Random(f"{self.seed}:{name}")
+            return rng
+
+    def fails(self, kind, key=None):
+        """이번 측정 실패 여부 (실패 확률 기준)"""
+        rate = self.failure_rate.get(kind, 0.0)
+        return rate > 0 and self.rng(f"{kind}:{key}").random() < rate
+
+    def sleep(self, seconds):
+        """지연 재현 (배율 적용)"""
+        seconds *= self.latency_scale
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def delay(self, kind):
+        """센서별 기본 지연"""
+        self.sleep(self.latency.get(kind, 0.0))
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+
+_world = None
+_world_lock = threading.Lock()
+
+
+def get_world():
+    """공유 시뮬레이션 상태 (처음 호출 시 환경변수 설정으로 생성)"""
+    global _world
+    with _world_lock:
+        if _world is None:
+            _world = SimWorld(
+                seed=int(os.environ.get("SMARTFARM_SIM_SEED", "0")),
+                latency_scale=float(os.environ.get("SMARTFARM_SIM_LATENCY", "1.0")),
+            )
+        return _world
+
+
+def reset_world(seed=0, latency_scale=1.0, clock=time.monotonic):
+    """시뮬레이션 상태 새로 만들기 (테스트/벤치마크 시작 시)"""
+    global _world
+    with _world_lock:
+        _world = SimWorld(seed=seed, latency_scale=latency_scale, clock=clock)
+        return _world
+
+
+def _pin_id(pin):
+    return getattr(pin, "id", pin)
+
+
+# ========================================
+# board
+# ========================================
+
+class SimPin:
+    """board.Dxx 핀"""
+    __slots__ = ("id",)
+
+    def __init__(self, pin_id):
+        self.id = pin_id
+
+    def __repr__(self):
+        return f"board.D{self.id}"
+
+
+board = SimpleNamespace(**{f"D{n}": SimPin(n) for n in range(28)})
+board.SCK = board.D11
+board.MOSI = board.D10
+board.MISO = board.D9
+
+
+# ========================================
+# digitalio
+# ========================================
+
+class _Direction:
+    INPUT = "INPUT"
+    OUTPUT = "OUTPUT"
+
+
+class _Pull:
+    UP = "UP"
+    DOWN = "DOWN"
+
+
+class DigitalInOut:
+    """digitalio.DigitalInOut (입력은 'digital' 파형, 출력은 SimWorld.outputs)"""
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.direction = _Direction.INPUT
+        self.pull = None
+
+    def switch_to_output(self, value=False, drive_mode=None):
+        self.direction = _Direction.OUTPUT
+        self.value = value
+
+    def switch_to_input(self, pull=None):
+        self.direction = _Direction.INPUT
+        self.pull = pull
+
+    @property
+    def value(self):
+        if self.direction == _Direction.OUTPUT:
+            return bool(get_world().outputs.get(_pin_id(self.pin), False))
+        world = get_world()
+        if _pin_id(self.pin) in world.inputs:
+            return bool(world.inputs[_pin_id(self.pin)])
+        return bool(world.value('digital', _pin_id(self.pin)))
+
+    @value.setter
+    def value(self, value):
+        get_world().outputs[_pin_id(self.pin)] = bool(value)
+
+    def deinit(self):
+        get_world().outputs.pop(_pin_id(self.pin), None)
+
+
+digitalio = SimpleNamespace(DigitalInOut=DigitalInOut, Direction=_Direction, Pull=_Pull)
+
+
+# ========================================
+# busio (MCP3008 SPI 응답 재현)
+# ========================================
+
+class SPI:
+    """busio.SPI - MCP3008 단일 채널 변환 응답을 돌려줌"""
+
+    def __init__(self, clock=None, MOSI=None, MISO=None):
+        self.baudrate = 100_000
+        self._lock = threading.Lock()
+
+    def try_lock(self):
+        return self._lock.acquire(blocking=False)
+
+    def unlock(self):
+        self._lock.release()
+
+    def configure(self, baudrate=100_000, polarity=0, phase=0, bits=8):
+        self.baudrate = baudrate
+
+    def write_readinto(self, buffer_out, buffer_in, out_start=0, out_end=None, in_start=0, in_end=None):
+        world = get_world()
+        world.count('spi_transfer')
+        world.sleep(len(buffer_out) * 8 / self.baudrate)
+        for i in range(len(buffer_in)):
+            buffer_in[i] = 0
+        if buffer_out[0] & 0x01:  # 시작 비트
+            channel = (buffer_out[1] >> 4) & 0x07
+            raw = int(round(world.value('adc', channel)))
+            raw = min(max(raw, 0), 1023)
+            buffer_in[1] = (raw >> 8) & 0x03
+            buffer_in[2] = raw & 0xFF
+
+    def deinit(self):
+        pass
+
+
+busio = SimpleNamespace(SPI=SPI)
+
+
+# ========================================
+# RPi.GPIO
+# ========================================
+
+class _PWM:
+    """RPi.GPIO.PWM - 듀티비만 기록"""
+
+    def __init__(self, pin, frequency):
+        self.pin = pin
+        self.frequency = frequency
+
+    def start(self, duty):
+        get_world().pwm[self.pin] = duty
+
+    def ChangeDutyCycle(self, duty):
+        get_world().pwm[self.pin] = duty
+
+    def ChangeFrequency(self, frequency):
+        self.frequency = frequency
+
+    def stop(self):
+        get_world().pwm.pop(self.pin, None)
+
+
+def _channels(channel):
+    return list(channel) if isinstance(channel, (list, tuple)) else [channel]
+
+
+def _spin_until(deadline):
+    """짧은 대기 (펄스 폭 재현용, sleep보다 정확)"""
+    while time.perf_counter() < deadline:
+        pass
+
+
+class _EdgeDetect:
+    """add_event_detect 등록 정보"""
+    __slots__ = ('edge', 'callbacks', 'bouncetime', 'level', 'last_event', 'detected')
+
+    def __init__(self, edge, bouncetime, level):
+        self.edge = edge
+        self.callbacks = []
+        self.bouncetime = (bouncetime or 0) / 1000.0
+        self.level = level
+        self.last_event = None
+        self.detected = False
+
+
+class _GPIO:
+    """RPi.GPIO 모듈 대체"""
+    BCM = 11
+    BOARD = 10
+    OUT = 0
+    IN = 1
+    HIGH = 1
+    LOW = 0
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+    PWM = _PWM
+
+    def __init__(self):
+        self._mode = None
+        self._inputs = set()
+        self._edges = {}  # 핀 -> _EdgeDetect
+        self._edge_lock = threading.Lock()
+        self._events = queue.SimpleQueue()  # 이벤트 스레드에서 실행할 작업 (에코 펄스 등)
+        self._event_thread = None
+
+    def setmode(self, mode):
+        if self._mode is not None and self._mode != mode:
+            raise ValueError("A different mode has already been set!")
+        self._mode = mode
+
+    def getmode(self):
+        return self._mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, channel, direction, pull_up_down=PUD_OFF, initial=None):
+        world = get_world()
+        for pin in _channels(channel):
+            if direction == self.OUT:
+                self._inputs.discard(pin)
+                world.outputs[pin] = self.LOW if initial is None else int(initial)
+            else:
+                self._inputs.add(pin)
+
+    def output(self, channel, value):
+        world = get_world()
+        pins = _channels(channel)
+        values = _channels(value) if isinstance(value, (list, tuple)) else [value] * len(pins)
+        for pin, v in zip(pins, values):
+            previous = world.outputs.get(pin)
+            world.outputs[pin] = int(v)
+            # 초음파 TRIG 펄스 끝 (HIGH -> LOW) -> 에코 펄스
+            if previous and not v and pin in world.ultrasonic_wiring:
+                self._post(lambda trig=pin: self._echo(trig))
+        world.count('gpio_output')
+
+    def input(self, channel):
+        world = get_world()
+        if channel in world.inputs:
+            return world.inputs[channel]
+        if channel in world.outputs and channel not in self._inputs:
+            return world.outputs[channel]
+        return int(bool(world.value('digital', channel)))
+
+    def cleanup(self, channel=None):
+        world = get_world()
+        pins = list(world.outputs) if channel is None else _channels(channel)
+        for pin in pins:
+            world.outputs.pop(pin, None)
+            world.pwm.pop(pin, None)
+            self._inputs.discard(pin)
+        with self._edge_lock:
+            for pin in (list(self._edges) if channel is None else pins):
+                self._edges.pop(pin, None)
+
+    # ---------------- 에지 감지 ----------------
+
+    def add_event_detect(self, channel, edge, callback=None, bouncetime=None):
+        with self._edge_lock:
+            if channel in self._edges:
+                raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+            detect = self._edges[channel] = _EdgeDetect(edge, bouncetime, self.input(channel))
+            if callback is not None:
+                detect.callbacks.append(callback)
+        self._start_events()
+
+    def add_event_callback(self, channel, callback):
+        with self._edge_lock:
+            detect = self._edges.get(channel)
+            if detect is None:
+                raise RuntimeError("Add event detection using add_event_detect first before adding a callback")
+            detect.callbacks.append(callback)
+
+    def remove_event_detect(self, channel):
+        with self._edge_lock:
+            self._edges.pop(channel, None)
+
+    def event_detected(self, channel):
+        with self._edge_lock:
+            detect = self._edges.get(channel)
+            if detect is None or not detect.detected:
+                return False
+            detect.detected = False
+            return True
+
+    def set_input(self, channel, level):
+        """입력 핀 값 구동 (에지 감지 중이면 콜백 호출, 호출한 스레드에서 실행)"""
+        level = int(bool(level))
+        get_world().inputs[channel] = level
+        self._edge(channel, level)
+
+    def _edge(self, channel, level):
+        with self._edge_lock:
+            detect = self._edges.get(channel)
+            if detect is None or detect.level == level:
+                return
+            detect.level = level
+            if detect.edge == self.RISING and not level or detect.edge == self.FALLING and level:
+                return
+            now = time.monotonic()
+            if detect.last_event is not None and now - detect.last_event < detect.bouncetime:
+                return
+            detect.last_event = now
+            detect.detected = True
+            callbacks = list(detect.callbacks)
+        for callback in callbacks:
+            try:
+                callback(channel)
+            except Exception:
+                traceback.print_exc()
+
+    def _post(self, task):
+        self._start_events()
+        self._events.put(task)
+
+    def _start_events(self):
+        with self._edge_lock:
+            if self._event_thread is not None:
+                return
+            self._event_thread = threading.Thread(target=self._run_events, name="sim-gpio-events", daemon=True)
+        self._event_thread.start()
+
+    def _run_events(self):
+        """콜백 스레드 (RPi.GPIO처럼 콜백은 스레드 하나에서 순서대로 실행)"""
+        while True:
+            try:
+                task = self._events.get(timeout=EDGE_POLL_INTERVAL)
+            except queue.Empty:
+                task = None
+            if task is not None:
+                task()
+            self._poll_waveforms()
+
+    def _poll_waveforms(self):
+        """파형으로 정의된 입력 핀의 값 변화를 에지로 전달"""
+        world = get_world()
+        with self._edge_lock:
+            pins = [pin for pin in self._edges if pin not in world.inputs]
+        for pin in pins:
+            self._edge(pin, int(bool(world.value('digital', pin))))
+
+    def _echo(self, trig_pin):
+        """TRIG 펄스에 대한 ECHO 펄스 (폭 = 왕복 시간)"""
+        world = get_world()
+        echo_pin = world.ultrasonic_wiring.get(trig_pin)
+        if echo_pin is None or world.fails('hcsr04', trig_pin):
+            return  # 에코 없음
+        distance = max(world.value('distance', trig_pin), 2.0)
+        _spin_until(time.perf_counter() + HCSR04_ECHO_DELAY)
+        start = time.perf_counter()
+        self.set_input(echo_pin, 1)
+        _spin_until(start + 2 * distance / SPEED_OF_SOUND)
+        self.set_input(echo_pin, 0)
+
+
+gpio = _GPIO()
+
+
+# ========================================
+# adafruit_dht
+# ========================================
+
+class DHT11:
+    """adafruit_dht.DHT11 - 2초 이내 재측정은 이전 값 반환, 실패 시 RuntimeError"""
+
+    def __init__(self, pin, use_pulseio=True):
+        self.pin = pin
+        self._last_called = None
+        self._temperature = None
+        self._humidity = None
+
+    def measure(self):
+        world = get_world()
+        now = time.monotonic()
+        if self._last_called is not None and now - self._last_called < 2.0:
+            return
+        self._last_called = now
+        world.count('dht11_read')
+        world.delay('dht11')
+        key = _pin_id(self.pin)
+        if world.fails('dht11', key):
+            raise RuntimeError("Checksum did not validate. Try again.")
+        self._temperature = float(round(world.value('temp', key)))
+        self._humidity = int(round(min(max(world.value('humidity', key), 0.0), 100.0)))
+
+    @property
+    def temperature(self):
+        self.measure()
+        return self._temperature
+
+    @property
+    def humidity(self):
+        self.measure()
+        return self._humidity
+
+    def exit(self):
+        pass
+
+
+adafruit_dht = SimpleNamespace(DHT11=DHT11)
+
+
+# ========================================
+# mh_z19
+# ========================================
+
+MH_Z19_DEFAULT_PORT = '/dev/serial0'
+
+
+def _mh_z19_read_all(serial_console_untouched=False):
+    world = get_world()
+    world.count('mh_z19_read')
+    world.delay('mh_z19')
+    if world.fails('mh_z19', MH_Z19_DEFAULT_PORT):
+        return {}
+    co2 = int(round(min(max(world.value('co2', MH_Z19_DEFAULT_PORT), 0.0), 5000.0)))
+    temperature = int(round(world.value('temp', MH_Z19_DEFAULT_PORT)))
+    return {'co2': co2, 'temperature': temperature}
+
+
+def _mh_z19_read(serial_console_untouched=False):
+    result = _mh_z19_read_all(serial_console_untouched)
+    return {'co2': result['co2']} if result else {}
+
+
+mh_z19 = SimpleNamespace(read_all=_mh_z19_read_all, read=_mh_z19_read)
+
+
+# ========================================
+# serial (pyserial) - 포트마다 MH-Z19B 한 대가 연결된 것으로 동작
+# ========================================
+
+def _mh_z19_checksum(frame):
+    return (0xFF - (sum(frame[1:8]) & 0xFF) + 1) & 0xFF
+
+
+class SerialException(OSError):
+    pass
+
+
+class Serial:
+    """
+    serial.Serial - 파이프로 만든 fileno()를 제공해서 selector로 기다릴 수 있음
+
+    CO2 읽기 명령(FF 01 86 ...)을 쓰면 'mh_z19' 지연 후 'co2' 파형(키: 포트 경로) 값으로 응답합니다.
+    실패로 뽑히면 체크섬이 틀린 응답을 보냅니다.
+    """
+
+    def __init__(self, port=None, baudrate=9600, bytesize=8, parity='N', stopbits=1, timeout=None, **kwargs):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self._r, self._w = os.pipe()
+        os.set_blocking(self._r, False)
+        self._lock = threading.Lock()
+        self.is_open = True
+        get_world().count('serial_open')
+
+    def fileno(self):
+        return self._r
+
+    def write(self, data):
+        data = bytes(data)
+        world = get_world()
+        world.count('serial_write')
+        if len(data) == 9 and data[0] == 0xFF and data[2] == 0x86 and data[8] == _mh_z19_checksum(data):
+            world.count('mh_z19_read')
+            co2 = int(round(min(max(world.value('co2', self.port), 0.0), 5000.0)))
+            temperature = int(round(world.value('temp', self.port))) + 40
+            response = bytearray([0xFF, 0x86, co2 >> 8, co2 & 0xFF, temperature & 0xFF, 0, 0, 0, 0])
+            response[8] = _mh_z19_checksum(response)
+            if world.fails('mh_z19', self.port):
+                response[8] ^= 0xFF
+            delay = world.latency.get('mh_z19', 0.0) * world.latency_scale
+            if delay > 0:
+                timer = threading.Timer(delay, self._respond, (bytes(response),))
+                timer.daemon = True
+                timer.start()
+            else:
+                self._respond(bytes(response))
+        return len(data)
+
+    def _respond(self, data):
+        with self._lock:
+            if self.is_open:
+                os.write(self._w, data)
+
+    def read(self, size=1):
+        try:
+            return os.read(self._r, size)
+        except BlockingIOError:
+            return b""
+
+    def reset_input_buffer(self):
+        while self.read(512):
+            pass
+
+    def close(self):
+        with self._lock:
+            if not self.is_open:
+                return
+            self.is_open = False
+            os.close(self._r)
+            os.close(self._w)
+
+
+serial = SimpleNamespace(Serial=Serial, SerialException=SerialException)
+
+
+# ========================================
+# hcsr04sensor.sensor
+# ========================================
+
+class Measurement:
+    """hcsr04sensor.sensor.Measurement - 샘플 중간값 반환"""
+
+    def __init__(self, trig_pin, echo_pin, temperature=20, unit='metric'):
+        self.trig_pin = trig_pin
+        self.echo_pin = echo_pin
+
+    def raw_distance(self, sample_size=11, sample_wait=0.1):
+        world = get_world()
+        world.count('hcsr04_read')
+        samples = []
+        for _ in range(sample_size):
+            world.delay('hcsr04_trigger')
+            if world.fails('hcsr04', self.trig_pin):
+                world.sleep(HCSR04_TIMEOUT)
+                distance = HCSR04_TIMEOUT * SPEED_OF_SOUND / 2
+            else:
+                distance = max(world.value('distance', self.trig_pin), 2.0)
+                world.sleep(2 * distance / SPEED_OF_SOUND)
+            samples.append(distance)
+            world.sleep(sample_wait)
+        samples.sort()
+        return samples[len(samples) // 2]
+
+
+hcsr04_sensor = SimpleNamespace(Measurement=Measurement)
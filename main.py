@@ -3,28 +3,46 @@
 
 사용 방법:
     1. device_serial: 디바이스 시리얼 넘버 설정
-    2. slots: 슬롯 번호 리스트 (예: [1], [1,2,3,4])
-    3. pin_map: 슬롯별 GPIO 핀 번호 설정
-    4. python smartfarm/main.py 실행
+    2. pin_map: 슬롯별 GPIO 핀 번호 설정 (적은 슬롯만 실행)
+    3. python main.py 실행
+
+설정 파일로 실행 (main.py 안의 설정 대신 사용, smartfarm.example.toml 참고):
+    python main.py smartfarm.toml
+
+디바이스 여러 대를 프로세스 하나로 실행 (설정 파일):
+    python gateway.py smartfarm.toml
+
+라즈베리파이 없이 실행 (시뮬레이션 센서/액추에이터, hal/sim.py):
+    SMARTFARM_HAL=sim python main.py
 """
 
+import os
+import sys
 import time
-import board
-from mqtt.mqtt_client import MqttClient
-from service.read_sensors import read_slot_sensors, read_ultrasonic_sensor, read_water_tank_sensor, init_sensor_caches, stop_sensor_caches
-from service.actuator_control import ActuatorController
-from service.water_tank_monitor import WaterTankMonitor
-from Actuator.heater import Heater
-from Actuator.water_pump import WaterPump
-from Actuator.ventilation_fan import VentilationFan
-from Actuator.servomotor import ServoMotor
-from Actuator.led import LED
+import asyncio
+from hal.backend import board
+from mqtt.mqtt_connection import MqttConnection
+from mqtt.offline_queue import OfflineQueue
+from service.read_sensors import stop_sensor_caches
+from service.config import load_config, parse_config, ConfigReloader
+from service.device import FarmDevice
+from service.metrics import enable_metrics, install_dump_signal, register_gauge, MetricsReporter
+from service import log as smartfarm_log
+from Actuator.gpio_output import get_output_bank
+from service.startup import StartupTimer
+
+def main(config_path=None):
+    startup = StartupTimer()  # 시작 단계별 시간 (첫 제어 주기 후 출력)
 
-def main():
     # ========================================
     # 여기만 수정하세요!
     # ========================================
     
+    # 설정 파일 (TOML/JSON, 지정하면 아래 설정 대신 파일 값 사용 - smartfarm.example.toml 참고)
+    # - python main.py smartfarm.toml 또는 SMARTFARM_CONFIG=smartfarm.toml
+    # - kill -HUP <pid> 로 제어 튜닝값(주기, 물탱크 임계값, 여유값, LED 시간대)을 재시작 없이 다시 읽음
+    config_path = config_path or os.environ.get("SMARTFARM_CONFIG")
+    
     # 디바이스 시리얼 넘버
     device_serial = "B1002"
     
@@ -35,28 +53,37 @@ def main():
     # 센서 읽기 주기 (초)
     interval = 10
     
-    # 디바이스 모델 자동 판별 (시리얼 규칙)
-    # - 고급형 4슬롯: A4xxx  → slots=[1,2,3,4], has_co2=True
-    # - 고급형 1슬롯: A1xxx  → slots=[1],       has_co2=True
-    # - 일반형 4슬롯: B4xxx  → slots=[1,2,3,4], has_co2=False
-    # - 일반형 1슬롯: B1xxx  → slots=[1],       has_co2=False
-    model_prefix = device_serial[:2].upper()  # 예: A4, A1, B4, B1
-    if model_prefix == "A4":
-        slots = [1, 2, 3, 4]
-        has_co2 = True
-    elif model_prefix == "A1":
-        slots = [1]
-        has_co2 = True
-    elif model_prefix == "B4":
-        slots = [1, 2, 3, 4]
-        has_co2 = False
-    elif model_prefix == "B1":
-        slots = [1]
-        has_co2 = False
-    else:
-        # 기본값: 1슬롯, CO2 없음
-        slots = [1]
-        has_co2 = False
+    # 센서 데이터 묶음 전송 (True: 모든 슬롯을 주기당 1메시지로 smartfarm/{시리얼}/sensor/batch 에 전송)
+    # payload_encoding: "text" (key=value 형식) 또는 "binary" (압축 형식, mqtt/payload_codec.py로 디코딩)
+    batch_publish = False
+    payload_encoding = "text"
+    
+    # 브로커 연결이 끊긴 동안 센서 데이터/알림을 저장할 오프라인 대기열 (None이면 사용 안 함)
+    offline_queue_path = os.environ.get(
+        "SMARTFARM_OFFLINE_QUEUE",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "offline_queue.db"),
+    )
+    offline_queue_max_messages = 20000
+    
+    # 주기 단계별 계측 (smartfarm/{시리얼}/metrics 로 전송, kill -USR1 <pid> 로 즉시 출력)
+    metrics_enabled = True
+    metrics_interval = 60  # 전송 주기 (초)
+    
+    # 로그 (주기마다 찍히는 센서값은 DEBUG, 기본 INFO에서는 상태 변경/경고만 기록)
+    # - log_sink: "ram" (SD 카드 쓰기 없음, kill -USR2 <pid> 로 출력), "file" (회전 파일), "console"
+    # - WARNING 이상은 log_sink와 상관없이 화면에도 출력
+    # - 같은 메시지는 log_rate_limit초에 한 번만 기록 (생략 횟수는 repeated=N 으로 표시)
+    log_level = os.environ.get("SMARTFARM_LOG_LEVEL", "INFO")
+    log_sink = os.environ.get("SMARTFARM_LOG_SINK", "ram")
+    log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "smartfarm.log")
+    log_rate_limit = 60
+    
+    # 디바이스 모델 자동 판별 (시리얼 규칙, service/config.py의 MODEL_PROFILES)
+    # - 고급형 4슬롯: A4xxx  → 슬롯 1~4, CO2 센서 있음
+    # - 고급형 1슬롯: A1xxx  → 슬롯 1,   CO2 센서 있음
+    # - 일반형 4슬롯: B4xxx  → 슬롯 1~4, CO2 센서 없음 (co2_port 무시)
+    # - 일반형 1슬롯: B1xxx  → 슬롯 1,   CO2 센서 없음
+    # 아래 핀 배치에 적은 슬롯만 실행합니다. (여러 디바이스를 프로세스 하나로 실행하려면 gateway.py 사용)
     
         # 슬롯별 액추에이터 GPIO 핀 번호 (test 파일 기준)
     actuator_pin_map = {
@@ -68,10 +95,10 @@ def main():
     
     # 슬롯별 센서 핀 번호 / 채널 (test 파일 기준)
     sensor_pin_map = {
-        1: {'dht11_pin': board.D22,  'photo_channel': 0, 'soil_channel': 1, 'co2_port': '/dev/serial0' if has_co2 else None},   # 슬롯 1
-        # 2: {'dht11_pin': board.D17, 'photo_channel': 1, 'soil_channel': 2, 'co2_port': '/dev/serial1' if has_co2 else None},   # 슬롯 2
-        # 3: {'dht11_pin': board.D18, 'photo_channel': 2, 'soil_channel': 3, 'co2_port': '/dev/serial2' if has_co2 else None},   # 슬롯 3
-        # 4: {'dht11_pin': board.D27, 'photo_channel': 3, 'soil_channel': 4, 'co2_port': '/dev/serial3' if has_co2 else None},   # 슬롯 4
+        1: {'dht11_pin': board.D22,  'photo_channel': 0, 'soil_channel': 1, 'co2_port': '/dev/serial0'},   # 슬롯 1
+        # 2: {'dht11_pin': board.D17, 'photo_channel': 1, 'soil_channel': 2, 'co2_port': '/dev/serial1'},   # 슬롯 2
+        # 3: {'dht11_pin': board.D18, 'photo_channel': 2, 'soil_channel': 3, 'co2_port': '/dev/serial2'},   # 슬롯 3
+        # 4: {'dht11_pin': board.D27, 'photo_channel': 3, 'soil_channel': 4, 'co2_port': '/dev/serial3'},   # 슬롯 4
     }
     
     # 초음파 센서 (통합 - 슬롯 공유, 물통 거리 측정)
@@ -81,131 +108,116 @@ def main():
     # 물통 수위 센서 (통합 - 슬롯 공유, 디지털 신호)
     water_tank_pin = board.D26
 
+    # 슬롯별 히터 제어 방식 (없는 슬롯은 "bangbang")
+    # - "bangbang": 적정 온도 -2도 미만이면 ON, 이상이면 OFF
+    # - "pid": PID + 시간 비례 출력 (릴레이 전환 횟수 감소, 온도 흔들림 감소)
+    heater_mode_map = {
+        1: "bangbang",
+    }
+
+    # 물탱크 모니터 (급수탱크 높이/경고 수위 cm, 같은 알림 최소 간격 초)
+    water_tank = {'supply_tank_height': 20, 'supply_low_threshold': 5, 'supply_critical_threshold': 3,
+                  'alert_cooldown': 300}
+
+    # 제어 튜닝값 (LED 작동 시간대, 프리셋 여유값 margins 등 - 전체 항목은 smartfarm.example.toml 참고)
+    control = {'led_hours': [8, 22]}
+
     # ========================================
     # 아래는 수정하지 마세요
     # ========================================
 
+    # 설정 검증 (잘못된 핀/값은 여기서 ValueError)
+    if config_path:
+        config = load_config(config_path)
+        if len(config.devices) != 1:
+            raise SystemExit("디바이스가 여러 대인 설정 파일은 gateway.py로 실행하세요")
+    else:
+        config = parse_config({
+            'broker': broker,
+            'interval': interval,
+            'offline_queue': offline_queue_path,
+            'offline_queue_max_messages': offline_queue_max_messages,
+            'metrics': {'enabled': metrics_enabled, 'interval': metrics_interval},
+            'water_tank': water_tank,
+            'control': control,
+            'devices': [{
+                'serial': device_serial,
+                'slots': {
+                    slot: {'actuators': actuator_pin_map[slot], 'sensors': sensor_pin_map[slot],
+                           'heater_mode': heater_mode_map.get(slot, 'bangbang')}
+                    for slot in actuator_pin_map
+                },
+                'ultrasonic_pins': [ultrasonic_trig, ultrasonic_echo],
+                'water_tank_pin': water_tank_pin,
+                'batch_publish': batch_publish,
+                'payload_encoding': payload_encoding,
+            }],
+        })
+    device_config = config.devices[0]
+    startup.mark("config")
+
+    smartfarm_log.configure_logging(level=log_level, sink=log_sink, path=log_path, rate_limit=log_rate_limit)
+    smartfarm_log.install_dump_signal()
+
     print("=" * 60)
     print("🌱 스마트팜 시스템 시작")
     print("=" * 60)
-    print(f"📟 디바이스: {device_serial}")
-    print(f"🌐 MQTT 브로커: {broker}")
-    print(f"⏱️  센서 읽기 주기: {interval}초")
+    print(f"📟 디바이스: {device_config.serial} (모델 {device_config.model})")
+    print(f"🌐 MQTT 브로커: {device_config.broker}")
+    print(f"⏱️  센서 읽기 주기: {device_config.interval}초")
     print("=" * 60)
 
-    # 슬롯별 객체 저장
-    clients = {}
-    controllers = {}
-    actuators = {}  # cleanup 용도
-    
-    def create_preset_callback(slot_num):
-        """슬롯별 프리셋 업데이트 콜백 생성 (클로저)"""
-        def on_preset_updated(new_preset):
-            timestamp = time.strftime("%H:%M:%S")
-            print(f"\n🔄 [{timestamp}] 슬롯 {slot_num} 프리셋 실시간 업데이트!")
-            print(f"   🌡️  온도: {new_preset.get('OptimalTemp')}°C")
-            print(f"   💧 습도: {new_preset.get('OptimalHumidity')}%")
-            print(f"   💡 조도: {new_preset.get('LightIntensity')} lux")
-            print(f"   🌱 토양: {new_preset.get('SoilMoisture')} ADC")
-            print(f"   🌫️  CO2: {new_preset.get('Co2Level')} ppm")
-            print(f"   ✅ 다음 제어 사이클({interval}초 이내)에 자동 반영됩니다.\n")
-        return on_preset_updated
-    
-    # 물탱크 모니터 초기화 (디바이스 단위로 1개 - 모든 슬롯 공유)
-    # 첫 번째 슬롯의 MQTT 클라이언트 사용 (알림 전송용)
-    water_monitor = None
+    # 디바이스 공유 MQTT 연결 (TCP 연결/네트워크 스레드 1개, 슬롯은 토픽별로 구독)
+    offline_queue = None
+    if config.offline_queue:
+        offline_queue = OfflineQueue(config.offline_queue, max_messages=config.offline_queue_max_messages)
+        print(f"📦 오프라인 대기열: {config.offline_queue} ({len(offline_queue)}건 대기 중)")
+    connection = MqttConnection(device_config.broker, port=device_config.port, offline_queue=offline_queue)
+    startup.mark("connect")
+
+    metrics_reporter = None
+    if config.metrics_enabled:
+        enable_metrics()
+        install_dump_signal()
+        register_gauge("gpio", lambda: get_output_bank().stats())
+        if offline_queue is not None:
+            register_gauge("offline_queue", lambda: {'pending': len(offline_queue), 'evicted': offline_queue.evicted})
+        register_gauge("startup", startup.as_dict)
+        metrics_reporter = MetricsReporter(connection, device_config.serial, interval=config.metrics_interval)
+
+    device = FarmDevice(device_config, connection)
 
     try:
-        # 슬롯별 초기화
+        # 슬롯별 초기화 (슬롯마다 동시에)
         print("\n🔧 슬롯 초기화 중...")
-        for slot in slots:
-            farm_uid = f"{device_serial}:{slot}"
-            act_pins = actuator_pin_map[slot]
-            sens_pins = sensor_pin_map[slot]
-            
-            print(f"\n  슬롯 {slot} ({farm_uid})")
-            print(f"    🔥 히터: GPIO {act_pins['heater']}")
-            print(f"    💧 물펌프: GPIO {act_pins['water_ib1']}/{act_pins['water_ib2']}")
-            print(f"    🌀 환기팬: GPIO {act_pins['fan']}")
-            print(f"    led: GPIO {act_pins['led']}")
-            print(f"    🌡️  DHT11: GPIO {sens_pins['dht11_pin']}")
-            print(f"    💡 조도센서: 채널 {sens_pins['photo_channel']}")
-            print(f"    🌱 토양센서: 채널 {sens_pins['soil_channel']}")
-            print(f"    🌫️  CO2센서: {sens_pins['co2_port'] if has_co2 else '없음(일반형)'}")
-            
-            # 액추에이터 초기화
-            heater = Heater(act_pins['heater'])
-            water_pump = WaterPump(act_pins['water_ib1'], act_pins['water_ib2'])
-            ventilation_fan = VentilationFan(act_pins['fan'])
-            led =  LED(act_pins['led'])
-                
-            servo = None
-            if 'servo' in act_pins and act_pins['servo'] is not None:
-                servo = ServoMotor(act_pins['servo'])
-                print(f"    🫧 CO2 서보: GPIO {act_pins['servo']}")
-            
-            # MQTT 클라이언트 초기화
-            client = MqttClient(farm_uid, broker)
-            
-            # 프리셋 업데이트 콜백 등록 (MQTT로 실시간 변경 감지)
-            preset_callback = create_preset_callback(slot)
-            client.set_preset_update_callback(preset_callback)
-            
-            # 물탱크 모니터 초기화 (첫 번째 슬롯에서만)
-            if water_monitor is None:
-                water_monitor = WaterTankMonitor(client, device_serial)
-                print(f"\n  💧 물탱크 모니터 초기화 완료")
-                print(f"    - 급수탱크: 초음파 센서 (GPIO {ultrasonic_trig}/{ultrasonic_echo})")
-                print(f"    - 물받이탱크: 워터 센서 (GPIO {water_tank_pin})")
-            
-            # 액추에이터 컨트롤러 초기화
-            controller = ActuatorController(heater, water_pump, ventilation_fan, led, water_monitor, co2_servo=servo)
-            
-            # 저장
-            clients[slot] = client
-            controllers[slot] = controller
-            actuators[slot] = {
-                'heater': heater,
-                'water_pump': water_pump,
-                'ventilation_fan': ventilation_fan,
-                'led': led,
-                'servo': servo,
-            }
+        device.setup()
+        if config_path:
+            ConfigReloader(
+                config_path, config,
+                lambda new_config: device.apply_config(new_config.device(device.device_serial) or device.config),
+            ).install()
+        startup.mark("slots")
 
-        # 센서 캐시 초기화 (DHT11, CO2 백그라운드 스레드 시작)
+        # 프리셋 요청을 먼저 보내고, 응답을 기다리는 동안 센서 캐시 시작
+        print(f"\n📡 DB 서버에 프리셋 요청 중...")
+        device.request_presets()
+
+        # 센서 캐시 초기화 (DHT11, CO2, 초음파 - 공유 스케줄러 스레드에 등록), 첫 값까지만 대기
         print("\n🔄 센서 캐시 초기화 중...")
-        for slot in slots:
-            init_sensor_caches(slot, sensor_pin_map[slot], has_co2=has_co2)
-        time.sleep(3)  # 워밍업 대기
+        device.start_sensors()
+        pending = device.wait_sensors()
+        if pending:
+            print(f"⚠️ 첫 값을 받지 못한 센서: {', '.join(pending)} (값이 들어오면 반영)")
+        startup.mark("sensors")
 
-        # 프리셋 요청
-        print(f"\n📡 DB 서버에 프리셋 요청 중...")
-        for slot in slots:
-            clients[slot].request_preset()
-        
-        # 프리셋 응답 대기 (최대 10초)
+        # 프리셋 응답 대기 (받는 즉시 진행, 최대 preset_timeout초)
         print(f"⏳ 프리셋 응답 대기 중...")
-        wait_count = 0
-        all_ready = False
-        while not all_ready and wait_count < 10:
-            all_ready = all(clients[s].is_preset_ready() for s in slots)
-            if not all_ready:
-                print(f"   ({wait_count + 1}/10초)")
-                time.sleep(1)
-                wait_count += 1
-        
-        print("\n✅ 프리셋 설정 완료!")
-        for slot in slots:
-            if clients[slot].is_preset_ready():
-                preset = clients[slot].get_preset()
-                print(f"\n  슬롯 {slot}")
-                print(f"    온도: {preset.get('OptimalTemp')}°C")
-                print(f"    습도: {preset.get('OptimalHumidity')}%")
-                print(f"    조도: {preset.get('LightIntensity')} lux")
-                print(f"    토양: {preset.get('SoilMoisture')} ADC")
-                print(f"    CO2: {preset.get('Co2Level')} ppm")
-            else:
-                print(f"\n  슬롯 {slot}: 기본값으로 동작")
+        if device.wait_presets(config.preset_timeout):
+            print("\n✅ 프리셋 설정 완료!")
+        else:
+            print("\n⚠️ 일부 슬롯은 프리셋 응답이 없어 기본값으로 동작")
+        startup.mark("presets")
+        device.print_presets()
         
         print("\n" + "=" * 60)
         print("💡 센서 데이터는 DB 서버로 전송")
@@ -214,81 +226,33 @@ def main():
         print("=" * 60)
         print("\n✅ 센서 데이터 전송 및 자동 제어 시작...\n")
         
-        # 메인 루프
-        while True:
-            try:
-                # ========================================
-                # 통합 센서 읽기 (모든 슬롯 공유)
-                # ========================================
-                
-                # 1. 급수 물탱크 (초음파 센서)
-                distance = read_ultrasonic_sensor(ultrasonic_trig, ultrasonic_echo)
-                supply_status = water_monitor.check_supply_tank(distance)
-                
-                # 2. 물받이 물탱크 (워터 센서)
-                water_tank_detected = read_water_tank_sensor(water_tank_pin)
-                overflow_status = water_monitor.check_overflow_tank(water_tank_detected)
-                
-                # 물탱크 상태 요약
-                tank_summary = water_monitor.get_status_summary()
-                if tank_summary['alert_status'] != "정상":
-                    water_monitor.mqtt_client.send_notification_logs(f"[WARNING] [물탱크] 급수상태={supply_status}, 물받이상태={overflow_status}")
-                    print(f"\n⚠️  물탱크 주의: 급수={supply_status}, 물받이={overflow_status}\n")
-                
-                # ========================================
-                # 슬롯별 처리
-                # ========================================
-                for slot in slots:
-                    # 슬롯별 센서 읽기 (온도, 습도, 조도, 토양수분, CO2)
-                    temp, hum, light_adc, soil_adc, co2 = read_slot_sensors(slot, sensor_pin_map[slot], has_co2=has_co2)
-                    
-                    # 센서 데이터 전송
-                    clients[slot].send_sensor_data(temp, hum, light_adc, soil_adc, co2)
-                    
-                    # 액추에이터 자동 제어 (프리셋 기반 + 물탱크 안전 체크)
-                    sensor_data = {
-                        'temp': temp,
-                        'humidity': hum,
-                        'light': light_adc,
-                        'soil': soil_adc,
-                        'co2': co2
-                    }
-                    preset = clients[slot].get_preset()
-                    controllers[slot].control(sensor_data, preset)
-                
-                # 대기
-                time.sleep(interval)
-                
-            except KeyboardInterrupt:
-                print("\n\n🛑 사용자에 의해 중단됨")
-                break
-            except Exception as e:
-                print(f"❌ 루프 오류: {e}")
-                print(f"⏳ {interval}초 후 재시도...")
-                time.sleep(interval)
-                
+        # 메인 루프 (asyncio - 센서 읽기 동시 실행, 절대 기한 기준 주기)
+        # 디바이스 단위 묶음 전송(batch_publish)은 첫 번째 슬롯의 MQTT 클라이언트 사용
+        # 첫 주기가 끝나면 시작 단계별 시간 출력
+        control_loop = device.create_loop(
+            metrics_reporter=metrics_reporter,
+            on_first_cycle=lambda: startup.finish("first_cycle"),
+        )
+        try:
+            asyncio.run(control_loop.run())
+        except KeyboardInterrupt:
+            print("\n\n🛑 사용자에 의해 중단됨")
+
     finally:
         print("\n🔌 MQTT 연결 종료 중...")
-        for slot in slots:
-            clients[slot].close()
+        device.close_clients()
+        connection.close()
         
         # 센서 캐시 중지
         stop_sensor_caches()
         
         # 액추에이터 정리
         print("🧹 액추에이터 정리 중...")
-        for slot in slots:
-            controllers[slot].stop_all()
-            actuator_set = actuators[slot]
-            actuator_set['heater'].cleanup()
-            actuator_set['water_pump'].cleanup()
-            actuator_set['ventilation_fan'].cleanup()
-            actuator_set['led'].cleanup()
-            if actuator_set['servo']:
-                actuator_set['servo'].cleanup()
+        device.cleanup_actuators()
         time.sleep(1)
+        smartfarm_log.shutdown_logging()
         print("✅ 프로그램 종료\n")
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
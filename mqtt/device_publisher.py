@@ -0,0 +1,55 @@
+"""
+디바이스 단위 센서 데이터 전송
+
+슬롯마다 메시지를 보내는 대신 한 주기 동안 모든 슬롯의 값을 모아
+smartfarm/{device_serial}/sensor/batch 토픽으로 한 번만 전송합니다.
+"""
+import threading
+from mqtt.payload_codec import encode, TEXT
+from service.log import get_logger, fields
+
+log = get_logger("mqtt.publisher")
+
+
+class DevicePublisher:
+    """주기 단위 센서 데이터 묶음 전송"""
+
+    def __init__(self, mqtt_client, device_serial, encoding=TEXT):
+        """
+        Args:
+            mqtt_client: 전송에 사용할 MqttClient
+            device_serial: 디바이스 시리얼 번호 (예: "A4001")
+            encoding: "text" 또는 "binary"
+        """
+        self.mqtt_client = mqtt_client
+        self.device_serial = device_serial
+        self.encoding = encoding
+        self.topic = f"smartfarm/{device_serial}/sensor/batch"
+        self._batch = {}
+        self._lock = threading.Lock()
+
+    def add(self, slot, temp=None, hum=None, light=None, soil=None, co2=None, age=None):
+        """슬롯 센서값 추가 (같은 슬롯은 마지막 값으로 대체)"""
+        data = {'temp': temp, 'humidity': hum, 'light': light, 'soil': soil, 'co2': co2, 'age': age}
+        if all(v is None for v in data.values()):
+            return
+        with self._lock:
+            self._batch[slot] = data
+
+    def flush(self):
+        """
+        모은 값을 한 메시지로 전송
+
+        Returns:
+            전송한 페이로드, 보낼 값이 없으면 None
+        """
+        with self._lock:
+            batch, self._batch = self._batch, {}
+        if not batch:
+            log.warning("전송할 센서 데이터 없음", extra=fields(device=self.device_serial))
+            return None
+
+        payload = encode(batch, self.encoding)
+        self.mqtt_client.connection.publish(self.topic, payload, qos=0)
+        log.debug("센서 데이터 묶음 %d슬롯, %d bytes", len(batch), len(payload), extra=fields(topic=self.topic))
+        return payload
@@ -1,119 +1,126 @@
-import paho.mqtt.client as mqtt
+import threading
 from datetime import datetime
+from mqtt.mqtt_connection import MqttConnection
+from mqtt.preset import Preset
+from service.log import get_logger, fields
+
+log = get_logger("mqtt.client")
 
 class MqttClient:
-    #MQTT 통신 class
+    #MQTT 통신 class (슬롯 단위, 디바이스 공유 연결 위에서 동작)
     
-    def __init__(self, farm_uid, broker="localhost"):
+    def __init__(self, farm_uid, broker="localhost", connection=None):
+        """
+        Args:
+            farm_uid: 슬롯 식별자 (예: "A1001:1")
+            broker: 브로커 주소 (connection이 없을 때만 사용)
+            connection: 공유 MqttConnection (없으면 이 슬롯 전용 연결 생성)
+        """
         self.farm_uid = farm_uid  # 예: "A1001:1"
         self.device_serial = farm_uid.split(':')[0]
         self.slot = int(farm_uid.split(':')[1])
         
-        # MQTT 클라이언트 생성
-        self.client = mqtt.Client()
-        self.client.on_connect = self.on_connect
-        self.client.on_message = self.on_message
-
-        # 현재 프리셋 저장 (기본값)
-        self.current_preset = {
-            'OptimalTemp': '25',
-            'OptimalHumidity': '60',
-            'LightIntensity': '3000',
-            'SoilMoisture': '2000',
-            'Co2Level': '800'
-        }
+        # 디바이스 공유 연결 사용 (없으면 전용 연결 생성)
+        self.owns_connection = connection is None
+        if connection is None:
+            connection = MqttConnection(broker)
+        self.connection = connection
+        self.client = connection.client
+
+        # 현재 프리셋 저장 (기본값, 수신 시점에 파싱/변환된 Preset 객체로 통째로 교체)
+        self.current_preset = Preset()
         self.preset_received = False  # 프리셋 수신 여부
+        self.preset_ready = threading.Event()  # 첫 프리셋 응답(또는 "none") 수신 시 설정 - wait_preset()
         self.preset_update_callback = None  # 프리셋 업데이트 콜백
+        self._preset_listeners = []  # function(preset) - 프리셋이 바뀔 때마다 호출 (제어 즉시 재평가 등)
         
-        # 브로커 연결
-        print(f"MQTT 브로커 연결: {broker}")
-        self.client.connect(broker, 1883, 60)
-        self.client.loop_start()
-        print("연결 완료!")
+        # 프리셋 / 프리셋 응답 토픽 등록 (자기 슬롯만, 재연결 시 라우터가 재구독)
+        self.preset_topic = f"smartfarm/{self.farm_uid}/preset"
+        self.preset_response_topic = f"smartfarm/{self.farm_uid}/preset/response"
+        self.subscribed_topics = [self.preset_topic, self.preset_response_topic]
+        self.connection.add_connect_listener(self.on_connect)
+        for topic in self.subscribed_topics:
+            self.connection.subscribe(topic, self.on_message)
+            log.debug("구독 등록", extra=fields(slot=self.slot, topic=topic))
     
 
     #sub 메서드
     def on_connect(self, client, userdata, flags, rc):
         if rc == 0:
-            print("MQTT 연결 성공")
-            
-            # 프리셋 구독 (자기 슬롯만)
-            preset_topic = f"smartfarm/{self.farm_uid}/preset"
-            self.client.subscribe(preset_topic)
-            print(f"구독 완료 (프리셋): {preset_topic}")
-            
-            # 프리셋 응답 구독 (자기 슬롯만)
-            preset_response_topic = f"smartfarm/{self.farm_uid}/preset/response"
-            self.client.subscribe(preset_response_topic)
-            print(f"구독 완료 (프리셋 응답): {preset_response_topic}")
+            log.info("MQTT 연결 성공 (%s)", self.farm_uid, extra=fields(slot=self.slot))
         else:
-            print(f"연결 실패: {rc}")
+            log.error("MQTT 연결 실패: %s", rc, extra=fields(slot=self.slot))
     
     def on_message(self, client, userdata, msg):
         topic = msg.topic
         payload = msg.payload.decode('utf-8')
 
-        print(f"\n[수신] 토픽: {topic}")
-        print(f"[수신] 페이로드: {payload}")
-
-        # 프리셋 업데이트 수신 (유저가 설정 변경)
-        if topic == f"smartfarm/{self.farm_uid}/preset":
-            params = {}
-            for pair in payload.split(';'):
-                if '=' in pair:
-                    key, value = pair.split('=', 1)
-                    params[key.strip()] = value.strip()
-
-            if params:
-                self.current_preset = { **self.current_preset, **params }
-                print(f"✅ [프리셋 업데이트]")
-                print(f"   {self.current_preset}")
-                
-                # 콜백 호출 (실시간 프리셋 변경 알림)
-                if self.preset_update_callback:
-                    try:
-                        self.preset_update_callback(self.current_preset)
-                    except Exception as e:
-                        print(f"❌ 콜백 실행 오류: {e}")
-        
-        # 프리셋 응답 수신 (시작 시 DB 조회 결과)
-        elif topic == f"smartfarm/{self.farm_uid}/preset/response":
-            if payload == "none":
-                print(f"ℹ️  [프리셋 없음] 기본값 사용")
-                self.preset_received = True
-            else:
-                params = {}
-                for pair in payload.split(';'):
-                    if '=' in pair:
-                        key, value = pair.split('=', 1)
-                        params[key.strip()] = value.strip()
-
-                if params:
-                    self.current_preset = { **self.current_preset, **params }
-                    self.preset_received = True
-                    print(f"✅ [DB 프리셋 수신]")
-                    print(f"   {self.current_preset}")
-                    
-                    # 콜백 호출 (초기 프리셋 로드 알림)
-                    if self.preset_update_callback:
-                        try:
-                            self.preset_update_callback(self.current_preset)
-                        except Exception as e:
-                            print(f"❌ 콜백 실행 오류: {e}")
+        log.debug("수신: %s", payload, extra=fields(slot=self.slot, topic=topic))
+
+        # 프리셋 응답 수신 (시작 시 DB 조회 결과) - DB에 프리셋이 없으면 기본값 사용
+        if topic == self.preset_response_topic and payload == "none":
+            log.info("프리셋 없음 - 기본값 사용", extra=fields(slot=self.slot))
+            self._mark_preset_ready()
+            return
+
+        # 프리셋 업데이트(유저가 설정 변경) / 프리셋 응답 - 같은 형식
+        if topic in (self.preset_topic, self.preset_response_topic):
+            self._apply_preset_payload(payload, from_db=topic == self.preset_response_topic)
+
+    def _apply_preset_payload(self, payload, from_db):
+        """프리셋 파싱/검증 후 교체 및 콜백 호출 (잘못된 프리셋은 무시)"""
+        try:
+            preset = Preset.from_payload(payload, base=self.current_preset)
+        except ValueError as e:
+            log.error("프리셋 오류: %s", e, extra=fields(slot=self.slot))
+            return
+
+        self.current_preset = preset
+        if from_db:
+            self._mark_preset_ready()
+            log.info("DB 프리셋 수신: %s", preset.to_dict(), extra=fields(slot=self.slot))
+        else:
+            log.info("프리셋 업데이트: %s", preset.to_dict(), extra=fields(slot=self.slot))
+
+        # 콜백 호출 (실시간 프리셋 변경 / 초기 프리셋 로드 알림)
+        for callback in [self.preset_update_callback, *self._preset_listeners]:
+            if callback is None:
+                continue
+            try:
+                callback(preset)
+            except Exception as e:
+                log.exception("프리셋 콜백 오류: %s", e, extra=fields(slot=self.slot))
+
+    def _mark_preset_ready(self):
+        self.preset_received = True
+        self.preset_ready.set()
     
     def get_preset(self):
-        """현재 프리셋 반환"""
+        """현재 프리셋 반환 (Preset)"""
         return self.current_preset
     
     def request_preset(self):
         """DB 서버에 프리셋 요청"""
         topic = f"smartfarm/{self.farm_uid}/preset/request"
-        self.client.publish(topic, self.farm_uid, qos=1)
-        print(f"📡 [프리셋 요청] {self.farm_uid}")
+        self.connection.publish(topic, self.farm_uid, qos=1)
+        log.info("프리셋 요청 (%s)", self.farm_uid, extra=fields(slot=self.slot))
     
     def is_preset_ready(self):
         """프리셋 수신 여부 확인"""
         return self.preset_received
+
+    def wait_preset(self, timeout=None):
+        """
+        프리셋 응답 대기 (받는 즉시 반환)
+
+        Returns:
+            bool: timeout초 안에 받았는지 (DB에 프리셋이 없다는 응답도 받은 것으로 처리)
+        """
+        return self.preset_ready.wait(timeout)
+    
+    def set_margins(self, margins):
+        """제어 여유값 변경 (설정 파일 control.margins, 이후 받는 프리셋도 이 여유값 사용)"""
+        self.current_preset = self.current_preset.with_margins(margins)
     
     def set_preset_update_callback(self, callback):
         """프리셋 업데이트 시 호출될 콜백 함수 등록
@@ -122,12 +129,24 @@ class MqttClient:
             callback: function(new_preset) - 프리셋 업데이트 시 호출될 함수
         """
         self.preset_update_callback = callback
-        print(f"✅ [콜백 등록] 프리셋 업데이트 콜백 설정됨")
+
+    def add_preset_listener(self, listener):
+        """프리셋이 바뀔 때마다 호출될 함수 등록: function(new_preset) - MQTT 네트워크 스레드에서 호출"""
+        self._preset_listeners.append(listener)
+
+    def remove_preset_listener(self, listener):
+        """프리셋 리스너 해제"""
+        if listener in self._preset_listeners:
+            self._preset_listeners.remove(listener)
     
 
     #pub 메서드
-    def send_sensor_data(self, temp=None, hum=None, light=None, soil=None, co2=None):
-        """센서 데이터 전송 - DB 서버가 구독 중 (누락된 값은 제외)"""
+    def send_sensor_data(self, temp=None, hum=None, light=None, soil=None, co2=None, age=None):
+        """센서 데이터 전송 - DB 서버가 구독 중 (누락된 값은 제외)
+
+        Args:
+            age: 캐시 센서값(온습도, CO2)의 경과 시간 (초), None이면 생략
+        """
         # 읽은 센서값만 포함 (None이 아닌 값만)
         data_parts = []
         if temp is not None:
@@ -143,26 +162,31 @@ class MqttClient:
         
         # 전송할 데이터가 없으면 종료
         if not data_parts:
-            print("⚠️  전송할 센서 데이터 없음")
+            log.warning("전송할 센서 데이터 없음", extra=fields(slot=self.slot))
             return
         
+        if age is not None:
+            data_parts.append(f"sampleAge={age:.1f}")
+        
         data = ";".join(data_parts)
         
         # 토픽 생성 및 전송 (DB 서버가 smartfarm/+/sensor/# 구독 중)
         topic = f"smartfarm/{self.farm_uid}/sensor/data"
-        self.client.publish(topic, data, qos=0)
-        
-        print(f"📤 센서 데이터: {data}")
+        self.connection.publish(topic, data, qos=0, stamp=True)
+        log.debug("센서 데이터 전송: %s", data, extra=fields(slot=self.slot))
     
     def send_notification_logs(self, message):
         """알림 로그 전송 - DB 서버가 구독 중"""
         topic = f"smartfarm/{self.device_serial}/sensor/nl"
-        self.client.publish(topic, message, qos=1)
-        
-        print(f"📢 알림 전송: {message}")
+        self.connection.publish(topic, message, qos=1)
+        log.info("알림 전송: %s", message, extra=fields(device=self.device_serial))
     
 #종료
     def close(self):
-        self.client.loop_stop()
-        self.client.disconnect()
+        """구독 해제 (전용 연결이면 연결도 종료)"""
+        for topic in self.subscribed_topics:
+            self.connection.unsubscribe(topic, self.on_message)
+        self.connection.remove_connect_listener(self.on_connect)
+        if self.owns_connection:
+            self.connection.close()
 
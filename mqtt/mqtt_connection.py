@@ -0,0 +1,246 @@
+"""
+디바이스 단위 MQTT 연결 (paho 클라이언트 1개 + 토픽 라우터)
+
+슬롯마다 TCP 연결과 네트워크 스레드를 만드는 대신,
+디바이스당 연결 하나를 공유하고 수신 메시지는 토픽별 핸들러로 나눠줍니다.
+오프라인 대기열이 있으면 연결이 끊긴 동안의 메시지를 디스크에 쌓았다가
+재연결 시 전송 속도를 제한하며 한꺼번에 내보냅니다.
+"""
+import threading
+from mqtt.offline_queue import stamped_payload
+from service.metrics import timer, increment
+from service.log import get_logger, fields
+
+log = get_logger("mqtt.connection")
+
+MQTT_ERR_SUCCESS = 0  # paho.mqtt.client.MQTT_ERR_SUCCESS
+DRAIN_JOIN_TIMEOUT = 2.0  # close() 시 재전송 스레드 종료 대기 (초)
+
+
+def paho_client_factory():
+    """paho 클라이언트 생성 (paho는 처음 연결할 때 import)"""
+    import paho.mqtt.client as mqtt
+    return mqtt.Client()
+
+
+# 클라이언트 생성 함수 (벤치마크에서는 benchmarks/local_broker.py의 가짜 브로커로 교체)
+_client_factory = paho_client_factory
+
+
+def set_client_factory(factory):
+    """
+    MqttConnection 기본 클라이언트 생성 함수 교체
+
+    Args:
+        factory: function() -> paho Client 호환 객체, None이면 paho로 되돌림
+    """
+    global _client_factory
+    _client_factory = factory or paho_client_factory
+
+
+def topic_matches(sub, topic):
+    """토픽 필터(+, # 와일드카드) 일치 여부 (paho topic_matches_sub와 같은 규칙)"""
+    sub_levels = sub.split('/')
+    topic_levels = topic.split('/')
+    for i, level in enumerate(sub_levels):
+        if level == '#':
+            return True
+        if i >= len(topic_levels):
+            return False
+        if level != '+' and level != topic_levels[i]:
+            return False
+    return len(sub_levels) == len(topic_levels)
+
+
+class MqttConnection:
+    """공유 MQTT 연결 (구독은 토픽 라우터로 관리, 재연결 시 자동 재구독)"""
+
+    def __init__(self, broker="localhost", port=1883, keepalive=60, offline_queue=None,
+                 drain_rate=50, drain_batch=100, client_factory=None):
+        """
+        Args:
+            broker: 브로커 주소
+            port: 브로커 포트
+            keepalive: keepalive (초)
+            offline_queue: OfflineQueue (없으면 연결이 끊긴 동안 paho 메모리 큐에 맡김)
+            drain_rate: 재연결 후 대기열 재전송 속도 (메시지/초)
+            drain_batch: 대기열에서 한 번에 꺼낼 메시지 수
+            client_factory: 클라이언트 생성 함수 (기본값: set_client_factory()로 지정한 함수, 보통 paho)
+        """
+        self.broker = broker
+        self.port = port
+        self.connected = False
+        self.offline_queue = offline_queue
+        self.drain_rate = drain_rate
+        self.drain_batch = drain_batch
+        self._drain_thread = None  # 재전송 스레드 (끝나기 직전 _drain_lock 안에서 None으로 되돌림)
+        self._drain_lock = threading.Lock()
+        self._closed = threading.Event()  # close() 시 재전송 속도 제한 대기를 바로 깨움
+
+        self._routes = {}  # 토픽 필터 -> [handler(client, userdata, msg)]
+        self._connect_listeners = []  # function(client, userdata, flags, rc)
+        self._lock = threading.Lock()
+
+        self.client = (client_factory or _client_factory)()
+        self.client.on_connect = self._on_connect
+        self.client.on_disconnect = self._on_disconnect
+        self.client.on_message = self._on_message
+
+        # 브로커 연결 (네트워크 스레드 1개)
+        # 오프라인 대기열이 있으면 브로커가 꺼져 있어도 시작할 수 있도록 비동기 연결
+        log.info("MQTT 브로커 연결: %s:%s", broker, port)
+        if offline_queue is not None:
+            self.client.connect_async(broker, port, keepalive)
+        else:
+            self.client.connect(broker, port, keepalive)
+        self.client.loop_start()
+
+    def subscribe(self, topic, handler, qos=0):
+        """
+        토픽 핸들러 등록 (연결 중이면 즉시 구독, 아니면 연결 시 구독)
+
+        Args:
+            topic: 토픽 필터 (와일드카드 +, # 가능)
+            handler: function(client, userdata, msg)
+        """
+        with self._lock:
+            handlers = self._routes.setdefault(topic, [])
+            first = not handlers
+            handlers.append((handler, qos))
+        if first and self.connected:
+            self.client.subscribe(topic, qos)
+
+    def unsubscribe(self, topic, handler):
+        """토픽 핸들러 해제 (남은 핸들러가 없으면 구독 해제)"""
+        with self._lock:
+            handlers = [h for h in self._routes.get(topic, []) if h[0] != handler]
+            if handlers:
+                self._routes[topic] = handlers
+                return
+            self._routes.pop(topic, None)
+        if self.connected:
+            self.client.unsubscribe(topic)
+
+    def add_connect_listener(self, listener):
+        """연결(재연결) 시 호출될 함수 등록: function(client, userdata, flags, rc)"""
+        self._connect_listeners.append(listener)
+
+    def remove_connect_listener(self, listener):
+        """연결 콜백 해제"""
+        if listener in self._connect_listeners:
+            self._connect_listeners.remove(listener)
+
+    def publish(self, topic, payload, qos=0, stamp=False):
+        """
+        메시지 전송 (연결이 끊겼거나 전송 실패 시 오프라인 대기열에 저장)
+
+        Args:
+            stamp: 대기열에서 재전송할 때 원래 시각(;ts=)을 붙일지 여부 (key=value 형식용)
+
+        Returns:
+            bool: 바로 전송했으면 True, 대기열에 저장했으면 False
+        """
+        with timer("mqtt.publish"):
+            if self.offline_queue is None:
+                return self.client.publish(topic, payload, qos=qos).rc == MQTT_ERR_SUCCESS
+            if self.connected:
+                if self.client.publish(topic, payload, qos=qos).rc == MQTT_ERR_SUCCESS:
+                    return True
+            increment("mqtt.queued")
+            self.offline_queue.put(topic, payload, qos, stamp=stamp)
+            # 저장하는 사이에 연결됐으면 _on_connect의 재전송 확인이 이 메시지를 못 봤을 수 있음
+            if self.connected:
+                self._start_drain()
+            return False
+
+    def _start_drain(self):
+        if self.offline_queue is None or self._closed.is_set():
+            return
+        with self._drain_lock:
+            # 실행 중인 재전송 스레드는 끝나기 전에 대기열을 다시 확인하므로 새로 띄우지 않음
+            if self._drain_thread is not None or not len(self.offline_queue):
+                return
+            self._drain_thread = threading.Thread(target=self._drain, name="mqtt-drain", daemon=True)
+            self._drain_thread.start()
+
+    def _drain_done(self, more=True):
+        """
+        재전송을 끝내도 되는지 확인 (끝내면 _drain_thread 해제)
+
+        _start_drain()과 같은 락 안에서 확인하므로, 그 사이 저장된 메시지는 이 스레드가 보내거나
+        새 재전송 스레드가 보냅니다.
+        """
+        with self._drain_lock:
+            if more and self.connected and not self._closed.is_set() and len(self.offline_queue):
+                return False
+            self._drain_thread = None
+            return True
+
+    def _drain(self):
+        """오프라인 대기열을 오래된 것부터 재전송 (속도 제한)"""
+        total = 0
+        while not self._drain_done():
+            rows = self.offline_queue.peek(self.drain_batch)
+            sent = []
+            for msg_id, topic, payload, qos, created_at, stamp in rows:
+                if stamp:
+                    payload = stamped_payload(payload, created_at)
+                if self.client.publish(topic, payload, qos=qos).rc != MQTT_ERR_SUCCESS:
+                    break
+                sent.append(msg_id)
+            self.offline_queue.remove(sent)
+            total += len(sent)
+            if len(sent) < len(rows):
+                self._drain_done(more=False)  # 다시 끊김 - 다음 연결 때 이어서 전송
+                break
+            self._closed.wait(len(sent) / self.drain_rate)
+        if total:
+            log.info("오프라인 대기열 재전송: %d건 (남은 %d건)", total, len(self.offline_queue))
+
+    def _on_connect(self, client, userdata, flags, rc):
+        self.connected = rc == 0
+        if rc == 0:
+            # 등록된 토픽 전체 재구독
+            with self._lock:
+                topics = [(topic, max(qos for _, qos in handlers)) for topic, handlers in self._routes.items()]
+            if topics:
+                client.subscribe(topics)
+            self._start_drain()
+        for listener in list(self._connect_listeners):
+            try:
+                listener(client, userdata, flags, rc)
+            except Exception as e:
+                log.exception("연결 콜백 오류: %s", e)
+
+    def _on_disconnect(self, client, userdata, rc):
+        self.connected = False
+        if rc != 0:
+            log.warning("MQTT 연결 끊김 (rc=%s)", rc)
+
+    def _on_message(self, client, userdata, msg):
+        with self._lock:
+            handlers = self._routes.get(msg.topic)
+            if handlers is None:
+                # 와일드카드 구독 검색
+                handlers = [h for topic, hs in self._routes.items()
+                            if topic_matches(topic, msg.topic) for h in hs]
+            else:
+                handlers = list(handlers)
+        for handler, _ in handlers:
+            try:
+                handler(client, userdata, msg)
+            except Exception as e:
+                log.exception("메시지 처리 오류: %s", e, extra=fields(topic=msg.topic))
+
+    def close(self):
+        """연결 종료 (재전송 스레드가 대기열을 다 쓴 뒤에 대기열 닫기)"""
+        self.connected = False
+        self._closed.set()
+        self.client.loop_stop()
+        self.client.disconnect()
+        with self._drain_lock:
+            drain_thread = self._drain_thread
+        if drain_thread is not None:
+            drain_thread.join(DRAIN_JOIN_TIMEOUT)
+        if self.offline_queue is not None:
+            self.offline_queue.close()
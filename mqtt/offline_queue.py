@@ -0,0 +1,118 @@
+"""
+오프라인 전송 대기열 (SQLite WAL)
+
+브로커에 연결되지 않은 동안 보낼 메시지를 디스크에 쌓아두고,
+재연결되면 오래된 것부터 꺼내 다시 전송합니다.
+- 최대 개수/바이트를 넘으면 가장 오래된 메시지부터 버림
+- 처음 쌓인 시각(created_at)을 함께 저장
+"""
+import sqlite3
+import threading
+import time
+
+
+class OfflineQueue:
+    """디스크 기반 FIFO 메시지 대기열 (스레드 안전)"""
+
+    def __init__(self, path="offline_queue.db", max_messages=10000, max_bytes=5 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:" 가능)
+            max_messages: 최대 보관 메시지 수
+            max_bytes: 최대 보관 페이로드 합계 (바이트)
+        """
+        self.path = path
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.evicted = 0  # 용량 초과로 버린 메시지 수
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " topic TEXT NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " qos INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " stamp INTEGER NOT NULL)"
+        )
+        self._count, self._bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM outbox"
+        ).fetchone()
+
+    def __len__(self):
+        return self._count
+
+    def put(self, topic, payload, qos=0, stamp=False, created_at=None):
+        """
+        메시지 저장 (용량 초과 시 가장 오래된 메시지 삭제)
+
+        Args:
+            topic: 토픽
+            payload: str 또는 bytes
+            qos: QoS
+            stamp: True면 재전송 시 페이로드 끝에 ';ts=<원래 시각>'을 붙임 (key=value 형식용)
+            created_at: 원래 시각 (기본값: 현재 시각)
+        """
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        if created_at is None:
+            created_at = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO outbox (topic, payload, qos, created_at, stamp) VALUES (?, ?, ?, ?, ?)",
+                (topic, payload, qos, created_at, int(stamp)),
+            )
+            self._count += 1
+            self._bytes += len(payload)
+            self._evict()
+
+    def _evict(self):
+        while self._count > self.max_messages or (self._bytes > self.max_bytes and self._count > 1):
+            excess = max(self._count - self.max_messages, 1)
+            rows = self._db.execute(
+                "SELECT id, LENGTH(payload) FROM outbox ORDER BY id LIMIT ?", (excess,)
+            ).fetchall()
+            self._db.execute("DELETE FROM outbox WHERE id <= ?", (rows[-1][0],))
+            self._count -= len(rows)
+            self._bytes -= sum(size for _, size in rows)
+            self.evicted += len(rows)
+
+    def peek(self, limit=100):
+        """
+        가장 오래된 메시지부터 조회 (삭제하지 않음)
+
+        Returns:
+            list: [(id, topic, payload(bytes), qos, created_at, stamp)]
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, topic, payload, qos, created_at, stamp FROM outbox ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def remove(self, ids):
+        """전송 완료된 메시지 삭제"""
+        if not ids:
+            return
+        with self._lock:
+            marks = ",".join("?" * len(ids))
+            removed, size = self._db.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM outbox WHERE id IN ({marks})", ids
+            ).fetchone()
+            self._db.execute(f"DELETE FROM outbox WHERE id IN ({marks})", ids)
+            self._count -= removed
+            self._bytes -= size
+
+    def close(self):
+        """DB 닫기"""
+        with self._lock:
+            self._db.close()
+
+
+def stamped_payload(payload, created_at):
+    """key=value 페이로드 끝에 원래 시각(초 단위 epoch)을 붙임"""
+    return payload + f";ts={int(created_at)}".encode('utf-8')
@@ -0,0 +1,165 @@
+"""
+디바이스 단위 센서 데이터 묶음(batch) 인코딩/디코딩
+
+모든 슬롯의 센서값을 메시지 하나로 묶습니다.
+- text: 기존 key=value 형식을 슬롯별로 '|'로 이어 붙임
+        예) slot=1;temp=24.5;humidity=60|slot=2;temp=23.0
+- binary: struct로 압축한 형식 (매직 b'SF' + 버전 + 슬롯 수, 슬롯별 비트마스크 + 값)
+"""
+import struct
+
+TEXT = "text"
+BINARY = "binary"
+
+# (데이터 키, text 키, struct 형식, 배율) - 비트마스크 순서
+FIELDS = (
+    ('temp', 'temp', 'h', 10),
+    ('humidity', 'humidity', 'H', 10),
+    ('light', 'measuredLight', 'H', 1),
+    ('soil', 'soil', 'H', 1),
+    ('co2', 'co2', 'H', 1),
+    ('age', 'sampleAge', 'H', 10),
+)
+
+MAGIC = b'SF'
+VERSION = 1
+_HEADER = struct.Struct('<2sBB')  # 매직, 버전, 슬롯 수
+_SLOT_HEADER = struct.Struct('<BB')  # 슬롯 번호, 비트마스크
+_FIELD_STRUCTS = tuple(struct.Struct('<' + fmt) for _, _, fmt, _ in FIELDS)
+_TEXT_KEYS = {text_key: (key, scale) for key, text_key, _, scale in FIELDS}
+
+
+def encode_text(batch):
+    """
+    text 형식 인코딩
+
+    Args:
+        batch: {slot: {'temp': .., 'humidity': .., 'light': .., 'soil': .., 'co2': .., 'age': ..}}
+
+    Returns:
+        str: 'slot=1;temp=..|slot=2;...'
+    """
+    parts = []
+    for slot, data in batch.items():
+        pairs = [f"slot={slot}"]
+        for key, text_key, _, scale in FIELDS:
+            value = data.get(key)
+            if value is None:
+                continue
+            if key == 'age':
+                pairs.append(f"{text_key}={value:.1f}")
+            else:
+                pairs.append(f"{text_key}={value}")
+        parts.append(";".join(pairs))
+    return "|".join(parts)
+
+
+def encode_binary(batch):
+    """
+    binary 형식 인코딩 (값은 배율을 곱한 정수로 저장, 범위를 넘으면 잘라냄)
+
+    Returns:
+        bytes
+    """
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, len(batch)))
+    for slot, data in batch.items():
+        mask = 0
+        body = bytearray()
+        for i, (key, _, fmt, scale) in enumerate(FIELDS):
+            value = data.get(key)
+            if value is None:
+                continue
+            mask |= 1 << i
+            low, high = (-32768, 32767) if fmt == 'h' else (0, 65535)
+            body += _FIELD_STRUCTS[i].pack(max(low, min(high, round(value * scale))))
+        out += _SLOT_HEADER.pack(slot, mask)
+        out += body
+    return bytes(out)
+
+
+def encode(batch, encoding=TEXT):
+    """지정한 형식으로 인코딩"""
+    if encoding == TEXT:
+        return encode_text(batch)
+    if encoding == BINARY:
+        return encode_binary(batch)
+    raise ValueError(f"지원하지 않는 인코딩: {encoding}")
+
+
+def decode(payload):
+    """
+    묶음 메시지 디코딩 (형식 자동 판별)
+
+    Args:
+        payload: bytes 또는 str
+
+    Returns:
+        dict: {slot: {'temp': .., ...}} - 없는 값은 키 자체가 없음
+    """
+    if isinstance(payload, (bytes, bytearray)) and payload[:2] == MAGIC:
+        return _decode_binary(payload)
+    if isinstance(payload, (bytes, bytearray)):
+        payload = payload.decode('utf-8')
+    return _decode_text(payload)
+
+
+def _decode_text(payload):
+    batch = {}
+    for part in payload.split('|'):
+        slot = None
+        data = {}
+        for pair in part.split(';'):
+            if '=' not in pair:
+                continue
+            text_key, value = pair.split('=', 1)
+            text_key = text_key.strip()
+            if text_key == 'slot':
+                slot = int(value)
+            elif text_key in _TEXT_KEYS:
+                key, scale = _TEXT_KEYS[text_key]
+                number = float(value)
+                data[key] = number if scale != 1 or not number.is_integer() else int(number)
+        if slot is not None:
+            batch[slot] = data
+    return batch
+
+
+def _decode_binary(payload):
+    magic, version, count = _HEADER.unpack_from(payload, 0)
+    if version != VERSION:
+        raise ValueError(f"지원하지 않는 버전: {version}")
+    offset = _HEADER.size
+    batch = {}
+    for _ in range(count):
+        slot, mask = _SLOT_HEADER.unpack_from(payload, offset)
+        offset += _SLOT_HEADER.size
+        data = {}
+        for i, (key, _, _, scale) in enumerate(FIELDS):
+            if not mask & (1 << i):
+                continue
+            (raw,) = _FIELD_STRUCTS[i].unpack_from(payload, offset)
+            offset += _FIELD_STRUCTS[i].size
+            data[key] = raw / scale if scale != 1 else raw
+        batch[slot] = data
+    return batch
+
+
+if __name__ == "__main__":
+    import sys
+
+    # 사용법: python -m mqtt.payload_codec <hex 또는 text 페이로드>
+    if len(sys.argv) > 1:
+        arg = sys.argv[1]
+        try:
+            raw = bytes.fromhex(arg)
+        except ValueError:
+            raw = arg
+        print(decode(raw))
+    else:
+        sample = {1: {'temp': 24.5, 'humidity': 61.0, 'light': 30000, 'soil': 2100, 'co2': 812, 'age': 3.2},
+                  2: {'temp': 23.0, 'light': 28000, 'soil': 1900}}
+        text = encode_text(sample)
+        binary = encode_binary(sample)
+        print(f"text ({len(text.encode())} bytes): {text}")
+        print(f"binary ({len(binary)} bytes): {binary.hex()}")
+        print(f"decode: {decode(binary)}")
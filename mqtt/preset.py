@@ -0,0 +1,147 @@
+"""
+프리셋 파싱 및 Preset 객체
+
+MQTT로 받은 'key=value;...' 프리셋을 수신 시점에 한 번만 파싱/숫자 변환/검증하고,
+제어에 쓰는 임계값(온도 범위, CO2 개방/복귀 기준 등)도 미리 계산해 둡니다.
+제어 루프는 Preset의 속성만 읽으므로 문자열 파싱이나 float 변환이 없습니다.
+"""
+import re
+
+# key=value 쌍 (앞뒤 공백 제거)
+_PAIR_RE = re.compile(r'\s*([^=;]+?)\s*=\s*([^;]*?)\s*(?:;|$)')
+
+# 프리셋 키 -> (속성 이름, 최소값, 최대값)
+PRESET_FIELDS = {
+    'OptimalTemp': ('optimal_temp', -20.0, 60.0),
+    'OptimalHumidity': ('optimal_humidity', 0.0, 100.0),
+    'LightIntensity': ('light_intensity', 0.0, 65535.0),
+    'SoilMoisture': ('soil_moisture', 0.0, 65535.0),
+    'Co2Level': ('co2_level', 0.0, 10000.0),
+}
+
+# 기본 프리셋 (DB에 프리셋이 없을 때)
+DEFAULT_PRESET = {
+    'OptimalTemp': '25',
+    'OptimalHumidity': '60',
+    'LightIntensity': '3000',
+    'SoilMoisture': '2000',
+    'Co2Level': '800'
+}
+
+# 제어 여유값 (임계값 = 프리셋 ± 여유값)
+DEFAULT_MARGINS = {
+    'temp': 2.0,             # 적정 온도 ±2도
+    'humidity_high': 10.0,   # 습도 +10% 이상이면 환기
+    'humidity_low': 5.0,     # 습도 -5% 이하면 환기 중지
+    'soil_dry': 500.0,       # ADC 값이 높을수록 건조
+    'soil_wet': 200.0,
+    'light': 25.0,
+    'co2_low': 150.0,        # CO2가 기준보다 150 낮으면 카트리지 개방
+    'co2_recover': 50.0,     # 개방 기준보다 50 높아지면 복귀
+}
+
+
+def parse_preset_payload(payload):
+    """
+    'key=value;...' 문자열을 dict로 변환
+
+    Returns:
+        dict: {key: value(str)}
+    """
+    return {key: value for key, value in _PAIR_RE.findall(payload) if key}
+
+
+class Preset:
+    """숫자 변환과 임계값 계산이 끝난 프리셋 (수정하지 않고 새로 만들어 교체)"""
+    __slots__ = (
+        'optimal_temp', 'optimal_humidity', 'light_intensity', 'soil_moisture', 'co2_level',
+        'temp_low', 'temp_high', 'humidity_high', 'humidity_low',
+        'soil_dry', 'soil_wet', 'light_low', 'light_high',
+        'co2_release', 'co2_recover', 'margins', 'extra',
+    )
+
+    def __init__(self, values=None, margins=None, extra=None):
+        """
+        Args:
+            values: {프리셋 키: 숫자 또는 문자열} - 없는 키는 기본값
+            margins: 제어 여유값 (기본값: DEFAULT_MARGINS)
+            extra: 알 수 없는 키 (그대로 보관)
+
+        Raises:
+            ValueError: 숫자가 아니거나 범위를 벗어난 값
+        """
+        merged = dict(DEFAULT_PRESET)
+        if values:
+            merged.update(values)
+        for key, (attr, low, high) in PRESET_FIELDS.items():
+            try:
+                number = float(merged[key])
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} 값이 숫자가 아닙니다: {merged[key]!r}")
+            if not low <= number <= high:
+                raise ValueError(f"{key} 값이 범위({low}~{high})를 벗어났습니다: {number}")
+            setattr(self, attr, number)
+        self.margins = dict(DEFAULT_MARGINS) if margins is None else dict(margins)
+        self.extra = dict(extra or {})
+        self._derive()
+
+    def _derive(self):
+        """제어 임계값 미리 계산"""
+        m = self.margins
+        self.temp_low = self.optimal_temp - m['temp']
+        self.temp_high = self.optimal_temp + m['temp']
+        self.humidity_high = self.optimal_humidity + m['humidity_high']
+        self.humidity_low = self.optimal_humidity - m['humidity_low']
+        self.soil_dry = self.soil_moisture + m['soil_dry']
+        self.soil_wet = self.soil_moisture - m['soil_wet']
+        self.light_low = self.light_intensity - m['light']
+        self.light_high = self.light_intensity + m['light']
+
+        # CO2 개방/복귀 기준 (복귀 기준은 개방 기준보다 최소 10 높고, 목표값을 넘지 않음)
+        self.co2_release = max(0.0, self.co2_level - m['co2_low'])
+        recover = max(self.co2_release + m['co2_recover'], self.co2_release + 10)
+        self.co2_recover = min(self.co2_level, recover)
+
+    @classmethod
+    def from_payload(cls, payload, base=None):
+        """
+        프리셋 문자열 파싱 (payload에 있는 값은 base 값을 덮어쓰고, 없는 값은 base 값 유지)
+
+        Raises:
+            ValueError: 파싱할 값이 없거나 잘못된 값
+        """
+        params = parse_preset_payload(payload)
+        if not params:
+            raise ValueError(f"프리셋 값이 없습니다: {payload!r}")
+        return cls.from_params(params, base)
+
+    @classmethod
+    def from_params(cls, params, base=None):
+        """dict 프리셋을 base 위에 합쳐 새 Preset 생성"""
+        values = base.to_dict() if base is not None else {}
+        extra = dict(base.extra) if base is not None else {}
+        for key, value in params.items():
+            if key in PRESET_FIELDS:
+                values[key] = value
+            else:
+                extra[key] = value
+        margins = base.margins if base is not None else None
+        return cls(values, margins=margins, extra=extra)
+
+    def with_margins(self, margins):
+        """여유값만 바꾼 새 Preset"""
+        return Preset(self.to_dict(), margins=margins, extra=self.extra)
+
+    def to_dict(self):
+        """{프리셋 키: 숫자} dict"""
+        return {key: getattr(self, attr) for key, (attr, _, _) in PRESET_FIELDS.items()}
+
+    def get(self, key, default=None):
+        """dict 프리셋과 같은 방식의 조회 (기존 코드 호환)"""
+        field = PRESET_FIELDS.get(key)
+        if field is not None:
+            return getattr(self, field[0])
+        return self.extra.get(key, default)
+
+    def __repr__(self):
+        return f"Preset({self.to_dict()})"
@@ -1,5 +1,13 @@
 # 파일명: ultrasonic_sensor.py
-from hcsr04sensor import sensor
+import statistics
+import threading
+import time
+from collections import deque
+from hal.backend import hcsr04_sensor as sensor
+from service.metrics import increment
+
+SPEED_OF_SOUND = 34300.0  # cm/s (20도)
+
 
 class UltrasonicSensor:
     def __init__(self, trig_pin: int, echo_pin: int):
@@ -21,6 +29,183 @@ class UltrasonicSensor:
         distance = self.sensor.raw_distance(sample_size=samples, sample_wait=wait)
         return round(distance, 2)
 
+
+class EdgeUltrasonicSensor:
+    """
+    에지 인터럽트 기반 초음파 센서 (백그라운드 측정, read()는 최근 추정값을 즉시 반환)
+
+    공유 센서 스케줄러가 interval마다 TRIG 펄스를 보내고,
+    ECHO 핀의 상승/하강 에지 콜백에서 시각을 기록해 펄스 폭으로 거리를 계산합니다.
+    최근 window개 측정의 중앙값을 추정값으로 쓰고, 중앙값에서 outlier_cm 넘게 벗어난 값은 버립니다.
+    (벗어난 값이 max_rejects번 연속이면 실제 수위 변화로 보고 새로 시작)
+
+    에코 시각은 콜백 진입 시각이므로 콜백 지연(수십~수백 us, 수 cm)만큼 흔들리며, 중앙값 필터로 흡수합니다.
+    콜백이 늦게 와서 펄스가 이미 끝났을 수 있으므로 상승/하강은 핀을 다시 읽지 않고,
+    펄스를 보낸 뒤 첫 에지를 상승, 다음 에지를 하강으로 봅니다.
+    """
+
+    def __init__(self, trig_pin, echo_pin, interval=0.2, window=7, outlier_cm=5.0, max_rejects=3,
+                 min_distance=2.0, max_distance=400.0, max_age=5.0, scheduler=None, gpio_module=None):
+        """
+        Args:
+            trig_pin: 트리거 핀 (BCM 번호)
+            echo_pin: 에코 핀 (BCM 번호)
+            interval: 측정 간격 (초), 다음 펄스 전까지 에코가 끝나지 않으면 타임아웃
+            window: 중앙값 필터 크기
+            outlier_cm: 중앙값에서 이만큼 넘게 벗어나면 이상값
+            max_rejects: 이상값이 이 횟수만큼 연속이면 필터를 새로 시작
+            min_distance, max_distance: 센서 측정 범위 (cm), 벗어나면 버림
+            max_age: 마지막 측정 후 이 시간(초)이 지나면 read()는 None
+            scheduler: 사용할 스케줄러 (기본값: 공유 스케줄러)
+            gpio_module: RPi.GPIO 호환 모듈 (기본값: HAL 백엔드의 gpio)
+        """
+        if gpio_module is None:
+            from hal.backend import gpio as gpio_module
+        self.gpio = gpio_module
+        self.trig_pin = trig_pin
+        self.echo_pin = echo_pin
+        self.interval = interval
+        self.outlier_cm = outlier_cm
+        self.max_rejects = max_rejects
+        self.min_distance = min_distance
+        self.max_distance = max_distance
+        self.max_age = max_age
+        self.scheduler = scheduler
+
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()  # 첫 측정 완료
+        self._armed = False  # 펄스를 보내고 에코를 기다리는 중
+        self._rise = None  # 에코 상승 에지 시각 (perf_counter)
+        self._rejects = 0  # 연속 이상값 수
+        self.estimate = None  # 필터링된 거리 (cm)
+        self.last_time = None  # 마지막 측정 시각 (monotonic)
+        self.started = None
+        self.running = False
+
+        # 통계
+        self.pings = 0
+        self.measurements = 0
+        self.timeouts = 0
+        self.outliers = 0
+
+    def start(self):
+        """핀 설정 후 백그라운드 측정 시작 (공유 스케줄러에 등록)"""
+        if self.running:
+            return
+        try:
+            self.gpio.setmode(self.gpio.BCM)
+        except (RuntimeError, ValueError):
+            pass  # 이미 설정됨
+        self.gpio.setup(self.trig_pin, self.gpio.OUT, initial=self.gpio.LOW)
+        self.gpio.setup(self.echo_pin, self.gpio.IN)
+        self.gpio.add_event_detect(self.echo_pin, self.gpio.BOTH, callback=self._on_echo)
+        if self.scheduler is None:
+            from service.sensor_scheduler import get_scheduler
+            self.scheduler = get_scheduler()
+        self.started = time.monotonic()
+        self.running = True
+        self.scheduler.add(self)
+
+    def stop(self):
+        """측정 중지 및 에지 감지 해제"""
+        if not self.running:
+            return
+        self.running = False
+        self.scheduler.remove(self)
+        self.gpio.remove_event_detect(self.echo_pin)
+
+    def poll(self):
+        """
+        TRIG 펄스 1회 (스케줄러 스레드에서 호출)
+
+        Returns:
+            float: 다음 펄스까지 대기 시간 (초)
+        """
+        with self._lock:
+            if self._armed:
+                # 이전 펄스의 에코가 끝나지 않음 (범위 밖, 흡음, 배선 문제)
+                self.timeouts += 1
+                increment("sensor.ultrasonic.timeouts")
+            self._armed = True
+            self._rise = None
+            self.pings += 1
+        self.gpio.output(self.trig_pin, self.gpio.HIGH)
+        time.sleep(0.00001)  # 10us 이상
+        self.gpio.output(self.trig_pin, self.gpio.LOW)
+        return self.interval
+
+    def _on_echo(self, channel):
+        """ECHO 에지 콜백 (GPIO 콜백 스레드)"""
+        now = time.perf_counter()
+        with self._lock:
+            if not self._armed:
+                return
+            if self._rise is None:
+                self._rise = now  # 펄스 후 첫 에지 = 상승
+                return
+            width = now - self._rise
+            self._armed = False
+            self._rise = None
+            self._add_sample(width * SPEED_OF_SOUND / 2)
+
+    def _add_sample(self, distance):
+        """측정값 필터링 (락 안에서 호출)"""
+        if not self.min_distance <= distance <= self.max_distance:
+            self.outliers += 1
+            increment("sensor.ultrasonic.outliers")
+            return
+        if len(self._samples) >= 3 and abs(distance - self.estimate) > self.outlier_cm:
+            self._rejects += 1
+            if self._rejects < self.max_rejects:
+                self.outliers += 1
+                increment("sensor.ultrasonic.outliers")
+                return
+            self._samples.clear()  # 계속 벗어남 -> 실제 변화
+        self._rejects = 0
+        self._samples.append(distance)
+        self.estimate = statistics.median(self._samples)
+        self.last_time = time.monotonic()
+        self.measurements += 1
+        self._ready.set()
+
+    def wait_ready(self, timeout=1.0):
+        """
+        첫 측정까지 대기 (시작 후 timeout초가 지났으면 바로 반환)
+
+        Returns:
+            bool: 측정값이 있는지
+        """
+        if self.started is None:
+            return False
+        remaining = self.started + timeout - time.monotonic()
+        return self._ready.wait(max(remaining, 0.0))
+
+    def read(self):
+        """
+        최근 추정 거리 (cm, 대기 없음)
+
+        Returns:
+            distance: 거리 (cm), 측정값이 없거나 max_age보다 오래되면 None
+        """
+        with self._lock:
+            estimate, last_time = self.estimate, self.last_time
+        if estimate is None or time.monotonic() - last_time > self.max_age:
+            return None
+        return round(estimate, 2)
+
+    def stats(self):
+        return {
+            'pings': self.pings,
+            'measurements': self.measurements,
+            'timeouts': self.timeouts,
+            'outliers': self.outliers,
+        }
+
+    def close(self):
+        self.stop()
+
+
 # ---------------------- 테스트용 실행 ----------------------
 if __name__ == "__main__":
     TRIG = 23  # BCM 번호
@@ -29,3 +214,11 @@ if __name__ == "__main__":
     ultrasonic = UltrasonicSensor(TRIG, ECHO)
     dist = ultrasonic.read()
     print(f"거리: {dist} cm")
+
+    edge = EdgeUltrasonicSensor(TRIG, ECHO)
+    edge.start()
+    edge.wait_ready()
+    for _ in range(5):
+        print(f"거리 (에지): {edge.read()} cm  {edge.stats()}")
+        time.sleep(1)
+    edge.close()
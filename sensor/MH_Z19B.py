@@ -1,39 +1,340 @@
-import mh_z19
+"""
+MH-Z19B CO2 센서 (UART 9600bps, 9바이트 명령/응답 프레임)
+
+포트는 한 번만 열어 두고, 공유 리더 스레드 하나가 selector로 여러 포트의 응답을 동시에 기다립니다.
+요청은 Future를 바로 돌려주므로 센서 캐시 스케줄러 스레드가 응답(약 20~40ms)을 기다리며 멈추지 않습니다.
+
+    요청: FF 01 86 00 00 00 00 00 79
+    응답: FF 86 HH LL TT SS U1 U2 CS   (CO2 = HH*256 + LL, CS = 체크섬)
+
+같은 포트를 여러 슬롯이 쓰면 요청은 포트별로 순서대로 처리됩니다.
+"""
+import os
+import selectors
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from hal.backend import serial
+from service.metrics import increment
+from service.log import get_logger, fields
+
+log = get_logger("sensor.co2")
+
+BAUDRATE = 9600
+FRAME_SIZE = 9
+START_BYTE = 0xFF
+SENSOR_ID = 0x01
+CMD_READ_CO2 = 0x86
+RESPONSE_TIMEOUT = 1.0  # 응답 대기 제한 (초)
+
+
+def checksum(frame):
+    """프레임 체크섬 (1~7번 바이트 합의 2의 보수)"""
+    return (0xFF - (sum(frame[1:8]) & 0xFF) + 1) & 0xFF
+
+
+def command_frame(command, data=b""):
+    """명령 프레임 생성 (9바이트)"""
+    frame = bytearray(FRAME_SIZE)
+    frame[0] = START_BYTE
+    frame[1] = SENSOR_ID
+    frame[2] = command
+    frame[3:3 + len(data)] = data
+    frame[8] = checksum(frame)
+    return bytes(frame)
+
+
+def parse_co2_response(frame):
+    """
+    CO2 읽기 응답 해석
+
+    Returns:
+        co2: CO2 농도 (ppm)
+
+    Raises:
+        ValueError: 길이/시작 바이트/명령/체크섬 오류
+    """
+    if len(frame) != FRAME_SIZE:
+        raise ValueError(f"응답 길이 오류: {len(frame)}바이트")
+    if frame[0] != START_BYTE or frame[1] != CMD_READ_CO2:
+        raise ValueError(f"응답 헤더 오류: {frame[:2].hex()}")
+    if frame[8] != checksum(frame):
+        raise ValueError(f"체크섬 오류: {frame[8]:02x} != {checksum(frame):02x}")
+    return frame[2] * 256 + frame[3]
+
+
+READ_CO2_FRAME = command_frame(CMD_READ_CO2)
+
+
+class _Port:
+    """열린 시리얼 포트 상태 (리더 스레드 전용)"""
+
+    def __init__(self, device, handle):
+        self.device = device
+        self.handle = handle
+        self.buffer = bytearray()
+        self.queue = deque()  # 보낼 차례를 기다리는 Future
+        self.current = None  # 응답 대기 중인 Future
+        self.deadline = None
+
+
+class MHZ19Reader:
+    """여러 MH-Z19B 포트를 스레드 하나로 처리 (selector 기반)"""
+
+    def __init__(self, timeout=RESPONSE_TIMEOUT, serial_module=None):
+        """
+        Args:
+            timeout: 응답 대기 제한 (초)
+            serial_module: pyserial 호환 모듈 (기본값: HAL 백엔드의 serial)
+        """
+        self.timeout = timeout
+        self.serial = serial_module or serial
+        self._selector = selectors.DefaultSelector()
+        self._ports = {}  # 장치 경로 -> _Port
+        self._requests = deque()  # (장치 경로, Future) - 리더 스레드로 넘길 요청
+        self._lock = threading.Lock()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="mh-z19-reader", daemon=True)
+        self._thread.start()
+
+        # 통계
+        self.responses = 0
+        self.timeouts = 0
+        self.bad_frames = 0
+
+    def request(self, device):
+        """
+        CO2 읽기 요청 (즉시 반환)
+
+        Returns:
+            Future: 완료 시 CO2 농도(ppm), 실패 시 예외 (TimeoutError, ValueError, OSError)
+        """
+        future = Future()
+        with self._lock:
+            if not self.running:
+                future.set_exception(RuntimeError("MH-Z19B 리더가 종료됨"))
+                return future
+            self._requests.append((device, future))
+            os.write(self._wake_w, b"\0")
+        return future
+
+    def _open(self, device):
+        handle = self.serial.Serial(device, baudrate=BAUDRATE, bytesize=8, parity='N', stopbits=1, timeout=0)
+        port = _Port(device, handle)
+        self._selector.register(handle.fileno(), selectors.EVENT_READ, port)
+        self._ports[device] = port
+        log.info("CO2 센서 포트 열림: %s", device, extra=fields(sensor="MH-Z19B"))
+        return port
+
+    def _run(self):
+        while self.running:
+            events = self._selector.select(self._next_timeout())
+            for key, _ in events:
+                if key.data is None:
+                    self._accept_requests()
+                else:
+                    self._receive(key.data)
+            self._expire()
+        self._shutdown()
+
+    def _next_timeout(self):
+        deadlines = [port.deadline for port in self._ports.values() if port.deadline is not None]
+        if not deadlines:
+            return None
+        return max(min(deadlines) - time.monotonic(), 0.0)
+
+    def _accept_requests(self):
+        try:
+            while os.read(self._wake_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+        with self._lock:
+            requests, self._requests = self._requests, deque()
+        for device, future in requests:
+            port = self._ports.get(device)
+            if port is None:
+                try:
+                    port = self._open(device)
+                except Exception as e:
+                    log.warning("CO2 센서 포트 열기 실패 (%s): %s", device, e, extra=fields(sensor="MH-Z19B"))
+                    future.set_exception(e)
+                    continue
+            port.queue.append(future)
+            self._send_next(port)
+
+    def _send_next(self, port):
+        """포트가 비어 있으면 다음 요청 전송"""
+        while port.current is None and port.queue:
+            future = port.queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                port.handle.reset_input_buffer()
+                port.buffer.clear()
+                port.handle.write(READ_CO2_FRAME)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            port.current = future
+            port.deadline = time.monotonic() + self.timeout
+
+    def _receive(self, port):
+        try:
+            data = port.handle.read(64)
+        except Exception as e:
+            self._finish(port, exception=e)
+            return
+        if not data:
+            return
+        port.buffer += data
+        while len(port.buffer) >= FRAME_SIZE:
+            # 시작 바이트까지 건너뜀 (프레임 동기화)
+            start = port.buffer.find(START_BYTE)
+            if start < 0:
+                port.buffer.clear()
+                return
+            del port.buffer[:start]
+            if len(port.buffer) < FRAME_SIZE:
+                return
+            frame = bytes(port.buffer[:FRAME_SIZE])
+            try:
+                co2 = parse_co2_response(frame)
+            except ValueError as e:
+                self.bad_frames += 1
+                increment("sensor.co2.bad_frames")
+                log.warning("CO2 센서 응답 오류: %s", e, extra=fields(sensor="MH-Z19B"))
+                if frame[1] == CMD_READ_CO2:
+                    # 응답은 왔지만 깨짐 -> 타임아웃까지 기다리지 않고 실패 처리
+                    port.buffer.clear()
+                    self._finish(port, exception=e)
+                    return
+                del port.buffer[:1]  # 다음 시작 바이트에서 다시 동기화
+                continue
+            del port.buffer[:FRAME_SIZE]
+            self.responses += 1
+            self._finish(port, result=co2)
+
+    def _finish(self, port, result=None, exception=None):
+        future, port.current, port.deadline = port.current, None, None
+        if future is not None:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        self._send_next(port)
+
+    def _expire(self):
+        now = time.monotonic()
+        for port in self._ports.values():
+            if port.deadline is not None and now >= port.deadline:
+                self.timeouts += 1
+                increment("sensor.co2.timeouts")
+                self._finish(port, exception=TimeoutError(f"MH-Z19B 응답 없음 ({port.device})"))
+
+    def _shutdown(self):
+        error = RuntimeError("MH-Z19B 리더가 종료됨")
+        for port in self._ports.values():
+            for future in [port.current, *port.queue]:
+                if future is not None and not future.done():
+                    future.set_exception(error)
+            try:
+                port.handle.close()
+            except Exception as e:
+                log.warning("CO2 센서 포트 닫기 오류: %s", e, extra=fields(sensor="MH-Z19B"))
+        self._ports.clear()
+        self._selector.close()
+        with self._lock:
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+
+    def stats(self):
+        return {
+            'ports': sorted(self._ports),
+            'responses': self.responses,
+            'timeouts': self.timeouts,
+            'bad_frames': self.bad_frames,
+        }
+
+    def close(self):
+        """리더 종료 (대기 중인 요청은 실패 처리, 포트 닫기)"""
+        with self._lock:
+            if not self.running:
+                return
+            self.running = False
+            os.write(self._wake_w, b"\0")
+        self._thread.join(2.0)
+
+
+# 프로세스 공유 리더
+_reader = None
+_reader_lock = threading.Lock()
+
+
+def get_co2_reader():
+    """공유 MH-Z19B 리더 반환 (최초 호출 시 생성)"""
+    global _reader
+    with _reader_lock:
+        if _reader is None or not _reader.running:
+            _reader = MHZ19Reader()
+        return _reader
+
+
+def close_co2_reader():
+    """공유 MH-Z19B 리더 종료"""
+    global _reader
+    with _reader_lock:
+        if _reader is not None:
+            _reader.close()
+            _reader = None
+
 
 class CO2Sensor:
-    def __init__(self, device='/dev/serial0'):
+    def __init__(self, device='/dev/serial0', reader=None, timeout=RESPONSE_TIMEOUT):
         """
         CO2 센서 초기화 (MH-Z19B)
-        
+
         Args:
             device: 시리얼 포트 (기본값: /dev/serial0)
+            reader: MHZ19Reader (기본값: 공유 리더)
+            timeout: read()의 응답 대기 제한 (초)
         """
         self.device = device
-    
+        self.reader = reader
+        self.timeout = timeout
+
+    def read_async(self):
+        """
+        CO2 농도 읽기 요청 (즉시 반환, 센서 캐시가 사용)
+
+        Returns:
+            Future: 완료 시 CO2 농도 (ppm)
+        """
+        if self.reader is None:
+            self.reader = get_co2_reader()
+        return self.reader.request(self.device)
+
     def read(self):
         """
-        CO2 농도 읽기
-        
+        CO2 농도 읽기 (응답까지 대기)
+
         Returns:
             co2_value: CO2 농도 (ppm), 실패 시 None
         """
         try:
-            # mh_z19 라이브러리는 serial_console_untouched 파라미터 사용
-            result = mh_z19.read_all(serial_console_untouched=True)
-            
-            if result and 'co2' in result:
-                co2_value = result['co2']
-                print(f"CO2 센서: {co2_value} ppm")
-                return co2_value
-            else:
-                print("CO2 센서: 읽기 실패")
-                return None
+            co2_value = self.read_async().result(self.timeout + 0.5)
         except Exception as e:
-            print(f"CO2 센서 오류: {e}")
+            log.warning("CO2 센서 읽기 실패: %s", e, extra=fields(sensor="MH-Z19B"))
             return None
-    
+        log.debug("CO2 센서값", extra=fields(sensor="MH-Z19B", value=co2_value))
+        return co2_value
+
     def close(self):
-        """센서 정리 (라이브러리가 자동 처리)"""
+        """센서 정리 (포트는 공유 리더가 close_co2_reader()에서 닫음)"""
         pass
 
 
@@ -44,3 +345,4 @@ if __name__ == "__main__":
         print(f"CO2 농도: {co2} ppm")
     else:
         print("CO2 센서 읽기 실패")
+    close_co2_reader()
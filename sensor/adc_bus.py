@@ -0,0 +1,175 @@
+"""
+MCP3008 ADC 공유 버스 관리자
+
+SPI 버스와 CS 핀을 프로세스 전체에서 한 번만 열어두고,
+조도/토양수분 센서에는 가벼운 채널 핸들만 나눠줍니다.
+여러 채널은 read_channels()로 버스를 한 번만 잡은 상태에서 연속으로 읽습니다.
+"""
+import threading
+from hal.backend import board, busio, digitalio
+from sensor.adc_scan import ADCScanner, MEDIAN
+from service.log import get_logger
+
+log = get_logger("sensor.adc_bus")
+
+
+class ADCChannel:
+    """ADC 채널 핸들 (AnalogIn 대체, 버스를 소유하지 않음)"""
+    __slots__ = ("bus", "channel_number")
+
+    def __init__(self, bus, channel_number):
+        self.bus = bus
+        self.channel_number = channel_number
+
+    @property
+    def value(self):
+        """ADC 값 (0~65535)"""
+        return self.bus.read_channel(self.channel_number)
+
+    @property
+    def voltage(self):
+        """전압 (V)"""
+        return self.bus.to_voltage(self.value)
+
+
+class ADCBus:
+    """MCP3008 SPI 버스 (프로세스 전체 공유, 스레드 안전)"""
+
+    def __init__(self, cs_pin=None, ref_voltage=3.3, baudrate=100_000):
+        """
+        SPI 버스 및 CS 핀 초기화
+
+        Args:
+            cs_pin: CS 핀 (기본값: D8)
+            ref_voltage: MCP3008 기준 전압 (V)
+            baudrate: SPI 클럭 (Hz)
+        """
+        if cs_pin is None:
+            cs_pin = board.D8
+        self.spi = busio.SPI(clock=board.SCK, MISO=board.MISO, MOSI=board.MOSI)
+        self.cs = digitalio.DigitalInOut(cs_pin)
+        self.cs.switch_to_output(value=True)
+        self.reference_voltage = ref_voltage
+        self.baudrate = baudrate
+        self.lock = threading.Lock()
+
+        # 변환마다 재사용하는 SPI 송수신 버퍼
+        self._out_buf = bytearray(3)
+        self._in_buf = bytearray(3)
+        self._out_buf[0] = 0x01  # 시작 비트
+
+        # (채널, 샘플 수, 필터) 조합별 스캐너 재사용
+        self._scanners = {}
+
+    def channel(self, channel_number):
+        """채널 핸들 반환"""
+        return ADCChannel(self, channel_number)
+
+    def _acquire_spi(self):
+        while not self.spi.try_lock():
+            pass
+        self.spi.configure(baudrate=self.baudrate, polarity=0, phase=0)
+
+    def _convert(self, channel_number):
+        """단일 채널 변환 (SPI 락을 잡은 상태에서 호출)"""
+        self._out_buf[1] = 0x80 | (channel_number << 4)  # single-ended
+        self.cs.value = False
+        self.spi.write_readinto(self._out_buf, self._in_buf)
+        self.cs.value = True
+        result = ((self._in_buf[1] & 0x03) << 8) | self._in_buf[2]
+        # 10비트 값을 AnalogIn.value와 같게 16비트 범위로 (<< 6)
+        return result << 6
+
+    def read_channel(self, channel_number):
+        """단일 채널 ADC 값 (0~65535)"""
+        return self.read_channels((channel_number,))[0]
+
+    def read_channels(self, channels):
+        """
+        여러 채널을 한 번의 버스 점유로 연속 읽기
+
+        Args:
+            channels: 채널 번호 리스트 (0~7)
+
+        Returns:
+            list: 채널 순서대로 ADC 값 (0~65535)
+        """
+        with self.lock:
+            self._acquire_spi()
+            try:
+                return [self._convert(ch) for ch in channels]
+            finally:
+                self.spi.unlock()
+
+    def scan_channels(self, channels, samples=8, mode=MEDIAN):
+        """
+        여러 채널을 오버샘플링하여 필터링된 값 반환 (버스 점유 1회)
+
+        Args:
+            channels: 채널 번호 리스트 (0~7)
+            samples: 채널당 샘플 수
+            mode: 필터 방식 ("median", "trimmed_mean")
+
+        Returns:
+            list: 채널 순서대로 필터링된 ADC 값 (0~65535)
+        """
+        key = (tuple(channels), samples, mode)
+        with self.lock:
+            scanner = self._scanners.get(key)
+            if scanner is None:
+                scanner = ADCScanner(channels, samples=samples, mode=mode)
+                self._scanners[key] = scanner
+            self._acquire_spi()
+            try:
+                return scanner.scan(self._convert).tolist()
+            finally:
+                self.spi.unlock()
+
+    def to_voltage(self, value):
+        """ADC 값을 전압으로 변환"""
+        return value * self.reference_voltage / 65535
+
+    def close(self):
+        """SPI 및 CS 핀 정리"""
+        with self.lock:
+            try:
+                self.cs.deinit()
+                self.spi.deinit()
+            except Exception as e:
+                log.warning("ADC 버스 정리 오류: %s", e)
+
+
+# CS 핀별 공유 버스
+_buses = {}
+_buses_lock = threading.Lock()
+
+
+def get_adc_bus(cs_pin=None):
+    """CS 핀에 해당하는 공유 ADC 버스 반환 (최초 호출 시 생성, 기본값: D8)"""
+    if cs_pin is None:
+        cs_pin = board.D8
+    key = getattr(cs_pin, "id", cs_pin)  # Pin 객체는 해시 불가
+    with _buses_lock:
+        bus = _buses.get(key)
+        if bus is None:
+            bus = ADCBus(cs_pin)
+            _buses[key] = bus
+        return bus
+
+
+def close_adc_buses():
+    """모든 공유 ADC 버스 정리"""
+    with _buses_lock:
+        for bus in _buses.values():
+            bus.close()
+        _buses.clear()
+
+
+if __name__ == "__main__":
+    bus = get_adc_bus()
+    try:
+        values = bus.read_channels([0, 1])
+        for ch, value in zip([0, 1], values):
+            print(f"채널 {ch}: {value} ({bus.to_voltage(value):.2f}V)")
+    finally:
+        close_adc_buses()
@@ -0,0 +1,93 @@
+"""
+MCP3008 다채널 스캔 엔진 (오버샘플링 + 중앙값/절사평균 필터)
+
+설정된 채널들을 N번씩 번갈아 샘플링한 뒤 채널별로 필터링합니다.
+샘플은 미리 할당한 array 버퍼에 채널별 연속 구간으로 저장하므로
+샘플마다 dict/tuple을 새로 만들지 않습니다.
+"""
+from array import array
+
+MEDIAN = "median"
+TRIMMED_MEAN = "trimmed_mean"
+
+
+class ADCScanner:
+    """채널 목록 단위 스캔 버퍼 및 필터"""
+
+    def __init__(self, channels, samples=8, mode=MEDIAN, trim=1):
+        """
+        스캐너 초기화
+
+        Args:
+            channels: 채널 번호 리스트 (0~7)
+            samples: 채널당 샘플 수
+            mode: 필터 방식 ("median", "trimmed_mean")
+            trim: 절사평균에서 양쪽 끝에서 버릴 샘플 수
+        """
+        if samples < 1:
+            raise ValueError("samples는 1 이상이어야 합니다")
+        if mode not in (MEDIAN, TRIMMED_MEAN):
+            raise ValueError(f"지원하지 않는 필터 방식: {mode}")
+        if mode == TRIMMED_MEAN and samples <= 2 * trim:
+            raise ValueError("절사 후 남는 샘플이 없습니다")
+
+        self.channels = array('B', channels)
+        self.samples = samples
+        self.mode = mode
+        self.trim = trim
+
+        # 채널 c의 i번째 샘플은 _buf[c * samples + i]
+        self._buf = array('H', bytes(2 * len(self.channels) * samples))
+        # 채널별 필터 결과 (채널 순서)
+        self.result = array('H', bytes(2 * len(self.channels)))
+
+    def scan(self, convert):
+        """
+        모든 채널을 samples번 샘플링 후 필터링
+
+        Args:
+            convert: function(channel) -> ADC 값 (버스 락을 잡은 상태로 호출됨)
+
+        Returns:
+            array: 채널 순서대로 필터링된 ADC 값 (0~65535)
+        """
+        buf = self._buf
+        channels = self.channels
+        samples = self.samples
+        n_channels = len(channels)
+
+        # 채널을 번갈아 샘플링 (느린 변동이 한 채널에 몰리지 않도록)
+        for i in range(samples):
+            for c in range(n_channels):
+                buf[c * samples + i] = convert(channels[c])
+
+        return self.reduce()
+
+    def reduce(self):
+        """버퍼에 쌓인 샘플을 채널별로 필터링"""
+        buf = self._buf
+        samples = self.samples
+        result = self.result
+
+        for c in range(len(self.channels)):
+            window = sorted(buf[c * samples:(c + 1) * samples])
+            if self.mode == MEDIAN:
+                mid = samples // 2
+                if samples % 2:
+                    result[c] = window[mid]
+                else:
+                    result[c] = (window[mid - 1] + window[mid]) // 2
+            else:
+                kept = window[self.trim:samples - self.trim]
+                result[c] = sum(kept) // len(kept)
+
+        return result
+
+
+if __name__ == "__main__":
+    import random
+
+    scanner = ADCScanner([0, 1], samples=9)
+    noisy = {0: 30000, 1: 12000}
+    values = scanner.scan(lambda ch: noisy[ch] + random.choice([0, 0, 0, 0, 64, -64, 5000]))
+    print(f"필터 결과: {list(values)}")
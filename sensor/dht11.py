@@ -1,7 +1,6 @@
 # 온/습도 센서
 import time
-import board
-import adafruit_dht
+from hal.backend import board, adafruit_dht
 
 class DHT11:
     def __init__(self, pin):
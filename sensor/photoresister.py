@@ -1,36 +1,32 @@
-import board
-import busio
-import digitalio
-import adafruit_mcp3xxx.mcp3008 as MCP
-from adafruit_mcp3xxx.analog_in import AnalogIn
+from hal.backend import board
+from sensor.adc_bus import get_adc_bus
 
 class PhotoResister:
-    def __init__(self, channel_number):
-        # SPI 객체 생성
-        self.spi = busio.SPI(clock=board.SCK, MISO=board.MISO, MOSI=board.MOSI)
-        # CS 핀 설정
-        self.cs = digitalio.DigitalInOut(board.D8)
-        # MCP3008 객체 생성
-        self.mcp = MCP.MCP3008(self.spi, self.cs)
-        # 지정된 채널 번호로 아날로그 입력 채널 생성
-        self.channel = AnalogIn(self.mcp, channel_number)
+    def __init__(self, channel_number, bus=None):
+        # 공유 MCP3008 버스 사용 (버스는 프로세스 전체에서 한 번만 생성)
+        self.bus = bus if bus is not None else get_adc_bus(board.D8)
+        # 지정된 채널 번호로 채널 핸들 생성
+        self.channel = self.bus.channel(channel_number)
 
     def read(self):
         """
         조도센서 값을 반환
         :return: (디지털 값, 전압) 튜플 반환
         """
-        return self.channel.value, self.channel.voltage
+        value = self.channel.value
+        return value, self.bus.to_voltage(value)
 
 
     def close(self):
-        # SPI 및 CS 핀 정리
-        self.cs.deinit()
-        self.spi.deinit()
+        # 공유 버스는 close_adc_buses()에서 정리
+        self.channel = None
 
 
 if __name__ == "__main__":
+    from sensor.adc_bus import close_adc_buses
+
     sensor = PhotoResister(0) # MCP3008 채널 번호 (0-7)
     adc_value, voltage = sensor.read()
     print(f"조도센서 값: {adc_value} (전압: {voltage:.2f}V)")
-    sensor.close()
\ No newline at end of file
+    sensor.close()
+    close_adc_buses()
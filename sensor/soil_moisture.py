@@ -1,27 +1,23 @@
 # 토양 수분 센서 (아날로그 신호, MCP3208)
-import board
-import busio
-import digitalio
-import adafruit_mcp3xxx.mcp3008 as MCP
-from adafruit_mcp3xxx.analog_in import AnalogIn
+from sensor.adc_bus import get_adc_bus
+from service.log import get_logger, fields
+
+log = get_logger("sensor.soil")
 
 class SoilMoistureSensor:
-    def __init__(self, channel_number=0, cs_pin=board.D8):
+    def __init__(self, channel_number=0, cs_pin=None, bus=None):
         """
         토양 수분 센서 초기화 (MCP3208 ADC 사용)
         
         Args:
             channel_number: MCP3208 채널 번호 (0~7)
             cs_pin: CS 핀 번호 (기본값: D8)
+            bus: 공유 ADC 버스 (없으면 cs_pin의 공유 버스 사용)
         """
-        # SPI 객체 생성
-        self.spi = busio.SPI(clock=board.SCK, MISO=board.MISO, MOSI=board.MOSI)
-        # CS 핀 설정
-        self.cs = digitalio.DigitalInOut(cs_pin)
-        # MCP3008 객체 생성
-        self.mcp = MCP.MCP3008(self.spi, self.cs)
-        # 지정된 채널 번호로 아날로그 입력 채널 생성
-        self.channel = AnalogIn(self.mcp, channel_number)
+        # 공유 MCP3008 버스 사용 (버스는 프로세스 전체에서 한 번만 생성)
+        self.bus = bus if bus is not None else get_adc_bus(cs_pin)
+        # 지정된 채널 번호로 채널 핸들 생성
+        self.channel = self.bus.channel(channel_number)
 
     def read(self):
         """
@@ -32,23 +28,21 @@ class SoilMoistureSensor:
             voltage: 전압 (V)
         """
         try:
-            adc_value = self.channel.value 
-            voltage = self.channel.voltage
+            adc_value = self.channel.value
+            voltage = self.bus.to_voltage(adc_value)
             return adc_value, voltage
         except Exception as e:
-            print(f"토양수분 센서 읽기 오류: {e}")
+            log.warning("토양수분 센서 읽기 오류: %s", e, extra=fields(sensor="soil"))
             return None, None
 
     def close(self):
-        """SPI 연결 종료"""
-        try:
-            self.cs.deinit()
-            self.spi.deinit()
-        except Exception as e:
-            print(f"토양수분 센서 정리 오류: {e}")
+        """채널 핸들 해제 (공유 버스는 close_adc_buses()에서 정리)"""
+        self.channel = None
 
 
 if __name__ == "__main__":
+    from sensor.adc_bus import close_adc_buses
+
     sensor = SoilMoistureSensor(channel_number=1)
     try:
         adc_value, voltage = sensor.read()
@@ -64,3 +58,4 @@ if __name__ == "__main__":
             print("센서값 읽기 실패")
     finally:
         sensor.close()
+        close_adc_buses()
@@ -1,16 +1,20 @@
 # 물통 수위 센서 (디지털 신호, GPIO)
-import board
-import digitalio
+import threading
+import time
+from hal.backend import board, digitalio
+from service.log import get_logger, fields
+
+log = get_logger("sensor.water_level")
 
 class WaterLevelSensor:
-    def __init__(self, pin=board.D26):
+    def __init__(self, pin=None):
         """
         물통 수위 센서 초기화 (디지털 신호)
         
         Args:
             pin: GPIO 핀 번호 (기본값: D26)
         """
-        self.sensor = digitalio.DigitalInOut(pin)
+        self.sensor = digitalio.DigitalInOut(pin if pin is not None else board.D26)
         self.sensor.direction = digitalio.Direction.INPUT
 
     def read(self):
@@ -24,7 +28,7 @@ class WaterLevelSensor:
         try:
             return self.sensor.value
         except Exception as e:
-            print(f"물통 수위 센서 읽기 오류: {e}")
+            log.warning("물통 수위 센서 읽기 오류: %s", e, extra=fields(sensor="water_level"))
             return None
 
     def close(self):
@@ -32,7 +36,121 @@ class WaterLevelSensor:
         try:
             self.sensor.deinit()
         except Exception as e:
-            print(f"물통 수위 센서 정리 오류: {e}")
+            log.warning("물통 수위 센서 정리 오류: %s", e, extra=fields(sensor="water_level"))
+
+
+class EdgeWaterLevelSensor:
+    """
+    에지 인터럽트 기반 물통 수위 센서 (핀을 한 번만 설정하고 상태 변화를 바로 알림)
+
+    GPIO 에지 콜백이 올 때마다 debounce초 타이머를 다시 걸고, 타이머가 끝났을 때 핀 값이
+    현재 상태와 다르면 상태를 바꾸고 등록된 리스너를 호출합니다. (물 튐, 접점 떨림 무시)
+    리스너는 디바운스 타이머 스레드에서 호출됩니다.
+    """
+
+    def __init__(self, pin=None, debounce=0.1, bouncetime=20, gpio_module=None):
+        """
+        Args:
+            pin: GPIO 핀 (board 핀 또는 BCM 번호)
+            debounce: 값이 이 시간(초) 동안 유지되어야 상태 변경으로 인정
+            bouncetime: GPIO 에지 감지 자체의 떨림 무시 시간 (ms)
+            gpio_module: RPi.GPIO 호환 모듈 (기본값: HAL 백엔드의 gpio)
+        """
+        if gpio_module is None:
+            from hal.backend import gpio as gpio_module
+        self.gpio = gpio_module
+        if pin is None:
+            pin = board.D26
+        self.pin = getattr(pin, 'id', pin)
+        self.debounce = debounce
+        self.bouncetime = bouncetime
+        self.state = None  # 디바운스된 값 (True: 물 감지됨)
+        self.changed_at = None  # 마지막 상태 변경 시각 (monotonic)
+        self._listeners = []
+        self._timer = None
+        self._lock = threading.Lock()
+        self.running = False
+
+        # 통계
+        self.edges = 0
+        self.changes = 0
+
+    def start(self):
+        """핀 설정, 현재 값 읽기, 에지 감지 시작"""
+        if self.running:
+            return
+        try:
+            self.gpio.setmode(self.gpio.BCM)
+        except (RuntimeError, ValueError):
+            pass  # 이미 설정됨
+        self.gpio.setup(self.pin, self.gpio.IN)
+        self.state = bool(self.gpio.input(self.pin))
+        self.changed_at = time.monotonic()
+        self.gpio.add_event_detect(self.pin, self.gpio.BOTH, callback=self._on_edge, bouncetime=self.bouncetime)
+        self.running = True
+
+    def add_change_listener(self, listener):
+        """상태 변경 리스너 등록 - function(water_detected)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_change_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _on_edge(self, channel):
+        """GPIO 에지 콜백 - 디바운스 타이머 다시 시작"""
+        with self._lock:
+            self.edges += 1
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._confirm)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _confirm(self):
+        """디바운스 시간이 지난 뒤 핀 값 확인"""
+        try:
+            level = bool(self.gpio.input(self.pin))
+        except Exception as e:
+            log.warning("물통 수위 센서 읽기 오류: %s", e, extra=fields(sensor="water_level"))
+            return
+        with self._lock:
+            self._timer = None
+            if not self.running or level == self.state:
+                return  # 떨림이었음
+            self.state = level
+            self.changed_at = time.monotonic()
+            self.changes += 1
+            listeners = list(self._listeners)
+        log.info("물통 수위 센서 상태 변경", extra=fields(sensor="water_level", value=level))
+        for listener in listeners:
+            try:
+                listener(level)
+            except Exception as e:
+                log.exception("물통 수위 리스너 오류: %s", e, extra=fields(sensor="water_level"))
+
+    def read(self):
+        """
+        디바운스된 현재 값 (대기 없음)
+
+        Returns:
+            True: 물 감지됨, False: 물 없음, None: 시작 전
+        """
+        return self.state
+
+    def close(self):
+        """에지 감지 해제"""
+        with self._lock:
+            self.running = False
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        try:
+            self.gpio.remove_event_detect(self.pin)
+        except Exception as e:
+            log.warning("물통 수위 센서 정리 오류: %s", e, extra=fields(sensor="water_level"))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,34 @@
 """
 액추에이터 자동 제어 로직
 프리셋과 센서값을 비교하여 자동으로 액추에이터를 제어합니다.
+제어 규칙은 service/control_engine.py의 규칙 테이블에 정의되어 있습니다.
 """
-from datetime import datetime
+from mqtt.preset import Preset
+from service.control_engine import control_all
+from service.pid_controller import PIDController, TimeProportionalOutput
+from service.log import get_logger, fields
+
+log = get_logger("actuator_control")
+
+# 히터 제어 방식
+TEMP_MODE_BANGBANG = "bangbang"  # 적정 온도 ±2도 ON/OFF (규칙 테이블)
+TEMP_MODE_PID = "pid"  # PID + 시간 비례 출력
 
 class ActuatorController:
-    def __init__(self, heater, water_pump, ventilation_fan, led, water_monitor, co2_servo=None):
+    def __init__(self, heater, water_pump, ventilation_fan, led, water_monitor, co2_servo=None,
+                 temp_mode=TEMP_MODE_BANGBANG, heater_pid=None, heater_pwm=None, slot=None, device=None):
+        """
+        Args:
+            heater, water_pump, ventilation_fan, led: 액추에이터
+            water_monitor: 물탱크 모니터 (급수 차단 판단)
+            co2_servo: CO2 카트리지 제어용 서보 (옵션)
+            temp_mode: 히터 제어 방식 ("bangbang", "pid")
+            heater_pid: PID 모드에서 사용할 PIDController (기본값 생성)
+            heater_pwm: PID 모드에서 사용할 TimeProportionalOutput (기본값 생성)
+            slot, device: 슬롯 번호, 디바이스 시리얼 (로그 필드용)
+        """
+        if temp_mode not in (TEMP_MODE_BANGBANG, TEMP_MODE_PID):
+            raise ValueError(f"지원하지 않는 히터 제어 방식: {temp_mode}")
         self.heater = heater
         self.water_pump = water_pump
         self.ventilation_fan = ventilation_fan
@@ -14,144 +37,120 @@ class ActuatorController:
         self.co2_servo = co2_servo  # CO2 카트리지 제어용 서보 (옵션)
         self.co2_release_angle = 90
         self.co2_idle_angle = 0
-        self.co2_low_margin = 150
-        self.co2_recover_margin = 50
         self.is_servo_releasing = False
-        
-        # 이전 상태 저장 (불필요한 제어 방지)
-        self.last_heater_state = None
-        self.last_pump_state = None
-        self.last_fan_state = None
-        self.last_led_state = None
+        self.slot = slot
+        self.device = device
+
+        # 히터 제어 방식 (PID 모드면 히터는 규칙 테이블 대신 PID로 제어)
+        self.temp_mode = temp_mode
+        self.heater_pid = None
+        self.heater_pwm = None
+        if temp_mode == TEMP_MODE_PID:
+            self.heater_pid = heater_pid or PIDController()
+            self.heater_pwm = heater_pwm or TimeProportionalOutput()
+
+        # 릴레이 핀을 쓰는 GPIO 출력 뱅크 (제어 사이클 단위로 묶어서 씀)
+        self.output_bank = getattr(heater, 'bank', None)
+
+        # 제어 엔진 액추에이터 이름 -> 장치
+        self._actuators = {
+            'heater': self.heater,
+            'fan': self.ventilation_fan,
+            'pump': self.water_pump,
+            'led': self.led,
+        }
 
         if self.co2_servo:
-            # 시작 시 CO2 카트리지를 닫힌 상태로 맞춰둡니다.
+            # 시작 시 CO2 카트리지를 닫힌 상태로 맞춰둡니다. (서보 작업 스레드에서 처리, 즉시 반환)
             self.co2_servo.set_angle(self.co2_idle_angle)
     
     def control(self, sensor_data, preset):
         """
-        센서 데이터와 프리셋을 비교하여 액추에이터 제어
+        센서 데이터와 프리셋을 비교하여 액추에이터 제어 (규칙 테이블 엔진 사용)
         
         Args:
             sensor_data: dict with keys: temp, humidity, light, soil, co2
-            preset: dict with keys: OptimalTemp, OptimalHumidity, LightIntensity, SoilMoisture, Co2Level
+            preset: Preset (임계값이 미리 계산됨), dict를 넘기면 Preset으로 변환
         """
         if not preset:
-            print("⚠️  프리셋 없음 - 액추에이터 제어 대기 중")
+            log.warning("프리셋 없음 - 액추에이터 제어 대기 중")
             return
-        
-        temp = sensor_data.get('temp')
-        humidity = sensor_data.get('humidity')
-        soil = sensor_data.get('soil')
-        co2 = sensor_data.get('co2')
-        light = sensor_data.get('light')  # 조도 값 추가
-        
-        # 프리셋 값 가져오기
-        optimal_temp = float(preset.get('OptimalTemp', 25))
-        optimal_humidity = float(preset.get('OptimalHumidity', 60))
-        optimal_soil = float(preset.get('SoilMoisture', 50))
-        optimal_co2 = float(preset.get('Co2Level', 800))
-        optimal_light = float(preset.get('LightIntensity', 5000))  # 조도 프리셋 추가
-        
-        # 1. 히터 및 환풍팬 제어 (온도 기반)
-        if temp is not None:
-            if temp < optimal_temp - 2:  # 온도가 2도 이상 낮으면
-                if not self.heater.is_on:
-                    self.heater.turn_on()
-                    self.last_heater_state = True
-                # 온도가 낮을 때는 환풍팬 끄기
-                if self.ventilation_fan.is_on:
-                    self.ventilation_fan.turn_off()
-                    self.last_fan_state = False
-            elif temp > optimal_temp + 2:  # 온도가 2도 이상 높으면
-                if self.heater.is_on:
-                    self.heater.turn_off()
-                    self.last_heater_state = False
-                # 온도가 높을 때는 환풍팬 켜서 냉각
-                if not self.ventilation_fan.is_on:
-                    self.ventilation_fan.turn_on()
-                    self.last_fan_state = True
-            elif optimal_temp - 2 <= temp <= optimal_temp + 2:  # 적정 온도 범위
-                # 온도가 적정 범위일 때는 히터만 끄고, 환풍팬은 습도 제어에 맡김
-                if self.heater.is_on:
-                    self.heater.turn_off()
-                    self.last_heater_state = False
-        
-        # 2. 물펌프 제어 (토양 수분 기반) + 물탱크 안전 체크
-        if soil is not None:
-            # 물탱크 안전 체크 (급수탱크 위험 또는 물받이탱크 넘침 시 차단)
-            if self.water_monitor.should_block_watering():
-                # 물탱크 문제 발생 - 펌프 강제 정지
-                if self.water_pump.is_on:
-                    print("🚫 물탱크 문제로 펌프 강제 정지!")
-                    self.water_pump.turn_off()
-                    self.last_pump_state = False
-            else:
-                # 정상 - 토양 수분 기반 제어
-                if soil > optimal_soil + 500:  # ADC 값 기준 (값이 높으면 건조)
-                    if not self.water_pump.is_on:
-                        self.water_pump.turn_on()
-                        self.last_pump_state = True
-                elif soil < optimal_soil - 200:
-                    if self.water_pump.is_on:
-                        self.water_pump.turn_off()
-                        self.last_pump_state = False
-        
-        # 3. 환기팬 제어 (습도 기반) - 온도 제어가 우선순위
-        # 온도가 높아서 이미 팬이 켜진 경우는 습도 제어를 건너뜀
-        if humidity is not None and temp is not None:
-            # 온도가 정상 범위이고 습도만 높을 때
-            if optimal_temp - 2 <= temp <= optimal_temp + 2:
-                if humidity > optimal_humidity + 10:  # 습도가 10% 이상 높으면
-                    if not self.ventilation_fan.is_on:
-                        self.ventilation_fan.turn_on()
-                        self.last_fan_state = True
-                elif humidity < optimal_humidity - 5:
-                    if self.ventilation_fan.is_on:
-                        self.ventilation_fan.turn_off()
-                        self.last_fan_state = False
-
-        # 4. LED 조명 제어 (조도 기반 + 시간 제한: 8시~22시)
-        if light is not None:
-            current_hour = datetime.now().hour
-            
-            # LED 작동 시간대 체크 (8시~22시)
-            if 8 <= current_hour < 22:
-                # 조도가 낮으면 LED 켜기 (광합성 보조)
-                if light < optimal_light - 25:  # 기준값보다 25 낮으면
-                    if not self.led.is_on:
-                        self.led.turn_on()
-                        self.last_led_state = True
-                # 조도가 충분하면 LED 끄기 (에너지 절약)
-                elif light > optimal_light + 25:  # 기준값보다 25 높으면
-                    if self.led.is_on:
-                        self.led.turn_off()
-                        self.last_led_state = False
+        if not isinstance(preset, Preset):
+            preset = Preset.from_params(preset)
+        control_all([self], [sensor_data], [preset])
+
+    def get_state(self, actuator):
+        """
+        액추에이터 현재 상태 (제어 엔진용)
+
+        Returns:
+            bool: 켜짐(CO2 서보는 개방) 여부, 액추에이터가 없으면 None
+        """
+        if actuator == 'co2_servo':
+            return self.is_servo_releasing if self.co2_servo else None
+        if actuator == 'heater' and self.temp_mode == TEMP_MODE_PID:
+            return None  # PID로 따로 제어
+        return self._actuators[actuator].is_on
+
+    def control_heater_pid(self, temp, preset, now=None):
+        """
+        PID + 시간 비례 출력으로 히터 제어 (PID 모드)
+
+        Args:
+            temp: 현재 온도 (None이면 안전을 위해 히터 끔)
+            preset: Preset (optimal_temp 사용)
+        """
+        if temp is None:
+            desired = False
+        else:
+            duty = self.heater_pid.update(preset.optimal_temp, temp, now)
+            desired = self.heater_pwm.update(duty, self.heater.is_on, now)
+        if desired != self.heater.is_on:
+            self.apply('heater', desired, 'heater_pid')
+
+    def apply(self, actuator, state, rule=None):
+        """
+        제어 엔진이 결정한 목표 상태 적용
+
+        Args:
+            actuator: 'heater', 'fan', 'pump', 'led', 'co2_servo'
+            state: True(켜기/개방), False(끄기/원위치)
+            rule: 결정한 규칙 이름 (로그용)
+        """
+        extra = fields(slot=self.slot, device=self.device, actuator=actuator, rule=rule)
+        if actuator == 'co2_servo':
+            if state:
+                log.info("CO2 낮음 - 서보모터로 카트리지 개방", extra=extra)
+                self.co2_servo.set_angle(self.co2_release_angle)
             else:
-                # 작동 시간대가 아니면 LED 끄기 (22시~8시)
-                if self.led.is_on:
-                    self.led.turn_off()
-                    self.last_led_state = False
-
-        # 5. CO2 제어 (서보 기반)
-        if self.co2_servo and co2 is not None:
-            release_threshold = max(0.0, optimal_co2 - self.co2_low_margin)
-            recovery_threshold = max(release_threshold + self.co2_recover_margin, release_threshold + 10)
-            recovery_threshold = min(optimal_co2, recovery_threshold)
-
-            if co2 < release_threshold:
-                if not self.is_servo_releasing:
-                    print("🫧 CO2 낮음 - 서보모터로 카트리지 개방")
-                    self.co2_servo.set_angle(self.co2_release_angle)
-                    self.is_servo_releasing = True
-            elif co2 >= recovery_threshold:
-                if self.is_servo_releasing:
-                    print("✅ CO2 정상화 - 서보모터 원위치")
-                    self.co2_servo.set_angle(self.co2_idle_angle)
-                    self.is_servo_releasing = False
+                log.info("CO2 정상화 - 서보모터 원위치", extra=extra)
+                self.co2_servo.set_angle(self.co2_idle_angle)
+            self.is_servo_releasing = state
+            return
+
+        if rule == 'pump_block':
+            log.warning("물탱크 문제로 펌프 강제 정지", extra=extra)
+        else:
+            # ON/OFF는 형식 문자열을 따로 둬서 반복 억제에서도 다른 메시지로 취급
+            log.info("액추에이터 ON" if state else "액추에이터 OFF", extra=extra)
+        device = self._actuators[actuator]
+        if state:
+            device.turn_on()
+        else:
+            device.turn_off()
     
     def stop_all(self):
         """모든 액추에이터 정지"""
+        if self.output_bank is not None:
+            with self.output_bank.batch():
+                self._stop_relays()
+        else:
+            self._stop_relays()
+        if self.co2_servo and self.is_servo_releasing:
+            self.co2_servo.set_angle(self.co2_idle_angle)
+            self.is_servo_releasing = False
+
+    def _stop_relays(self):
         if self.heater.is_on:
             self.heater.turn_off()
         if self.water_pump.is_on:
@@ -160,7 +159,4 @@ class ActuatorController:
             self.ventilation_fan.turn_off()
         if self.led.is_on:
             self.led.turn_off()
-        if self.co2_servo and self.is_servo_releasing:
-            self.co2_servo.set_angle(self.co2_idle_angle)
-            self.is_servo_releasing = False
 
@@ -0,0 +1,528 @@
+"""
+스마트팜 설정 파일 (TOML/JSON)
+
+핀 배치, 브로커, 모델 프로필, 제어 튜닝값(물탱크 임계값, 알림 쿨다운, 제어 여유값, LED 시간대)을
+설정 파일 하나로 관리합니다. 시작할 때 한 번 읽고 검증해서 읽기 전용 객체(__slots__)로 만들어 두므로
+제어 루프는 파일이나 dict를 다시 보지 않습니다. 잘못된 값은 시작 전에 ValueError로 거부합니다.
+
+    config = load_config("smartfarm.toml")
+    device_config = config.devices[0]
+    device_config.control.led_hours  # (8, 22)
+
+SIGHUP(kill -HUP <pid>)을 받으면 파일을 다시 읽어서 제어 튜닝값(RELOADABLE)만 바로 반영합니다.
+스레드를 다시 만들거나 버스/포트를 다시 열지 않으며, 핀/브로커/디바이스 목록처럼
+재시작해야 하는 항목이 바뀌었으면 경고만 남깁니다.
+
+형식은 smartfarm.example.toml 참고 (JSON도 같은 구조)
+"""
+import json
+import os
+import signal
+import threading
+from types import MappingProxyType
+from mqtt.preset import DEFAULT_MARGINS
+from service.log import get_logger
+
+log = get_logger("config")
+
+DEFAULT_PORT = 1883
+
+# 디바이스 모델 (시리얼 앞 2글자) -> (슬롯 번호, CO2 센서 여부), 설정 파일 [models.XX]로 추가/변경 가능
+# - 고급형 4슬롯: A4xxx, 고급형 1슬롯: A1xxx
+# - 일반형 4슬롯: B4xxx, 일반형 1슬롯: B1xxx
+MODEL_PROFILES = {
+    "A4": ((1, 2, 3, 4), True),
+    "A1": ((1,), True),
+    "B4": ((1, 2, 3, 4), False),
+    "B1": ((1,), False),
+}
+DEFAULT_PROFILE = ((1,), False)  # 모르는 모델: 1슬롯, CO2 없음
+
+HEATER_MODES = ("bangbang", "pid")
+PAYLOAD_ENCODINGS = ("text", "binary")
+ADC_CHANNELS = 8  # MCP3008
+
+ACTUATOR_KEYS = ('heater', 'led', 'water_ib1', 'water_ib2', 'fan', 'servo')
+REQUIRED_ACTUATOR_KEYS = ('heater', 'led', 'water_ib1', 'water_ib2', 'fan')
+SENSOR_KEYS = ('dht11_pin', 'photo_channel', 'soil_channel', 'co2_port', 'adc_cs')
+REQUIRED_SENSOR_KEYS = ('dht11_pin', 'photo_channel', 'soil_channel')
+
+# SIGHUP으로 바로 반영되는 디바이스 항목 (나머지는 재시작 필요)
+RELOADABLE = ('interval', 'water_tank', 'control')
+
+
+class _Config:
+    """검증이 끝난 설정 (읽기 전용, 바꾸려면 파일을 다시 읽어 통째로 교체)"""
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__}는 읽기 전용입니다")
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+
+class ModelProfile(_Config):
+    __slots__ = ('name', 'slots', 'has_co2')
+
+
+class WaterTankConfig(_Config):
+    """물탱크 모니터 설정 (WaterTankMonitor)"""
+    __slots__ = ('supply_tank_height', 'supply_low_threshold', 'supply_critical_threshold', 'alert_cooldown')
+
+
+class ControlConfig(_Config):
+    """제어 튜닝값 (프리셋 여유값, LED 작동 시간대, CO2 서보 각도)"""
+    __slots__ = ('margins', 'led_hours', 'co2_release_angle', 'co2_idle_angle')
+
+
+class SlotConfig(_Config):
+    """슬롯 핀 배치 (actuators/sensors는 읽기 전용 dict)"""
+    __slots__ = ('slot', 'actuators', 'sensors', 'heater_mode')
+
+
+class DeviceConfig(_Config):
+    """디바이스 1대"""
+    __slots__ = ('serial', 'model', 'has_co2', 'slots', 'broker', 'port', 'interval',
+                 'ultrasonic_pins', 'water_tank_pin', 'batch_publish', 'payload_encoding',
+                 'water_tank', 'control')
+
+    @property
+    def slot_numbers(self):
+        return [slot.slot for slot in self.slots]
+
+    @property
+    def actuator_pin_map(self):
+        return {slot.slot: slot.actuators for slot in self.slots}
+
+    @property
+    def sensor_pin_map(self):
+        return {slot.slot: slot.sensors for slot in self.slots}
+
+    @property
+    def heater_mode_map(self):
+        return {slot.slot: slot.heater_mode for slot in self.slots}
+
+
+class FarmConfig(_Config):
+    """설정 파일 전체 (디바이스 1대면 main.py, 여러 대면 gateway.py)"""
+    __slots__ = ('gateway_id', 'broker', 'port', 'interval', 'offline_queue', 'offline_queue_max_messages',
+                 'preset_timeout', 'metrics_enabled', 'metrics_interval', 'models', 'devices')
+
+    def device(self, serial):
+        """시리얼로 디바이스 설정 찾기 (없으면 None)"""
+        for device in self.devices:
+            if device.serial == serial:
+                return device
+        return None
+
+
+# ========================================
+# 검증
+# ========================================
+
+def _check_keys(section, allowed, where):
+    """오타 방지: 모르는 키는 거부"""
+    unknown = sorted(set(section) - set(allowed))
+    if unknown:
+        raise ValueError(f"{where}: 알 수 없는 항목 {unknown}")
+
+
+def _number(value, where, low=None, high=None, integer=False):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or (integer and not isinstance(value, int)):
+        raise ValueError(f"{where}: {'정수' if integer else '숫자'}가 아님 ({value!r})")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise ValueError(f"{where}: 범위({low}~{high})를 벗어남 ({value})")
+    return value
+
+
+def _bool(value, where):
+    if not isinstance(value, bool):
+        raise ValueError(f"{where}: true/false가 아님 ({value!r})")
+    return value
+
+
+def _choice(value, choices, where):
+    if value not in choices:
+        raise ValueError(f"{where}: {choices} 중 하나가 아님 ({value!r})")
+    return value
+
+
+def board_pin(value, where="핀"):
+    """BCM 번호(22), 이름("D22"), board 핀 객체를 board 핀으로 변환"""
+    if hasattr(value, 'id'):
+        return value
+    from hal.backend import board
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{where}: 핀 번호가 아님 ({value!r})")
+    name = value if isinstance(value, str) else f"D{value}"
+    pin = getattr(board, name, None)
+    if pin is None:
+        raise ValueError(f"{where}: 알 수 없는 핀 ({value!r})")
+    return pin
+
+
+def _gpio_pins(value, where):
+    """액추에이터 핀 (BCM 번호 또는 번호 리스트) -> int 또는 tuple"""
+    if isinstance(value, (list, tuple)):
+        if not value:
+            raise ValueError(f"{where}: 빈 핀 목록")
+        return tuple(_number(pin, where, low=0, integer=True) for pin in value)
+    return _number(value, where, low=0, integer=True)
+
+
+def _pin_numbers(value):
+    if value is None:
+        return []
+    return list(value) if isinstance(value, tuple) else [value]
+
+
+def _merge(base, override):
+    """섹션 합치기 (override 값이 우선, dict는 한 단계 더 합침)"""
+    merged = dict(base or {})
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+def parse_models(section):
+    profiles = {name: ModelProfile(name=name, slots=slots, has_co2=has_co2)
+                for name, (slots, has_co2) in MODEL_PROFILES.items()}
+    for name, entry in (section or {}).items():
+        where = f"models.{name}"
+        _check_keys(entry, ('slots', 'has_co2'), where)
+        slots = entry.get('slots')
+        if not isinstance(slots, (list, tuple)) or not slots:
+            raise ValueError(f"{where}.slots: 슬롯 번호 목록이 필요함")
+        slots = tuple(sorted(_number(s, f"{where}.slots", low=1, integer=True) for s in slots))
+        has_co2 = _bool(entry.get('has_co2', False), f"{where}.has_co2")
+        profiles[name.upper()] = ModelProfile(name=name.upper(), slots=slots, has_co2=has_co2)
+    return MappingProxyType(profiles)
+
+
+def model_profile(serial, model=None, models=None):
+    """
+    디바이스 모델 판별 (model이 없으면 시리얼 앞 2글자)
+
+    Returns:
+        ModelProfile
+    """
+    name = (model or serial[:2]).upper()
+    models = models or parse_models(None)
+    profile = models.get(name)
+    if profile is None:
+        slots, has_co2 = DEFAULT_PROFILE
+        profile = ModelProfile(name=name, slots=slots, has_co2=has_co2)
+    return profile
+
+
+def parse_water_tank(section, where="water_tank"):
+    values = {'supply_tank_height': 20, 'supply_low_threshold': 5, 'supply_critical_threshold': 3,
+              'alert_cooldown': 300}
+    section = section or {}
+    _check_keys(section, values, where)
+    values.update(section)
+    height = _number(values['supply_tank_height'], f"{where}.supply_tank_height", low=1)
+    low = _number(values['supply_low_threshold'], f"{where}.supply_low_threshold", low=0, high=height)
+    critical = _number(values['supply_critical_threshold'], f"{where}.supply_critical_threshold", low=0, high=low)
+    cooldown = _number(values['alert_cooldown'], f"{where}.alert_cooldown", low=0)
+    return WaterTankConfig(supply_tank_height=height, supply_low_threshold=low,
+                           supply_critical_threshold=critical, alert_cooldown=cooldown)
+
+
+def parse_control(section, where="control"):
+    section = section or {}
+    _check_keys(section, ('margins', 'led_hours', 'co2_release_angle', 'co2_idle_angle'), where)
+    margins = dict(DEFAULT_MARGINS)
+    overrides = section.get('margins') or {}
+    _check_keys(overrides, DEFAULT_MARGINS, f"{where}.margins")
+    for key, value in overrides.items():
+        margins[key] = float(_number(value, f"{where}.margins.{key}", low=0))
+    led_hours = section.get('led_hours', (8, 22))
+    if not isinstance(led_hours, (list, tuple)) or len(led_hours) != 2:
+        raise ValueError(f"{where}.led_hours: [시작, 끝] 시각이 필요함 ({led_hours!r})")
+    led_hours = tuple(_number(h, f"{where}.led_hours", low=0, high=24, integer=True) for h in led_hours)
+    return ControlConfig(
+        margins=MappingProxyType(margins),
+        led_hours=led_hours,
+        co2_release_angle=_number(section.get('co2_release_angle', 90), f"{where}.co2_release_angle", 0, 180),
+        co2_idle_angle=_number(section.get('co2_idle_angle', 0), f"{where}.co2_idle_angle", 0, 180),
+    )
+
+
+def parse_slot(slot, entry, has_co2, where):
+    _check_keys(entry, ('actuators', 'sensors', 'heater_mode'), where)
+    actuators = entry.get('actuators') or {}
+    sensors = entry.get('sensors') or {}
+    _check_keys(actuators, ACTUATOR_KEYS, f"{where}.actuators")
+    _check_keys(sensors, SENSOR_KEYS, f"{where}.sensors")
+    for key in REQUIRED_ACTUATOR_KEYS:
+        if key not in actuators:
+            raise ValueError(f"{where}.actuators.{key}: 설정이 없음")
+    for key in REQUIRED_SENSOR_KEYS:
+        if key not in sensors:
+            raise ValueError(f"{where}.sensors.{key}: 설정이 없음")
+
+    actuator_pins = {key: _gpio_pins(value, f"{where}.actuators.{key}")
+                     for key, value in actuators.items() if value is not None}
+    actuator_pins.setdefault('servo', None)
+    sensor_pins = {
+        'dht11_pin': board_pin(sensors['dht11_pin'], f"{where}.sensors.dht11_pin"),
+        'photo_channel': _number(sensors['photo_channel'], f"{where}.sensors.photo_channel",
+                                 0, ADC_CHANNELS - 1, integer=True),
+        'soil_channel': _number(sensors['soil_channel'], f"{where}.sensors.soil_channel",
+                                0, ADC_CHANNELS - 1, integer=True),
+        'co2_port': sensors.get('co2_port') if has_co2 else None,  # 일반형은 CO2 센서 없음
+    }
+    if sensors.get('adc_cs') is not None:
+        sensor_pins['adc_cs'] = board_pin(sensors['adc_cs'], f"{where}.sensors.adc_cs")
+    return SlotConfig(
+        slot=slot,
+        actuators=MappingProxyType(actuator_pins),
+        sensors=MappingProxyType(sensor_pins),
+        heater_mode=_choice(entry.get('heater_mode', 'bangbang'), HEATER_MODES, f"{where}.heater_mode"),
+    )
+
+
+def parse_device(entry, defaults, models, index):
+    where = f"devices[{index}]"
+    _check_keys(entry, DeviceConfig.__slots__, where)
+    serial = entry.get('serial')
+    if not serial or not isinstance(serial, str):
+        raise ValueError(f"{where}.serial: 디바이스 시리얼이 없음")
+    where = f"devices[{index}]({serial})"
+    profile = model_profile(serial, entry.get('model'), models)
+    has_co2 = _bool(entry.get('has_co2', profile.has_co2), f"{where}.has_co2")
+
+    slot_entries = entry.get('slots')
+    if not isinstance(slot_entries, dict) or not slot_entries:
+        raise ValueError(f"{where}.slots: 슬롯 설정이 없음")
+    slots = []
+    for key, slot_entry in slot_entries.items():
+        try:
+            slot = int(key)
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}.slots: 슬롯 번호가 아님 ({key!r})") from None
+        if slot not in profile.slots:
+            raise ValueError(f"{where}.slots: 모델 {profile.name}에 없는 슬롯 {slot} (가능: {list(profile.slots)})")
+        slots.append(parse_slot(slot, slot_entry, has_co2, f"{where}.slots.{slot}"))
+    slots.sort(key=lambda s: s.slot)
+
+    ultrasonic_pins = entry.get('ultrasonic_pins', (23, 24))
+    if not isinstance(ultrasonic_pins, (list, tuple)) or len(ultrasonic_pins) != 2:
+        raise ValueError(f"{where}.ultrasonic_pins: [TRIG, ECHO]가 필요함")
+    water_tank_pin = entry.get('water_tank_pin', 26)
+
+    return DeviceConfig(
+        serial=serial,
+        model=profile.name,
+        has_co2=has_co2,
+        slots=tuple(slots),
+        broker=entry.get('broker', defaults['broker']),
+        port=_number(entry.get('port', defaults['port']), f"{where}.port", 1, 65535, integer=True),
+        interval=_number(entry.get('interval', defaults['interval']), f"{where}.interval", low=0.01),
+        ultrasonic_pins=tuple(_number(p, f"{where}.ultrasonic_pins", low=0, integer=True) for p in ultrasonic_pins),
+        water_tank_pin=board_pin(water_tank_pin, f"{where}.water_tank_pin") if water_tank_pin is not None else None,
+        batch_publish=_bool(entry.get('batch_publish', False), f"{where}.batch_publish"),
+        payload_encoding=_choice(entry.get('payload_encoding', 'text'), PAYLOAD_ENCODINGS,
+                                 f"{where}.payload_encoding"),
+        water_tank=parse_water_tank(_merge(defaults['water_tank'], entry.get('water_tank')), f"{where}.water_tank"),
+        control=parse_control(_merge(defaults['control'], entry.get('control')), f"{where}.control"),
+    )
+
+
+def parse_config(data):
+    """
+    설정 dict 검증 후 FarmConfig 생성
+
+    Raises:
+        ValueError: 모르는 항목, 잘못된 값/범위, 디바이스 없음, 시리얼 중복, 모델에 없는 슬롯,
+                    액추에이터 핀 중복 (항목 위치가 메시지에 포함됨)
+    """
+    _check_keys(data, ('gateway_id', 'broker', 'port', 'interval', 'offline_queue', 'offline_queue_max_messages',
+                       'preset_timeout', 'metrics', 'models', 'water_tank', 'control', 'devices'), "설정")
+    metrics = data.get('metrics') or {}
+    _check_keys(metrics, ('enabled', 'interval'), "metrics")
+    models = parse_models(data.get('models'))
+    defaults = {
+        'broker': data.get('broker', 'localhost'),
+        'port': data.get('port', DEFAULT_PORT),
+        'interval': data.get('interval', 10),
+        'water_tank': data.get('water_tank'),
+        'control': data.get('control'),
+    }
+    entries = data.get('devices') or []
+    if not entries:
+        raise ValueError("devices: 디바이스가 없음")
+    devices = tuple(parse_device(entry, defaults, models, i) for i, entry in enumerate(entries))
+
+    serials = [device.serial for device in devices]
+    duplicates = sorted({s for s in serials if serials.count(s) > 1})
+    if duplicates:
+        raise ValueError(f"devices: 시리얼 중복 {duplicates}")
+
+    # 액추에이터 핀은 디바이스/슬롯끼리 겹치면 안 됨 (초음파/수위 센서 핀은 공유 가능)
+    owners = {}
+    for device in devices:
+        for slot in device.slots:
+            for name in ACTUATOR_KEYS:
+                for pin in _pin_numbers(slot.actuators.get(name)):
+                    owner = f"{device.serial}:{slot.slot} {name}"
+                    if pin in owners:
+                        raise ValueError(f"GPIO {pin} 중복: {owners[pin]} / {owner}")
+                    owners[pin] = owner
+
+    offline_queue_max = data.get('offline_queue_max_messages', 20000)
+    return FarmConfig(
+        gateway_id=data.get('gateway_id', 'gateway'),
+        broker=defaults['broker'],
+        port=_number(defaults['port'], "port", 1, 65535, integer=True),
+        interval=_number(defaults['interval'], "interval", low=0.01),
+        offline_queue=data.get('offline_queue'),
+        offline_queue_max_messages=_number(offline_queue_max, "offline_queue_max_messages", low=1, integer=True),
+        preset_timeout=_number(data.get('preset_timeout', 10), "preset_timeout", low=0),
+        metrics_enabled=_bool(metrics.get('enabled', True), "metrics.enabled"),
+        metrics_interval=_number(metrics.get('interval', 60), "metrics.interval", low=1),
+        models=models,
+        devices=devices,
+    )
+
+
+def _read_toml(data):
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10 이하
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ValueError("TOML 설정을 읽으려면 Python 3.11 이상 또는 tomli 패키지가 필요합니다 "
+                             "(JSON 설정은 그대로 사용 가능)") from None
+    return tomllib.loads(data.decode("utf-8"))
+
+
+def load_config(path):
+    """
+    설정 파일 읽기 (.toml 또는 .json)
+
+    Raises:
+        OSError: 파일을 읽을 수 없음
+        ValueError: 형식 오류 또는 검증 실패
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext == ".toml":
+            raw = _read_toml(data)
+        elif ext == ".json":
+            raw = json.loads(data)
+        else:
+            raise ValueError(f"지원하지 않는 설정 파일 형식: {ext or path} (.toml, .json)")
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"{path}: {e}") from None
+    except ValueError as e:
+        if type(e).__name__ == "TOMLDecodeError":
+            raise ValueError(f"{path}: {e}") from None
+        raise
+    return parse_config(raw)
+
+
+# ========================================
+# 다시 읽기 (SIGHUP)
+# ========================================
+
+def restart_required(old, new):
+    """
+    재시작해야 반영되는 변경 항목
+
+    Returns:
+        list[str]: 바뀐 항목 이름 (비어 있으면 모두 바로 반영 가능)
+    """
+    changed = [name for name in ('gateway_id', 'broker', 'port', 'offline_queue', 'offline_queue_max_messages',
+                                 'metrics_enabled', 'models')
+               if getattr(old, name) != getattr(new, name)]
+    if [d.serial for d in old.devices] != [d.serial for d in new.devices]:
+        changed.append("devices")
+        return changed
+    for old_device, new_device in zip(old.devices, new.devices):
+        for name in DeviceConfig.__slots__:
+            if name not in RELOADABLE and getattr(old_device, name) != getattr(new_device, name):
+                changed.append(f"{old_device.serial}.{name}")
+    return changed
+
+
+class ConfigReloader:
+    """설정 파일 다시 읽기 (실패하면 기존 설정 유지)"""
+
+    def __init__(self, path, config, apply):
+        """
+        Args:
+            path: 설정 파일 경로
+            config: 현재 FarmConfig
+            apply: function(new_config) - 튜닝값 반영 (시그널을 받으면 다시 읽기 스레드에서 호출)
+        """
+        self.path = path
+        self.config = config
+        self.apply = apply
+        self.reloads = 0
+        self._lock = threading.Lock()  # 시그널이 연달아 와도 한 번에 하나씩 반영
+
+    def reload(self):
+        """
+        파일을 다시 읽어 반영
+
+        Returns:
+            bool: 반영 여부
+        """
+        with self._lock:
+            try:
+                config = load_config(self.path)
+            except (OSError, ValueError) as e:
+                log.error("설정 다시 읽기 실패 (기존 설정 유지): %s", e)
+                return False
+            changed = restart_required(self.config, config)
+            if changed:
+                log.warning("재시작해야 반영되는 설정 변경은 무시: %s", ", ".join(changed))
+            try:
+                self.apply(config)
+            except Exception as e:
+                log.exception("설정 반영 오류: %s", e)
+                return False
+            self.config = config
+            self.reloads += 1
+            log.info("설정 다시 읽음: %s", self.path)
+            return True
+
+    def install(self, signum=None):
+        """
+        시그널(기본값 SIGHUP)을 받으면 reload() (메인 스레드에서 호출)
+
+            kill -HUP <pid>
+
+        시그널 핸들러는 메인 스레드가 로그 필터 락 등을 잡고 있는 중간에도 실행되므로,
+        핸들러에서는 다시 읽기 스레드만 띄우고 파일 읽기/로그/반영은 그 스레드에서 합니다.
+        """
+        signum = signum or getattr(signal, "SIGHUP", None)
+        if signum is None:
+            return False  # SIGHUP이 없는 플랫폼
+
+        def handler(*_):
+            threading.Thread(target=self.reload, name="config-reload", daemon=True).start()
+
+        signal.signal(signum, handler)
+        return True
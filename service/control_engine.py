@@ -0,0 +1,195 @@
+"""
+규칙 테이블 기반 제어 엔진
+
+히터/환기팬/물펌프/LED/CO2 서보 제어를 선언적인 규칙 테이블로 표현하고,
+모든 슬롯의 센서값과 프리셋을 열(column) 단위로 한 번에 평가합니다.
+
+- 규칙: 조건(측정항목, 비교, 임계값)들의 AND + 적용 시간대 + 우선순위
+- 액추에이터별로 조건을 만족한 규칙 중 우선순위가 가장 높은 규칙이 목표 상태를 결정
+- 만족한 규칙이 없으면 현재 상태 유지 (히스테리시스 구간)
+- 현재 상태와 다른 것만 변경 목록(diff)으로 반환
+"""
+import operator
+from collections import namedtuple
+from contextlib import ExitStack
+from datetime import datetime
+
+# 조건: (측정항목, 비교, 임계값)
+#   측정항목: 센서값(temp, humidity, light, soil, co2) 또는 상태값(blocked)
+#   임계값: Preset 속성 이름(str) 또는 숫자, 'present' 비교는 값이 있는지만 확인
+# hours: (시작, 끝) 시각, 끝이 작으면 자정을 넘김 (기본값 None = 항상)
+Rule = namedtuple('Rule', 'name actuator state priority conditions hours', defaults=(None,))
+
+_OPS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+}
+
+LED_HOURS = (8, 22)  # LED 작동 시간대 (8시~22시)
+
+
+def make_rules(led_hours=LED_HOURS):
+    """
+    기본 규칙 테이블 생성
+
+    Args:
+        led_hours: LED 작동 시간대 (시작, 끝) 시각 (설정 파일 control.led_hours)
+    """
+    return (
+        # 1. 히터 (온도 기반)
+        Rule('heater_cold', 'heater', True, 10, (('temp', '<', 'temp_low'),)),
+        Rule('heater_ok', 'heater', False, 10, (('temp', '>=', 'temp_low'),)),
+
+        # 2. 환기팬 - 온도 제어가 습도 제어보다 우선
+        Rule('fan_cold', 'fan', False, 20, (('temp', '<', 'temp_low'),)),
+        Rule('fan_hot', 'fan', True, 20, (('temp', '>', 'temp_high'),)),
+        Rule('fan_humid', 'fan', True, 10,
+             (('temp', '>=', 'temp_low'), ('temp', '<=', 'temp_high'), ('humidity', '>', 'humidity_high'))),
+        Rule('fan_dry', 'fan', False, 10,
+             (('temp', '>=', 'temp_low'), ('temp', '<=', 'temp_high'), ('humidity', '<', 'humidity_low'))),
+
+        # 3. 물펌프 (토양 수분 기반) - 물탱크 문제 시 강제 정지가 최우선
+        Rule('pump_block', 'pump', False, 30, (('soil', 'present', None), ('blocked', '==', True))),
+        Rule('pump_dry', 'pump', True, 10, (('soil', '>', 'soil_dry'), ('blocked', '==', False))),
+        Rule('pump_wet', 'pump', False, 10, (('soil', '<', 'soil_wet'), ('blocked', '==', False))),
+
+        # 4. LED (조도 기반 + 작동 시간대)
+        Rule('led_night', 'led', False, 20, (('light', 'present', None),), hours=(led_hours[1], led_hours[0])),
+        Rule('led_dark', 'led', True, 10, (('light', '<', 'light_low'),), hours=tuple(led_hours)),
+        Rule('led_bright', 'led', False, 10, (('light', '>', 'light_high'),), hours=tuple(led_hours)),
+
+        # 5. CO2 서보 (True: 카트리지 개방)
+        Rule('co2_low', 'co2_servo', True, 10, (('co2', '<', 'co2_release'),)),
+        Rule('co2_recovered', 'co2_servo', False, 10, (('co2', '>=', 'co2_recover'),)),
+    )
+
+
+DEFAULT_RULES = make_rules()
+
+
+ACTUATORS = ('heater', 'fan', 'pump', 'led', 'co2_servo')
+
+# 변경 항목: (슬롯 인덱스, 액추에이터, 목표 상태, 규칙 이름)
+Diff = namedtuple('Diff', 'index actuator state rule')
+
+
+def _in_hours(hour, hours):
+    start, end = hours
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+class ControlEngine:
+    """규칙 테이블을 모든 슬롯에 대해 한 번에 평가"""
+
+    def __init__(self, rules=DEFAULT_RULES):
+        # 액추에이터별로 우선순위 높은 순 정렬 (같으면 테이블 순서)
+        self.rules = tuple(rules)
+        self._by_actuator = {}
+        for rule in sorted(self.rules, key=lambda r: -r.priority):
+            self._by_actuator.setdefault(rule.actuator, []).append(rule)
+
+    def _match(self, rule, columns, presets, hour, n):
+        """규칙 조건을 모든 슬롯에 대해 평가 -> [bool] * n"""
+        if rule.hours is not None and not _in_hours(hour, rule.hours):
+            return [False] * n
+        matched = [True] * n
+        for metric, op, threshold in rule.conditions:
+            values = columns[metric]
+            if op == 'present':
+                matched = [m and v is not None for m, v in zip(matched, values)]
+                continue
+            compare = _OPS[op]
+            if isinstance(threshold, str):
+                limits = [getattr(p, threshold) for p in presets]
+            else:
+                limits = [threshold] * n
+            matched = [m and v is not None and compare(v, t) for m, v, t in zip(matched, values, limits)]
+        return matched
+
+    def evaluate(self, columns, presets, states, hour=None):
+        """
+        모든 슬롯 평가
+
+        Args:
+            columns: {측정항목: [슬롯별 값]} (temp, humidity, light, soil, co2, blocked)
+            presets: [슬롯별 Preset]
+            states: {액추에이터: [슬롯별 현재 상태, 액추에이터가 없으면 None]}
+            hour: 현재 시각(시), 기본값은 현재 시각
+
+        Returns:
+            list[Diff]: 현재 상태와 다른 목표 상태만
+        """
+        if hour is None:
+            hour = datetime.now().hour
+        n = len(presets)
+        diffs = []
+        for actuator, rules in self._by_actuator.items():
+            current = states.get(actuator, [None] * n)
+            decided = [None] * n  # 슬롯별로 결정한 규칙
+            for rule in rules:
+                if all(d is not None for d in decided):
+                    break
+                for i, hit in enumerate(self._match(rule, columns, presets, hour, n)):
+                    if hit and decided[i] is None:
+                        decided[i] = rule
+            for i, rule in enumerate(decided):
+                if rule is None or current[i] is None:
+                    continue  # 규칙 없음(상태 유지) 또는 액추에이터 없음
+                if current[i] != rule.state:
+                    diffs.append(Diff(i, actuator, rule.state, rule.name))
+        return diffs
+
+
+# 프로세스 공유 엔진 (기본 규칙)
+_engine = ControlEngine()
+
+
+def get_engine():
+    """기본 규칙 테이블 엔진 반환"""
+    return _engine
+
+
+def control_all(controllers, sensor_rows, presets, engine=None, hour=None):
+    """
+    여러 슬롯을 한 번에 평가하고 바뀐 액추에이터만 제어
+
+    Args:
+        controllers: [ActuatorController]
+        sensor_rows: [dict(temp, humidity, light, soil, co2)]
+        presets: [Preset]
+        engine: 사용할 ControlEngine (기본값: 공유 엔진)
+
+    Returns:
+        list[Diff]: 적용한 변경 목록
+    """
+    engine = engine or _engine
+    columns = {metric: [row.get(metric) for row in sensor_rows]
+               for metric in ('temp', 'humidity', 'light', 'soil', 'co2')}
+    # 물탱크 차단 여부는 토양 값이 있을 때만 확인
+    columns['blocked'] = [
+        c.water_monitor.should_block_watering() if soil is not None else False
+        for c, soil in zip(controllers, columns['soil'])
+    ]
+    states = {actuator: [c.get_state(actuator) for c in controllers] for actuator in ACTUATORS}
+
+    diffs = engine.evaluate(columns, presets, states, hour=hour)
+
+    # 이번 사이클의 GPIO 변경은 모아서 한 번에 씀 (출력 뱅크별)
+    with ExitStack() as stack:
+        banks = {id(b): b for b in (getattr(c, 'output_bank', None) for c in controllers) if b is not None}
+        for bank in banks.values():
+            stack.enter_context(bank.batch())
+
+        for diff in diffs:
+            controllers[diff.index].apply(diff.actuator, diff.state, diff.rule)
+
+        # PID 모드 슬롯은 히터를 규칙 테이블 대신 PID로 제어 (get_state('heater')가 None)
+        for i, controller in enumerate(controllers):
+            if controller.heater_pid is not None:
+                controller.control_heater_pid(columns['temp'][i], presets[i])
+    return diffs
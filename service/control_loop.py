@@ -0,0 +1,265 @@
+"""
+asyncio 기반 메인 제어 루프
+
+- 센서 읽기(초음파, 수위, 슬롯별 센서)는 스레드 풀에서 동시에 실행
+- 슬롯별 MQTT 전송은 각각의 태스크로, 액추에이터 제어는 모든 슬롯을 한 번에 평가
+- 주기는 절대 기한(deadline) 기준으로 잡아서 처리 시간만큼 밀리지 않음
+- 물받이 넘침은 주기와 상관없이 수위 센서 에지 콜백에서 바로 처리 (펌프 즉시 정지)
+- 프리셋이 바뀌면 다음 주기를 기다리지 않고 그 슬롯만 직전 센서값으로 바로 다시 제어
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from service.read_sensors import (read_slot_sensors, read_ultrasonic_sensor, read_water_tank_sensor,
+                                  init_water_tank_sensor, get_slot_sample_age)
+from service.control_engine import control_all
+from service.metrics import timer, increment
+from service.log import get_logger, fields
+
+log = get_logger("control_loop")
+
+
+class ControlLoop:
+    """디바이스 단위 센서 읽기 → 전송 → 제어 주기 실행"""
+
+    def __init__(self, slots, clients, controllers, water_monitor, sensor_pin_map, has_co2,
+                 interval=10, ultrasonic_pins=(23, 24), water_tank_pin=None, executor=None,
+                 publisher=None, metrics_reporter=None, device_serial=None, engine=None, on_first_cycle=None):
+        """
+        Args:
+            slots: 슬롯 번호 리스트
+            clients: {slot: MqttClient}
+            controllers: {slot: ActuatorController}
+            water_monitor: WaterTankMonitor (슬롯 공유)
+            sensor_pin_map: {slot: 센서 핀 설정}
+            has_co2: CO2 센서 사용 여부
+            interval: 주기 (초)
+            ultrasonic_pins: (TRIG, ECHO) 핀 번호
+            water_tank_pin: 물받이 수위 센서 핀
+            executor: 블로킹 작업용 스레드 풀 (없으면 생성, 넘겨받은 풀은 close()에서 닫지 않음)
+            publisher: DevicePublisher (있으면 슬롯별 전송 대신 주기당 1회 묶음 전송)
+            metrics_reporter: MetricsReporter (있으면 주기적으로 계측 통계 전송)
+            device_serial: 디바이스 시리얼 (게이트웨이 모드에서 디바이스별 센서 캐시 구분, 없으면 슬롯 번호만 사용)
+            engine: ControlEngine (없으면 기본 규칙 테이블, 설정 다시 읽기 시 교체 가능)
+            on_first_cycle: function() - 첫 주기가 끝나면 한 번 호출 (시작 시간 보고 등)
+        """
+        self.slots = list(slots)
+        self.clients = clients
+        self.controllers = controllers
+        self.water_monitor = water_monitor
+        self.sensor_pin_map = sensor_pin_map
+        self.has_co2 = has_co2
+        self.interval = interval
+        self.ultrasonic_pins = ultrasonic_pins
+        self.water_tank_pin = water_tank_pin
+        self.publisher = publisher
+        self.metrics_reporter = metrics_reporter
+        self.device_serial = device_serial
+        self.engine = engine
+        self.on_first_cycle = on_first_cycle
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=len(self.slots) + 2, thread_name_prefix="control"
+        )
+        self.running = False
+        self.cycle_count = 0
+        self.overruns = 0
+        self.reevaluations = 0  # 프리셋 변경으로 주기 밖에서 다시 제어한 횟수
+
+        # 프리셋 변경 즉시 재평가 (MQTT 스레드 → call_soon_threadsafe → 이벤트 루프)
+        self.last_readings = {}  # 슬롯 -> 직전 주기 센서값
+        self._loop = None  # run() 중인 이벤트 루프
+        # 주기 제어/재평가(스레드 풀)와 물받이 콜백(디바운스 타이머 스레드)이
+        # 물탱크 상태와 컨트롤러를 동시에 건드리지 않게
+        self._control_lock = threading.Lock()
+        self._reevaluate_pending = set()  # 재평가 대기 중인 슬롯 (연속 변경은 한 번으로 합침)
+        self._preset_listeners = {}
+        for slot, client in clients.items():
+            listener = functools.partial(self.on_preset_change, slot)
+            client.add_preset_listener(listener)
+            self._preset_listeners[slot] = listener
+
+        # 물받이 수위 변화는 다음 주기를 기다리지 않고 바로 반영
+        self.water_tank_sensor = None
+        if water_tank_pin is not None:
+            self.water_tank_sensor = init_water_tank_sensor(water_tank_pin)
+            self.water_tank_sensor.add_change_listener(self.on_water_tank_change)
+
+    @property
+    def control_lock(self):
+        """제어 락 (설정 반영처럼 루프 밖에서 제어 상태를 바꿀 때 잡음)"""
+        return self._control_lock
+
+    async def _call(self, func, *args, **kwargs):
+        """블로킹 함수를 스레드 풀에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def check_water_tanks(self):
+        """급수/물받이 탱크 센서를 동시에 읽고 상태 갱신"""
+        with timer("cycle.water_tanks"):
+            distance, water_tank_detected = await asyncio.gather(
+                self._call(read_ultrasonic_sensor, *self.ultrasonic_pins, device=self.device_serial),
+                self._call(read_water_tank_sensor, self.water_tank_pin),
+            )
+        supply_status, overflow_status, tank_summary = await self._call(
+            self._update_water_tanks, distance, water_tank_detected)
+        if tank_summary['alert_status'] != "정상":
+            await self._call(
+                self.water_monitor.mqtt_client.send_notification_logs,
+                f"[WARNING] [물탱크] 급수상태={supply_status}, 물받이상태={overflow_status}",
+            )
+            log.warning("물탱크 주의: 급수=%s, 물받이=%s", supply_status, overflow_status)
+
+    def _update_water_tanks(self, distance, water_detected):
+        """급수/물받이 상태 갱신 + 요약 (스레드 풀에서 제어 락을 잡고 실행)"""
+        with self._control_lock:
+            supply_status = self.water_monitor.check_supply_tank(distance)
+            overflow_status = self.water_monitor.check_overflow_tank(water_detected)
+            return supply_status, overflow_status, self.water_monitor.get_status_summary()
+
+    def on_water_tank_change(self, water_detected):
+        """
+        물받이 수위 변화 즉시 처리 (수위 센서 스레드에서 호출)
+
+        넘침이면 켜져 있는 물펌프를 바로 끄고, 이후 주기의 제어 엔진은 급수 차단 상태로 평가합니다.
+        """
+        with self._control_lock:
+            self.water_monitor.check_overflow_tank(water_detected)
+            if not self.water_monitor.should_block_watering():
+                return
+            for controller in self.controllers.values():
+                if controller.water_pump.is_on:
+                    controller.apply('pump', False, 'pump_block')
+                    increment("water_tank.pump_cutoffs")
+
+    def on_preset_change(self, slot, preset):
+        """프리셋 변경 알림 (MQTT 네트워크 스레드에서 호출) - 루프가 돌고 있으면 그 슬롯 재평가 예약"""
+        loop = self._loop
+        if loop is None or not self.running or loop.is_closed():
+            return  # 아직 시작 전이면 첫 주기에 반영
+        try:
+            loop.call_soon_threadsafe(self._schedule_reevaluate, slot)
+        except RuntimeError:
+            pass  # 종료 중인 루프
+
+    def _schedule_reevaluate(self, slot):
+        if slot in self._reevaluate_pending:
+            return
+        self._reevaluate_pending.add(slot)
+        asyncio.ensure_future(self.reevaluate_slot(slot))
+
+    async def reevaluate_slot(self, slot):
+        """한 슬롯만 직전 주기 센서값과 새 프리셋으로 다시 제어 (직전 값이 없으면 다음 주기에 반영)"""
+        self._reevaluate_pending.discard(slot)
+        readings = self.last_readings.get(slot)
+        if readings is None:
+            return
+        with timer("preset.reevaluate"):
+            await self.control_slots({slot: readings})
+        self.reevaluations += 1
+        increment("control.preset_reevaluations")
+        log.info("프리셋 변경 즉시 반영", extra=fields(slot=slot))
+
+    async def read_slot(self, slot):
+        """슬롯별 센서 읽기 (온도, 습도, 조도, 토양수분, CO2)"""
+        with timer("cycle.read_slot"):
+            return await self._call(read_slot_sensors, slot, self.sensor_pin_map[slot], has_co2=self.has_co2,
+                                    device=self.device_serial)
+
+    async def publish_slot(self, slot, readings):
+        """슬롯 센서 데이터 전송 (캐시 값의 경과 시간 포함)"""
+        age = get_slot_sample_age(slot, self.device_serial)
+        if self.publisher is not None:
+            self.publisher.add(slot, *readings, age=age)
+            return
+        with timer("cycle.publish_slot"):
+            await self._call(self.clients[slot].send_sensor_data, *readings, age=age)
+
+    async def control_slots(self, slot_readings):
+        """모든 슬롯 액추에이터 자동 제어 (규칙 테이블 일괄 평가 + 물탱크 안전 체크)"""
+        sensor_rows = []
+        for temp, hum, light_adc, soil_adc, co2 in slot_readings.values():
+            sensor_rows.append({
+                'temp': temp,
+                'humidity': hum,
+                'light': light_adc,
+                'soil': soil_adc,
+                'co2': co2
+            })
+        with timer("cycle.control"):
+            await self._call(self._control, list(slot_readings), sensor_rows)
+
+    def _control(self, slots, sensor_rows):
+        """제어 락을 잡고 프리셋 조회 + 일괄 제어 (스레드 풀에서 실행)"""
+        with self._control_lock:
+            controllers = [self.controllers[slot] for slot in slots]
+            presets = [self.clients[slot].get_preset() for slot in slots]
+            control_all(controllers, sensor_rows, presets, engine=self.engine)
+
+    async def run_cycle(self):
+        """1주기 실행: 모든 센서 동시 읽기 → 슬롯별 전송 + 일괄 제어 동시 실행"""
+        with timer("cycle"):
+            with timer("cycle.read"):
+                results = await asyncio.gather(
+                    self.check_water_tanks(),
+                    *(self.read_slot(slot) for slot in self.slots),
+                )
+            slot_readings = dict(zip(self.slots, results[1:]))
+            self.last_readings.update(slot_readings)
+
+            # 물탱크 상태가 갱신된 뒤에 제어 (급수 차단 판단에 필요)
+            with timer("cycle.publish_control"):
+                tasks = [self.publish_slot(slot, readings) for slot, readings in slot_readings.items()]
+                tasks.append(self.control_slots(slot_readings))
+                await asyncio.gather(*tasks)
+            if self.publisher is not None:
+                with timer("cycle.batch_flush"):
+                    await self._call(self.publisher.flush)
+        self.cycle_count += 1
+        increment("cycle.count")
+
+        if self.metrics_reporter is not None and self.metrics_reporter.due():
+            await self._call(self.metrics_reporter.publish)
+
+    async def run(self):
+        """절대 기한 기준으로 주기 반복 (stop() 호출 시 종료)"""
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self.running = True
+        deadline = loop.time()
+        while self.running:
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                log.exception("루프 오류: %s", e)
+            if self.on_first_cycle is not None:
+                callback, self.on_first_cycle = self.on_first_cycle, None
+                callback()
+
+            deadline += self.interval
+            now = loop.time()
+            if now > deadline:
+                # 주기를 넘긴 경우 밀린 주기는 건너뛰고 다음 기한에 맞춤
+                overrun = now - deadline
+                missed = int(overrun // self.interval) + 1
+                self.overruns += missed
+                increment("cycle.overruns", missed)
+                deadline += missed * self.interval
+                log.warning("주기 초과: %d주기 건너뜀", missed, extra=fields(value=round(overrun, 3)))
+            await asyncio.sleep(deadline - now)
+
+    def stop(self):
+        """루프 종료 요청 (현재 주기가 끝나면 종료)"""
+        self.running = False
+
+    def close(self):
+        """스레드 풀 정리, 수위 센서/프리셋 리스너 해제"""
+        for slot, listener in self._preset_listeners.items():
+            self.clients[slot].remove_preset_listener(listener)
+        self._preset_listeners.clear()
+        if self.water_tank_sensor is not None:
+            self.water_tank_sensor.remove_change_listener(self.on_water_tank_change)
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
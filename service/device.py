@@ -0,0 +1,264 @@
+"""
+스마트팜 디바이스 조립 (슬롯별 액추에이터 + MQTT 클라이언트 + 컨트롤러, 물탱크 모니터, 제어 루프)
+
+main.py(디바이스 1대)와 게이트웨이 모드(service/gateway.py, 디바이스 여러 대)가 같이 사용하며,
+설정은 service/config.py의 DeviceConfig로 받습니다.
+MQTT 연결, 센서 스케줄러, ADC 버스, CO2 리더는 프로세스 공유이고, 디바이스는 그 위에 슬롯만 붙입니다.
+
+시작 시 슬롯별 액추에이터/클라이언트/센서 초기화는 슬롯마다 스레드로 동시에 실행하고,
+고정 대기 대신 센서 첫 값(wait_sensors)과 프리셋 수신(wait_presets)을 기한까지만 기다립니다.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from mqtt.mqtt_client import MqttClient
+from mqtt.device_publisher import DevicePublisher
+from service.read_sensors import init_sensor_caches, init_ultrasonic_sensor, wait_sensor_caches, SENSOR_WARMUP_TIMEOUT
+from service.control_loop import ControlLoop
+from service.control_engine import ControlEngine, make_rules, LED_HOURS
+from service.actuator_control import ActuatorController
+from service.water_tank_monitor import WaterTankMonitor
+from Actuator.heater import Heater
+from Actuator.water_pump import WaterPump
+from Actuator.ventilation_fan import VentilationFan
+from Actuator.servomotor import ServoMotor
+from Actuator.led import LED
+
+
+def run_parallel(func, items):
+    """
+    items마다 func를 스레드에서 동시에 실행 (슬롯 초기화용)
+
+    Returns:
+        list: items 순서대로의 결과 (예외가 난 항목이 있으면 첫 예외를 그대로 전달)
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=len(items), thread_name_prefix="setup") as pool:
+        return list(pool.map(func, items))
+
+
+class FarmDevice:
+    """디바이스 1대 (공유 MQTT 연결 위의 슬롯 N개)"""
+
+    def __init__(self, config, connection):
+        """
+        Args:
+            config: DeviceConfig (시리얼, 슬롯별 핀 배치, 제어 튜닝값)
+            connection: 공유 MqttConnection
+        """
+        self.config = config
+        self.device_serial = config.serial
+        self.connection = connection
+        self.actuator_pin_map = config.actuator_pin_map
+        self.sensor_pin_map = config.sensor_pin_map
+        self.heater_mode_map = config.heater_mode_map
+        self.slots = config.slot_numbers
+        self.has_co2 = config.has_co2
+        self.interval = config.interval
+        self.ultrasonic_pins = config.ultrasonic_pins
+        self.water_tank_pin = config.water_tank_pin
+        self.engine = None  # None이면 기본 규칙 테이블 (LED 시간대가 기본값과 다를 때만 생성)
+
+        self.clients = {}
+        self.controllers = {}
+        self.actuators = {}  # cleanup 용도
+        self.water_monitor = None
+        self.loop = None
+
+    def _preset_callback(self, slot):
+        """슬롯별 프리셋 업데이트 콜백 생성 (클로저)"""
+        farm_uid = f"{self.device_serial}:{slot}"
+
+        def on_preset_updated(new_preset):
+            timestamp = time.strftime("%H:%M:%S")
+            print(f"\n🔄 [{timestamp}] 슬롯 {farm_uid} 프리셋 실시간 업데이트!")
+            print(f"   🌡️  온도: {new_preset.get('OptimalTemp')}°C")
+            print(f"   💧 습도: {new_preset.get('OptimalHumidity')}%")
+            print(f"   💡 조도: {new_preset.get('LightIntensity')} lux")
+            print(f"   🌱 토양: {new_preset.get('SoilMoisture')} ADC")
+            print(f"   🌫️  CO2: {new_preset.get('Co2Level')} ppm")
+            print(f"   ✅ 제어에 바로 반영됩니다.\n")
+        return on_preset_updated
+
+    def _setup_slot(self, slot):
+        """슬롯 1개의 액추에이터와 MQTT 클라이언트 생성 (슬롯별 스레드에서 동시에 호출)"""
+        act_pins = self.actuator_pin_map[slot]
+
+        # 액추에이터 초기화 (정리 대상은 만들자마자 등록 - 다른 슬롯이 실패해도 정리됨)
+        actuator_set = self.actuators[slot] = {'servo': None}
+        actuator_set['heater'] = Heater(act_pins['heater'])
+        actuator_set['water_pump'] = WaterPump(act_pins['water_ib1'], act_pins['water_ib2'])
+        actuator_set['ventilation_fan'] = VentilationFan(act_pins['fan'])
+        actuator_set['led'] = LED(act_pins['led'])
+        if act_pins.get('servo') is not None:
+            actuator_set['servo'] = ServoMotor(act_pins['servo'])
+
+        # MQTT 클라이언트 초기화 (공유 연결 사용, 프리셋 실시간 변경 콜백 등록)
+        client = MqttClient(f"{self.device_serial}:{slot}", connection=self.connection)
+        client.set_preset_update_callback(self._preset_callback(slot))
+        self.clients[slot] = client
+
+    def _print_slot(self, slot):
+        act_pins = self.actuator_pin_map[slot]
+        sens_pins = self.sensor_pin_map[slot]
+        print(f"\n  슬롯 {slot} ({self.device_serial}:{slot})")
+        print(f"    🔥 히터: GPIO {act_pins['heater']} ({self.heater_mode_map.get(slot, 'bangbang')})")
+        print(f"    💧 물펌프: GPIO {act_pins['water_ib1']}/{act_pins['water_ib2']}")
+        print(f"    🌀 환기팬: GPIO {act_pins['fan']}")
+        print(f"    led: GPIO {act_pins['led']}")
+        print(f"    🌡️  DHT11: GPIO {sens_pins['dht11_pin']}")
+        print(f"    💡 조도센서: 채널 {sens_pins['photo_channel']}")
+        print(f"    🌱 토양센서: 채널 {sens_pins['soil_channel']}")
+        print(f"    🌫️  CO2센서: {sens_pins.get('co2_port') if self.has_co2 else '없음(일반형)'}")
+        if act_pins.get('servo') is not None:
+            print(f"    🫧 CO2 서보: GPIO {act_pins['servo']}")
+
+    def setup(self):
+        """슬롯별 액추에이터, MQTT 클라이언트(슬롯별 동시 생성), 컨트롤러, 물탱크 모니터 생성"""
+        run_parallel(self._setup_slot, self.slots)
+        for slot in self.slots:
+            self._print_slot(slot)
+
+        # 물탱크 모니터 초기화 (디바이스 단위로 1개 - 첫 번째 슬롯의 MQTT 클라이언트로 알림 전송)
+        self.water_monitor = WaterTankMonitor(self.clients[self.slots[0]], self.device_serial,
+                                              config=self.config.water_tank)
+        print(f"\n  💧 물탱크 모니터 초기화 완료")
+        print(f"    - 급수탱크: 초음파 센서 (GPIO {self.ultrasonic_pins[0]}/{self.ultrasonic_pins[1]})")
+        print(f"    - 물받이탱크: 워터 센서 (GPIO {self.water_tank_pin})")
+
+        # 컨트롤러 (CO2 서보 원위치 명령은 서보 작업 스레드에서 처리되므로 기다리지 않음)
+        for slot in self.slots:
+            actuator_set = self.actuators[slot]
+            self.controllers[slot] = ActuatorController(
+                actuator_set['heater'], actuator_set['water_pump'], actuator_set['ventilation_fan'],
+                actuator_set['led'], self.water_monitor, co2_servo=actuator_set['servo'],
+                temp_mode=self.heater_mode_map.get(slot, "bangbang"), slot=slot, device=self.device_serial,
+            )
+
+        self.apply_config(self.config)
+
+    def apply_config(self, config):
+        """
+        제어 튜닝값 반영 (시작 시, 설정 다시 읽기 시 - 스레드/버스/핀은 그대로)
+
+        주기, 물탱크 임계값/쿨다운, 프리셋 여유값, LED 시간대, CO2 서보 각도만 바꿉니다.
+        제어 루프가 있으면 그 제어 락을 잡고 바꿔서, 스레드 풀에서 도는 제어와 겹치지 않게 합니다.
+        """
+        control = config.control
+        if tuple(control.led_hours) == LED_HOURS:
+            engine = None
+        else:
+            engine = ControlEngine(make_rules(control.led_hours))
+        with self.loop.control_lock if self.loop is not None else nullcontext():
+            self.config = config
+            self.interval = config.interval
+            self.water_monitor.configure(config.water_tank)
+            for client in self.clients.values():
+                client.set_margins(control.margins)
+            for controller in self.controllers.values():
+                controller.co2_release_angle = control.co2_release_angle
+                controller.co2_idle_angle = control.co2_idle_angle
+            self.engine = engine
+            if self.loop is not None:
+                self.loop.interval = config.interval
+                self.loop.engine = engine
+
+    def start_sensors(self):
+        """센서 캐시 초기화 (DHT11, CO2, 초음파 - 슬롯별 동시 생성, 공유 스케줄러 스레드에 등록)"""
+        run_parallel(
+            lambda slot: init_sensor_caches(slot, self.sensor_pin_map[slot], has_co2=self.has_co2,
+                                            device=self.device_serial),
+            self.slots,
+        )
+        init_ultrasonic_sensor(*self.ultrasonic_pins)
+
+    def wait_sensors(self, timeout=SENSOR_WARMUP_TIMEOUT):
+        """
+        모든 슬롯 캐시 센서의 첫 값 대기 (고정 워밍업 대기 대신)
+
+        Returns:
+            list: 기한 안에 값을 받지 못한 센서 (모두 준비되면 빈 리스트)
+        """
+        return wait_sensor_caches(self.slots, timeout, device=self.device_serial)
+
+    def request_presets(self):
+        """DB 서버에 모든 슬롯 프리셋 요청"""
+        for slot in self.slots:
+            self.clients[slot].request_preset()
+
+    def presets_ready(self):
+        """모든 슬롯의 프리셋 수신 여부"""
+        return all(self.clients[slot].is_preset_ready() for slot in self.slots)
+
+    def wait_presets(self, timeout=10.0):
+        """
+        모든 슬롯 프리셋 응답 대기 (슬롯별 수신 이벤트, 받는 즉시 반환)
+
+        Returns:
+            bool: 제한 시간 안에 모두 받았는지
+        """
+        deadline = time.monotonic() + timeout
+        return all([self.clients[slot].wait_preset(max(deadline - time.monotonic(), 0.0)) for slot in self.slots])
+
+    def print_presets(self):
+        """슬롯별 현재 프리셋 출력"""
+        for slot in self.slots:
+            client = self.clients[slot]
+            if client.is_preset_ready():
+                preset = client.get_preset()
+                print(f"\n  슬롯 {client.farm_uid}")
+                print(f"    온도: {preset.get('OptimalTemp')}°C")
+                print(f"    습도: {preset.get('OptimalHumidity')}%")
+                print(f"    조도: {preset.get('LightIntensity')} lux")
+                print(f"    토양: {preset.get('SoilMoisture')} ADC")
+                print(f"    CO2: {preset.get('Co2Level')} ppm")
+            else:
+                print(f"\n  슬롯 {client.farm_uid}: 기본값으로 동작")
+
+    def create_loop(self, executor=None, metrics_reporter=None, on_first_cycle=None):
+        """
+        제어 루프 생성
+
+        Args:
+            executor: 공유 스레드 풀 (게이트웨이 모드, 없으면 루프 전용 풀 생성)
+            metrics_reporter: MetricsReporter (옵션)
+            on_first_cycle: function() - 첫 주기가 끝나면 호출 (시작 시간 보고)
+        """
+        publisher = None
+        if self.config.batch_publish:
+            publisher = DevicePublisher(self.clients[self.slots[0]], self.device_serial,
+                                        encoding=self.config.payload_encoding)
+        self.loop = ControlLoop(
+            self.slots, self.clients, self.controllers, self.water_monitor, self.sensor_pin_map, self.has_co2,
+            interval=self.interval,
+            ultrasonic_pins=self.ultrasonic_pins,
+            water_tank_pin=self.water_tank_pin,
+            executor=executor,
+            publisher=publisher,
+            metrics_reporter=metrics_reporter,
+            device_serial=self.device_serial,
+            engine=self.engine,
+            on_first_cycle=on_first_cycle,
+        )
+        return self.loop
+
+    def close_clients(self):
+        """슬롯 MQTT 클라이언트 정리 (공유 연결은 닫지 않음)"""
+        if self.loop is not None:
+            self.loop.close()
+            self.loop = None
+        for client in self.clients.values():
+            client.close()
+
+    def cleanup_actuators(self):
+        """모든 액추에이터 정지 및 핀 정리"""
+        for slot, actuator_set in self.actuators.items():
+            if slot in self.controllers:
+                self.controllers[slot].stop_all()
+            # 초기화 중 실패한 슬롯은 만들어진 액추에이터만 있음
+            for name in ('heater', 'water_pump', 'ventilation_fan', 'led', 'servo'):
+                actuator = actuator_set.get(name)
+                if actuator is not None:
+                    actuator.cleanup()
@@ -0,0 +1,166 @@
+"""
+게이트웨이 모드 (프로세스 하나로 디바이스 여러 대 실행)
+
+보드마다 프로세스를 따로 띄우면 디바이스마다 MQTT 연결, 센서 스케줄러 스레드, ADC 버스, CO2 리더,
+제어 스레드 풀이 하나씩 생깁니다. 게이트웨이는 이것들을 모두 공유하고 디바이스는 슬롯만 붙입니다.
+- MQTT 연결: 브로커별 1개 (디바이스/슬롯은 토픽으로 구분)
+- 센서 스케줄러, ADC 버스(칩 선택 핀별), CO2 리더, GPIO 출력 뱅크: 프로세스 공유
+- 제어 루프: 디바이스별 ControlLoop, 같은 이벤트 루프와 스레드 풀에서 시작 시점을 나눠 실행
+  (디바이스끼리 제어가 겹쳐도 출력 뱅크 batch()는 스레드별이라 서로의 변경을 버리지 않음)
+
+설정 파일 형식은 service/config.py와 smartfarm.example.toml 참고 (디바이스 목록 [[devices]]).
+디바이스의 "broker"/"port"/"interval"/water_tank/control이 없으면 파일 최상위 값을 사용합니다.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from mqtt.mqtt_connection import MqttConnection
+from mqtt.offline_queue import OfflineQueue
+from service.config import DEFAULT_PORT
+from service.device import FarmDevice
+from service.read_sensors import stop_sensor_caches, SENSOR_WARMUP_TIMEOUT
+from service.metrics import MetricsReporter
+from service.log import get_logger, fields
+
+log = get_logger("gateway")
+
+MAX_WORKERS = 32  # 공유 제어 스레드 풀 최대 크기
+
+
+class Gateway:
+    """디바이스 여러 대를 공유 연결/스케줄러/스레드 풀 위에서 실행"""
+
+    def __init__(self, config):
+        """
+        Args:
+            config: FarmConfig (service/config.py)
+        """
+        self.config = config
+        self.gateway_id = config.gateway_id
+        self.connections = {}  # (브로커, 포트) -> MqttConnection
+        self.offline_queue = None
+        self.devices = []
+        self.loops = []
+        self.executor = None
+        self.metrics_reporter = None
+
+    def connection(self, broker, port=DEFAULT_PORT):
+        """브로커별 공유 MQTT 연결 (오프라인 대기열은 기본 브로커 연결에만)"""
+        key = (broker, port)
+        connection = self.connections.get(key)
+        if connection is None:
+            offline_queue = None
+            if key == (self.config.broker, self.config.port):
+                if self.config.offline_queue and self.offline_queue is None:
+                    self.offline_queue = OfflineQueue(self.config.offline_queue,
+                                                      max_messages=self.config.offline_queue_max_messages)
+                offline_queue = self.offline_queue
+            connection = MqttConnection(broker, port=port, offline_queue=offline_queue)
+            self.connections[key] = connection
+        return connection
+
+    def setup(self):
+        """디바이스 생성, 슬롯 초기화, 센서 캐시 시작"""
+        for device_config in self.config.devices:
+            print(f"\n🔧 디바이스 {device_config.serial} 초기화 중...")
+            device = FarmDevice(device_config, self.connection(device_config.broker, device_config.port))
+            self.devices.append(device)
+            device.setup()
+        for device in self.devices:
+            device.start_sensors()
+        log.info("디바이스 %d대, 슬롯 %d개 초기화", len(self.devices), self.slot_count(),
+                 extra=fields(device=self.gateway_id))
+
+    def slot_count(self):
+        return sum(len(device.slots) for device in self.devices)
+
+    def enable_metrics_reporter(self, interval=60):
+        """계측 통계를 smartfarm/{gateway_id}/metrics 로 전송 (기본 브로커 연결)"""
+        connection = self.connection(self.config.broker, self.config.port)
+        self.metrics_reporter = MetricsReporter(connection, self.gateway_id, interval=interval)
+        return self.metrics_reporter
+
+    def request_presets(self):
+        for device in self.devices:
+            device.request_presets()
+
+    def wait_sensors(self, timeout=SENSOR_WARMUP_TIMEOUT):
+        """
+        모든 디바이스 캐시 센서의 첫 값 대기 (디바이스가 같은 기한을 공유)
+
+        Returns:
+            list: 기한 안에 값을 받지 못한 센서
+        """
+        deadline = time.monotonic() + timeout
+        pending = []
+        for device in self.devices:
+            pending += device.wait_sensors(max(deadline - time.monotonic(), 0.0))
+        return pending
+
+    def wait_presets(self, timeout=10.0):
+        """
+        모든 디바이스 프리셋 응답 대기 (받는 즉시 반환)
+
+        Returns:
+            bool: 제한 시간 안에 모두 받았는지
+        """
+        deadline = time.monotonic() + timeout
+        return all([device.wait_presets(max(deadline - time.monotonic(), 0.0)) for device in self.devices])
+
+    def create_loops(self, on_first_cycle=None):
+        """
+        디바이스별 제어 루프 생성 (공유 스레드 풀, 계측 전송은 첫 번째 디바이스 루프에서)
+
+        Args:
+            on_first_cycle: function() - 첫 번째 디바이스의 첫 주기가 끝나면 호출 (시작 시간 보고)
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers=min(MAX_WORKERS, self.slot_count() + 2 * len(self.devices)),
+            thread_name_prefix="gateway",
+        )
+        self.loops = []
+        for i, device in enumerate(self.devices):
+            first = i == 0
+            self.loops.append(device.create_loop(executor=self.executor,
+                                                 metrics_reporter=self.metrics_reporter if first else None,
+                                                 on_first_cycle=on_first_cycle if first else None))
+        return self.loops
+
+    async def run(self):
+        """모든 디바이스 제어 루프 실행 (주기 시작 시점을 디바이스 수만큼 나눠 부하 분산)"""
+        if not self.loops:
+            self.create_loops()
+
+        async def run_staggered(index, control_loop):
+            await asyncio.sleep(control_loop.interval * index / len(self.loops))
+            await control_loop.run()
+
+        await asyncio.gather(*(run_staggered(i, loop) for i, loop in enumerate(self.loops)))
+
+    def apply_config(self, config):
+        """
+        다시 읽은 설정의 제어 튜닝값 반영 (ConfigReloader에서 호출)
+
+        디바이스는 시리얼로 찾고, 새 설정에 없는 디바이스는 그대로 둡니다.
+        """
+        for device in self.devices:
+            device_config = config.device(device.device_serial)
+            if device_config is not None:
+                device.apply_config(device_config)
+
+    def stop(self):
+        """모든 제어 루프 종료 요청"""
+        for control_loop in self.loops:
+            control_loop.stop()
+
+    def close(self):
+        """MQTT 연결, 센서 캐시, 액추에이터, 스레드 풀 정리"""
+        for device in self.devices:
+            device.close_clients()
+        for connection in self.connections.values():
+            connection.close()
+        stop_sensor_caches()
+        for device in self.devices:
+            device.cleanup_actuators()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
@@ -0,0 +1,219 @@
+"""
+스마트팜 로깅 (레벨, 반복 억제, 비동기 버퍼, 구조화 필드)
+
+주기마다 반복되는 print() 대신 표준 logging을 사용합니다.
+- 레벨: 주기별 센서값은 DEBUG, 액추에이터 상태 변경은 INFO, 센서 실패/물탱크 경고는 WARNING
+- 반복 억제: 같은 메시지(로거 + 형식 문자열 + 레벨 + 슬롯/센서/액추에이터/디바이스/탱크)는
+  rate_limit초에 한 번만 기록하고, 생략한 횟수를 붙임
+- 비동기: 호출 스레드는 큐에 넣기만 하고, 별도 스레드가 파일(회전)/RAM 링 버퍼/콘솔에 씀
+- 구조화 필드: extra={'slot': 1, 'sensor': 'DHT11', 'value': 24.0} -> "... slot=1 sensor=DHT11 value=24.0"
+- install_dump_signal(): SIGUSR2를 받으면 RAM 링 버퍼 내용을 표준 에러로 출력
+
+    from service.log import get_logger
+    log = get_logger("read_sensors")
+    log.debug("DHT11 온도", extra=fields(slot=1, sensor="DHT11", value=24.0))
+
+configure_logging()을 부르기 전에는 표준 logging 기본 동작(WARNING 이상만 stderr)을 따릅니다.
+"""
+import logging
+import logging.handlers
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from collections import deque
+
+ROOT_LOGGER = "smartfarm"
+
+# 구조화 필드 (LogRecord 속성으로 붙음)
+FIELD_NAMES = ('slot', 'sensor', 'actuator', 'value', 'topic', 'device', 'tank', 'status', 'rule')
+
+# 반복 억제 키에 넣는 필드 (값이 다르면 다른 메시지)
+RATE_LIMIT_KEY_FIELDS = ('slot', 'sensor', 'actuator', 'device', 'tank')
+
+DEFAULT_FORMAT = "%(asctime)s %(levelname).1s %(name)s: %(message)s%(fields)s"
+
+# 출력 방식
+SINK_RAM = "ram"  # RAM 링 버퍼 (SD 카드 쓰기 없음, dump_ring()으로 확인)
+SINK_FILE = "file"  # 회전 파일
+SINK_CONSOLE = "console"  # 표준 에러 (개발용)
+
+
+def get_logger(name):
+    """smartfarm.<name> 로거"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def fields(**values):
+    """구조화 필드 extra dict (None 값 제외)"""
+    return {k: v for k, v in values.items() if v is not None}
+
+
+class FieldFormatter(logging.Formatter):
+    """메시지 뒤에 구조화 필드를 key=value로 붙이는 포매터"""
+
+    def format(self, record):
+        parts = []
+        for name in FIELD_NAMES:
+            value = getattr(record, name, None)
+            if value is not None:
+                parts.append(f"{name}={value}")
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            parts.append(f"repeated={suppressed}")
+        record.fields = (" " + " ".join(parts)) if parts else ""
+        return super().format(record)
+
+
+class RateLimitFilter(logging.Filter):
+    """같은 메시지 반복 억제 (interval초에 한 번, 생략 횟수는 다음 기록에 표시)"""
+
+    def __init__(self, interval=60.0, min_level=logging.DEBUG, max_keys=1024):
+        """
+        Args:
+            interval: 같은 메시지를 다시 기록하기까지 최소 간격 (초)
+            min_level: 이 레벨 이상에만 적용 (ERROR를 넘기면 ERROR 이상은 항상 기록 안 함 -> 보통 DEBUG)
+            max_keys: 기억할 메시지 종류 수 (넘으면 오래된 것부터 잊음)
+        """
+        super().__init__()
+        self.interval = interval
+        self.min_level = min_level
+        self.max_keys = max_keys
+        self._last = {}  # 키 -> (마지막 기록 시각, 생략 횟수)
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.interval <= 0 or record.levelno < self.min_level:
+            return True
+        # 형식 문자열 기준 (값이 바뀌어도 같은 메시지로 취급), 슬롯/센서/액추에이터 등이 다르면 다른 메시지
+        key = (record.name, record.levelno, record.msg,
+               *(getattr(record, name, None) for name in RATE_LIMIT_KEY_FIELDS))
+        now = time.monotonic()
+        with self._lock:
+            last = self._last.get(key)
+            if last is not None and now - last[0] < self.interval:
+                self._last[key] = (last[0], last[1] + 1)
+                return False
+            record.suppressed = last[1] if last is not None else 0
+            self._last.pop(key, None)
+            self._last[key] = (now, 0)
+            if len(self._last) > self.max_keys:
+                del self._last[next(iter(self._last))]
+        return True
+
+
+class RingBufferHandler(logging.Handler):
+    """최근 로그를 RAM에 보관 (SD 카드 쓰기 없음)"""
+
+    def __init__(self, capacity=2000):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def lines(self):
+        return list(self.records)
+
+
+class _Logging:
+    """configure_logging() 상태"""
+    listener = None
+    ring = None
+    queue_handler = None
+
+
+_state = _Logging()
+
+
+def configure_logging(level=None, sink=None, path=None, max_bytes=1024 * 1024, backups=3,
+                      ring_size=2000, rate_limit=60.0, console_level=logging.WARNING):
+    """
+    로깅 설정 (프로그램 시작 시 한 번)
+
+    Args:
+        level: 기록 레벨 (기본값: 환경변수 SMARTFARM_LOG_LEVEL 또는 INFO)
+        sink: "ram", "file", "console" (기본값: 환경변수 SMARTFARM_LOG_SINK 또는 "ram")
+        path: 파일 경로 (sink="file")
+        max_bytes, backups: 회전 파일 크기/개수
+        ring_size: RAM 링 버퍼 줄 수 (sink="ram")
+        rate_limit: 같은 메시지 반복 억제 간격 (초), 0이면 억제 안 함
+        console_level: 이 레벨 이상은 sink와 상관없이 표준 에러에도 출력 (None이면 안 함)
+    """
+    shutdown_logging()
+    level = level or os.environ.get("SMARTFARM_LOG_LEVEL", "INFO")
+    sink = sink or os.environ.get("SMARTFARM_LOG_SINK", SINK_RAM)
+    formatter = FieldFormatter(DEFAULT_FORMAT, datefmt="%H:%M:%S")
+
+    handlers = []
+    if sink == SINK_FILE:
+        path = path or os.environ.get("SMARTFARM_LOG_PATH", "smartfarm.log")
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                       encoding="utf-8", delay=True)
+        handlers.append(handler)
+    elif sink == SINK_CONSOLE:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    else:
+        _state.ring = RingBufferHandler(ring_size)
+        handlers.append(_state.ring)
+    if console_level is not None and sink != SINK_CONSOLE:
+        console = logging.StreamHandler(sys.stderr)
+        console.setLevel(console_level)
+        handlers.append(console)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # 호출 스레드는 큐에 넣기만 하고, 리스너 스레드가 실제로 씀
+    log_queue = queue.SimpleQueue()
+    _state.queue_handler = logging.handlers.QueueHandler(log_queue)
+    _state.queue_handler.addFilter(RateLimitFilter(rate_limit))
+    _state.listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _state.listener.start()
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    root.addHandler(_state.queue_handler)
+    root.propagate = False
+    return root
+
+
+def shutdown_logging():
+    """남은 로그를 모두 쓰고 리스너 종료"""
+    root = logging.getLogger(ROOT_LOGGER)
+    if _state.queue_handler is not None:
+        root.removeHandler(_state.queue_handler)
+        _state.queue_handler = None
+    if _state.listener is not None:
+        _state.listener.stop()
+        _state.listener = None
+    root.propagate = True
+
+
+def dump_ring(stream=None):
+    """RAM 링 버퍼 내용 출력 (sink="ram"일 때)"""
+    stream = stream or sys.stderr
+    if _state.ring is None:
+        return 0
+    lines = _state.ring.lines()
+    for line in lines:
+        stream.write(line + "\n")
+    stream.flush()
+    return len(lines)
+
+
+def install_dump_signal(signum=None):
+    """
+    시그널(기본값 SIGUSR2)을 받으면 RAM 링 버퍼 출력 (메인 스레드에서 호출)
+
+        kill -USR2 <pid>
+    """
+    signum = signum or getattr(signal, "SIGUSR2", None)
+    if signum is None:
+        return False  # SIGUSR2가 없는 플랫폼
+    signal.signal(signum, lambda *_: dump_ring())
+    return True
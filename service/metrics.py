@@ -0,0 +1,261 @@
+"""
+제어 주기 계측 (고정 버킷 히스토그램)
+
+주기의 각 단계와 센서 read() 시간을 time.perf_counter()로 재서 고정 버킷 히스토그램에 누적합니다.
+꺼져 있으면 timer()는 아무것도 하지 않는 공용 객체를 돌려주므로 비용이 거의 없습니다.
+
+    with timer("cycle.read_slots"):
+        ...
+
+    @timed("sensor.ultrasonic.read")
+    def read(...): ...
+
+- MetricsReporter: smartfarm/{device}/metrics 토픽으로 주기적으로 JSON 전송
+- install_dump_signal(): SIGUSR1을 받으면 현재 통계를 표준 에러로 출력
+"""
+import functools
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+# 히스토그램 버킷 상한 (ms) - 마지막 버킷은 그 이상 전부
+BUCKET_BOUNDS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """고정 버킷 지연 히스토그램 (ms)"""
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, ms):
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if self.min is None or ms < self.min:
+            self.min = ms
+        if self.max is None or ms > self.max:
+            self.max = ms
+
+    def percentile(self, pct):
+        """버킷 상한 기준 백분위수 추정 (ms), 마지막 버킷이면 최대값"""
+        if not self.count:
+            return None
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return BUCKET_BOUNDS_MS[i] if i < len(BUCKET_BOUNDS_MS) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 3) if self.count else None,
+            'min_ms': None if self.min is None else round(self.min, 3),
+            'max_ms': None if self.max is None else round(self.max, 3),
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'buckets': self.counts[:],
+        }
+
+
+class MetricsRegistry:
+    """히스토그램/카운터/게이지 저장소 (스레드 안전)"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.monotonic()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}  # 이름 -> function() (스냅샷 시점에 호출)
+        self._lock = threading.Lock()
+
+    def observe(self, name, ms):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    def increment(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def register_gauge(self, name, func):
+        """스냅샷 때 읽을 값 등록 (예: GPIO 쓰기 횟수, 대기열 길이)"""
+        with self._lock:
+            self._gauges[name] = func
+
+    def unregister_gauge(self, name):
+        with self._lock:
+            self._gauges.pop(name, None)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = time.monotonic()
+
+    def snapshot(self):
+        """현재 통계 (JSON 변환 가능한 dict)"""
+        with self._lock:
+            histograms = {name: h.to_dict() for name, h in sorted(self._histograms.items())}
+            counters = dict(sorted(self._counters.items()))
+            gauges = list(self._gauges.items())
+        gauge_values = {}
+        for name, func in gauges:
+            try:
+                gauge_values[name] = func()
+            except Exception as e:
+                gauge_values[name] = f"error: {e}"
+        return {
+            'uptime_s': round(time.monotonic() - self.started, 1),
+            'bucket_bounds_ms': list(BUCKET_BOUNDS_MS),
+            'timers': histograms,
+            'counters': counters,
+            'gauges': gauge_values,
+        }
+
+
+# 프로세스 공유 저장소 (SMARTFARM_METRICS=1 이면 시작부터 켜짐)
+_registry = MetricsRegistry(enabled=os.environ.get("SMARTFARM_METRICS", "0") == "1")
+
+
+def get_registry():
+    return _registry
+
+
+def enable_metrics(enabled=True):
+    """계측 켜기/끄기"""
+    _registry.enabled = enabled
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _registry.observe(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """구간 시간 측정 컨텍스트 매니저 (꺼져 있으면 아무것도 하지 않음)"""
+    if not _registry.enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def timed(name):
+    """함수 실행 시간 측정 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _registry.observe(name, (time.perf_counter() - start) * 1000.0)
+        return wrapper
+    return decorator
+
+
+def increment(name, n=1):
+    """카운터 증가 (꺼져 있으면 무시)"""
+    _registry.increment(name, n)
+
+
+def register_gauge(name, func):
+    _registry.register_gauge(name, func)
+
+
+def snapshot():
+    return _registry.snapshot()
+
+
+class MetricsReporter:
+    """주기적으로 smartfarm/{device}/metrics 토픽에 통계 전송"""
+
+    def __init__(self, connection, device_serial, interval=60.0):
+        """
+        Args:
+            connection: MqttConnection
+            device_serial: 디바이스 시리얼 번호
+            interval: 전송 주기 (초)
+        """
+        self.connection = connection
+        self.topic = f"smartfarm/{device_serial}/metrics"
+        self.interval = interval
+        self._last = time.monotonic()
+
+    def due(self, now=None):
+        """전송할 때가 됐는지"""
+        now = time.monotonic() if now is None else now
+        return now - self._last >= self.interval
+
+    def publish(self):
+        """현재 통계 전송"""
+        self._last = time.monotonic()
+        payload = json.dumps(snapshot(), separators=(',', ':'))
+        return self.connection.publish(self.topic, payload, qos=0)
+
+
+def dump(stream=None):
+    """현재 통계를 JSON으로 출력"""
+    stream = stream or sys.stderr
+    stream.write(json.dumps(snapshot(), indent=2, ensure_ascii=False) + "\n")
+    stream.flush()
+
+
+def install_dump_signal(signum=None, stream=None):
+    """
+    시그널(기본값 SIGUSR1)을 받으면 통계 출력 (메인 스레드에서 호출)
+
+        kill -USR1 <pid>
+
+    시그널 핸들러는 메인 스레드가 저장소 락을 잡고 있는 중간(timer 종료 등)에도 실행되므로,
+    핸들러에서는 출력 스레드만 띄우고 락은 그 스레드가 잡습니다 (같은 스레드에서 다시 잡으면 교착).
+    """
+    signum = signum or getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        return False  # SIGUSR1이 없는 플랫폼
+
+    def handler(*_):
+        threading.Thread(target=dump, args=(stream,), name="metrics-dump", daemon=True).start()
+
+    signal.signal(signum, handler)
+    return True
@@ -0,0 +1,128 @@
+"""
+PID 온도 제어 + 시간 비례(슬로우 PWM) 출력
+
+히터 릴레이는 ON/OFF만 가능하므로 PID 출력(0~1)을 일정 주기(window) 안의
+ON 시간 비율로 바꿔서 제어합니다.
+- 적분 누적 제한(anti-windup): 출력이 포화된 방향으로는 적분하지 않음
+- 최소 ON/OFF 시간: 릴레이가 너무 자주 바뀌지 않도록 보장
+"""
+import time
+
+
+class PIDController:
+    """PID 제어기 (출력 0~1)"""
+
+    def __init__(self, kp=0.3, ki=0.002, kd=0.0, output_limits=(0.0, 1.0)):
+        """
+        Args:
+            kp: 비례 이득 (1도 오차당 출력)
+            ki: 적분 이득 (1도·초당 출력)
+            kd: 미분 이득 (초당 1도 변화당 출력, 측정값 기준)
+            output_limits: (최소, 최대) 출력
+        """
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_min, self.output_max = output_limits
+        self.reset()
+
+    def reset(self):
+        """누적 상태 초기화"""
+        self.integral = 0.0
+        self.last_measurement = None
+        self.last_time = None
+        self.output = 0.0
+
+    def update(self, setpoint, measurement, now=None):
+        """
+        제어 출력 계산
+
+        Args:
+            setpoint: 목표 온도
+            measurement: 현재 온도
+            now: 현재 시각 (기본값: time.monotonic())
+
+        Returns:
+            float: 출력 (output_min ~ output_max)
+        """
+        if now is None:
+            now = time.monotonic()
+        error = setpoint - measurement
+        dt = 0.0 if self.last_time is None else max(now - self.last_time, 0.0)
+
+        # 미분은 측정값 기준 (목표값 변경 시 출력 급변 방지)
+        derivative = 0.0
+        if dt > 0 and self.last_measurement is not None:
+            derivative = -(measurement - self.last_measurement) / dt
+
+        # 적분 후보로 출력 계산, 포화 방향으로 더 밀어붙이면 적분하지 않음
+        integral = self.integral + error * dt
+        output = self.kp * error + self.ki * integral + self.kd * derivative
+        if output > self.output_max:
+            output = self.output_max
+            if error < 0:
+                self.integral = integral
+        elif output < self.output_min:
+            output = self.output_min
+            if error > 0:
+                self.integral = integral
+        else:
+            self.integral = integral
+
+        self.last_measurement = measurement
+        self.last_time = now
+        self.output = output
+        return output
+
+
+class TimeProportionalOutput:
+    """듀티비(0~1)를 주기 내 ON 시간으로 변환하는 슬로우 PWM"""
+
+    def __init__(self, window=120.0, min_on=30.0, min_off=30.0):
+        """
+        Args:
+            window: PWM 주기 (초) - 제어 주기의 배수로 설정 권장
+            min_on: 최소 ON 유지 시간 (초)
+            min_off: 최소 OFF 유지 시간 (초)
+        """
+        self.window = window
+        self.min_on = min_on
+        self.min_off = min_off
+        self.window_start = None
+        self.last_switch = None
+        self.switch_count = 0
+
+    def update(self, duty, is_on, now=None):
+        """
+        현재 시점의 목표 상태 계산
+
+        Args:
+            duty: 듀티비 (0~1)
+            is_on: 현재 릴레이 상태
+            now: 현재 시각 (기본값: time.monotonic())
+
+        Returns:
+            bool: 목표 상태 (True: ON)
+        """
+        if now is None:
+            now = time.monotonic()
+        if self.window_start is None or now - self.window_start >= self.window:
+            self.window_start = now
+
+        # 최소 시간보다 짧은 ON/OFF 구간은 만들지 않음
+        on_time = duty * self.window
+        if on_time < self.min_on:
+            on_time = 0.0
+        elif self.window - on_time < self.min_off:
+            on_time = self.window
+        desired = (now - self.window_start) < on_time
+
+        # 마지막 전환 후 최소 유지 시간이 지나지 않았으면 상태 유지
+        if desired != is_on and self.last_switch is not None:
+            hold = self.min_on if is_on else self.min_off
+            if now - self.last_switch < hold:
+                return is_on
+        if desired != is_on:
+            self.last_switch = now
+            self.switch_count += 1
+        return desired
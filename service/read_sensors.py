@@ -1,102 +1,230 @@
+import threading
+import time
 from sensor.dht11 import DHT11
-from sensor.photoresister import PhotoResister
-from sensor.MH_Z19B import CO2Sensor
-from sensor.HC_SR04 import UltrasonicSensor
-from sensor.water import WaterLevelSensor
-from sensor.soil_moisture import SoilMoistureSensor
+from sensor.MH_Z19B import CO2Sensor, close_co2_reader
+from sensor.HC_SR04 import EdgeUltrasonicSensor
+from sensor.water import EdgeWaterLevelSensor
+from sensor.adc_bus import get_adc_bus, close_adc_buses
 from service.sensor_cache import SensorCache
+from service.sensor_scheduler import stop_scheduler
+from service.sensor_history import get_history
+from service.metrics import timer
+from service.log import get_logger, fields
 from mqtt.mqtt_client import MqttClient
-import board
+from hal.backend import board
+
+
+# 조도/토양 ADC 오버샘플링 (채널당 샘플 수, 중앙값 필터)
+ADC_SAMPLES = 8
+
+log = get_logger("read_sensors")
+
+
+# 캐시 센서별 폴링 설정
+# - DHT11: 하드웨어 최소 간격 2초, 안정적이면 10초까지 늘림
+# - MH-Z19B: 응답이 느리고 변화도 느리므로 5초~30초
+# - max_age: 마지막 성공 후 이 시간(초)이 지나면 값을 버림 (죽은 센서로 제어 방지)
+DHT11_POLLING = {'interval': 2.0, 'min_interval': 2.0, 'max_interval': 10.0, 'change_threshold': 0.5, 'max_age': 60.0}
+CO2_POLLING = {'interval': 5.0, 'min_interval': 5.0, 'max_interval': 30.0, 'change_threshold': 30, 'max_age': 120.0}
+
+# 초음파 센서 (에지 인터럽트, 백그라운드 측정)
+# - 0.2초마다 측정, 최근 7개 중앙값, 중앙값에서 5cm 넘게 벗어난 값은 버림
+# - 첫 읽기는 최대 ULTRASONIC_FIRST_READ_TIMEOUT초까지 첫 측정을 기다림
+ULTRASONIC_POLLING = {'interval': 0.2, 'window': 7, 'outlier_cm': 5.0, 'max_age': 5.0}
+ULTRASONIC_FIRST_READ_TIMEOUT = 1.0
+
+# 시작 시 캐시 센서(DHT11, CO2) 첫 읽기 성공 대기 상한 (초) - 고장 난 센서가 있어도 이 시간 뒤에는 시작
+SENSOR_WARMUP_TIMEOUT = 3.0
+
+# 물받이 수위 센서 (에지 인터럽트, 0.1초 유지되어야 상태 변경)
+WATER_LEVEL_DEBOUNCE = 0.1
+
+
+# 슬롯 공유 센서(초음파 등)의 이력 키
+DEVICE_SLOT = 0
+
+
+def sensor_key(slot, device=None):
+    """
+    센서 캐시/이력 키
+
+    게이트웨이 모드에서는 디바이스마다 슬롯 번호가 겹치므로 "시리얼:슬롯" (farm_uid와 같은 형식),
+    디바이스 1대만 쓰면 슬롯 번호 그대로
+    """
+    return slot if device is None else f"{device}:{slot}"
 
 
 # 전역 캐시 저장소
 _dht11_caches = {}
 _co2_caches = {}
+_ultrasonic_sensors = {}  # (TRIG, ECHO) -> EdgeUltrasonicSensor
+_water_sensors = {}  # 핀 -> EdgeWaterLevelSensor
+_sensor_lock = threading.Lock()
 
 
-def init_sensor_caches(slot, sensor_pins, has_co2=True):
-    """슬롯별 센서 캐시 초기화"""
+def init_sensor_caches(slot, sensor_pins, has_co2=True, device=None):
+    """슬롯별 센서 캐시 초기화 (공유 스케줄러 스레드에 등록, device: 게이트웨이 모드의 디바이스 시리얼)"""
     global _dht11_caches, _co2_caches
     
+    history = get_history()
+    key = sensor_key(slot, device)
+
+    def record_dht11(value):
+        temp, hum = value
+        history.record(key, 'temp', temp)
+        history.record(key, 'humidity', hum)
+
     # DHT11 캐시
-    if slot not in _dht11_caches:
+    if key not in _dht11_caches:
         dht11 = DHT11(sensor_pins['dht11_pin'])
-        _dht11_caches[slot] = SensorCache(dht11, "DHT11")
-        _dht11_caches[slot].start()
+        _dht11_caches[key] = SensorCache(dht11, "DHT11", on_value=record_dht11, **DHT11_POLLING)
+        _dht11_caches[key].start()
     
     # CO2 캐시
     if has_co2 and 'co2_port' in sensor_pins and sensor_pins['co2_port']:
-        if slot not in _co2_caches:
+        if key not in _co2_caches:
             co2 = CO2Sensor(sensor_pins['co2_port'])
-            _co2_caches[slot] = SensorCache(co2, "CO2")
-            _co2_caches[slot].start()
+            _co2_caches[key] = SensorCache(co2, "CO2", on_value=lambda v: history.record(key, 'co2', v),
+                                           **CO2_POLLING)
+            _co2_caches[key].start()
+
+
+def wait_sensor_caches(slots, timeout=SENSOR_WARMUP_TIMEOUT, device=None):
+    """
+    슬롯 캐시 센서(DHT11, CO2)의 첫 읽기 성공까지 대기 (모든 센서가 같은 기한을 공유)
+
+    Returns:
+        list: 기한 안에 값을 받지 못한 센서 ("DHT11:슬롯 키" 형식), 모두 준비되면 빈 리스트
+    """
+    deadline = time.monotonic() + timeout
+    pending = []
+    for slot in slots:
+        key = sensor_key(slot, device)
+        for name, caches in (("DHT11", _dht11_caches), ("CO2", _co2_caches)):
+            cache = caches.get(key)
+            if cache is not None and not cache.wait_ready(max(deadline - time.monotonic(), 0.0)):
+                pending.append(f"{name}:{key}")
+    return pending
+
+
+def init_ultrasonic_sensor(trig_pin=23, echo_pin=24):
+    """초음파 센서 백그라운드 측정 시작 (핀 조합별 1개, 이미 있으면 그대로 반환)"""
+    with _sensor_lock:
+        ultrasonic = _ultrasonic_sensors.get((trig_pin, echo_pin))
+        if ultrasonic is None:
+            ultrasonic = EdgeUltrasonicSensor(trig_pin, echo_pin, **ULTRASONIC_POLLING)
+            ultrasonic.start()
+            _ultrasonic_sensors[(trig_pin, echo_pin)] = ultrasonic
+        return ultrasonic
+
+
+def init_water_tank_sensor(water_pin):
+    """물받이 수위 센서 에지 감지 시작 (핀별 1개, 이미 있으면 그대로 반환)"""
+    key = getattr(water_pin, 'id', water_pin)
+    with _sensor_lock:
+        water_sensor = _water_sensors.get(key)
+        if water_sensor is None:
+            water_sensor = EdgeWaterLevelSensor(water_pin, debounce=WATER_LEVEL_DEBOUNCE)
+            water_sensor.start()
+            _water_sensors[key] = water_sensor
+        return water_sensor
 
 
 def stop_sensor_caches():
     """모든 센서 캐시 중지"""
+    with _sensor_lock:
+        for ultrasonic in _ultrasonic_sensors.values():
+            ultrasonic.close()
+        _ultrasonic_sensors.clear()
+        for water_sensor in _water_sensors.values():
+            water_sensor.close()
+        _water_sensors.clear()
     for cache in _dht11_caches.values():
         cache.stop()
     for cache in _co2_caches.values():
         cache.stop()
     _dht11_caches.clear()
     _co2_caches.clear()
+    stop_scheduler()
+    close_co2_reader()
+    close_adc_buses()
 
 
-def read_slot_sensors(slot, sensor_pins, has_co2=True):
-    """슬롯별 센서 값 읽기 (캐시 사용)"""
-    
-    # 안정적인 센서 (즉시 읽기)
-    photo_sensor = PhotoResister(sensor_pins['photo_channel'])
-    soil_sensor = SoilMoistureSensor(sensor_pins['soil_channel'])
+def get_slot_sample_age(slot, device=None):
+    """슬롯의 캐시 센서 중 가장 오래된 값의 경과 시간 (초), 캐시 값이 없으면 None"""
+    key = sensor_key(slot, device)
+    ages = []
+    for caches in (_dht11_caches, _co2_caches):
+        cache = caches.get(key)
+        if cache is not None and not cache.is_stale():
+            ages.append(cache.age())
+    return max(ages) if ages else None
+
 
+def read_slot_sensors(slot, sensor_pins, has_co2=True, device=None):
+    """슬롯별 센서 값 읽기 (캐시 사용, 오래된 캐시 값은 None)
+    
+    sensor_pins에 'adc_cs'가 있으면 그 칩 선택 핀의 ADC 버스를 사용 (게이트웨이 모드에서 디바이스별 ADC)
+    """
+    key = sensor_key(slot, device)
+    
+    # DHT11 - 캐시에서 가져오기
+    temp, hum = None, None
+    if key in _dht11_caches:
+        with timer("sensor.cache_lookup"):
+            value = _dht11_caches[key].get()
+        if value:
+            temp, hum = value
+    
+    # 조도, 토양 - 공유 ADC 버스에서 한 번에 오버샘플링 (중앙값 필터)
     try:
-        # DHT11 - 캐시에서 가져오기
-        temp, hum = None, None
-        if slot in _dht11_caches:
-            value = _dht11_caches[slot].get()
-            if value:
-                temp, hum = value
-        
-        # 조도, 토양 - 즉시 읽기
-        light_adc, _ = photo_sensor.read()
-        soil_adc, _ = soil_sensor.read()
-        
-        # CO2 - 캐시에서 가져오기
-        co2 = None
-        if has_co2 and slot in _co2_caches:
-            co2 = _co2_caches[slot].get()
-        
-        return temp, hum, light_adc, soil_adc, co2
+        adc_cs = sensor_pins.get('adc_cs')
+        adc_bus = get_adc_bus() if adc_cs is None else get_adc_bus(adc_cs)
+        with timer("sensor.adc.scan"):
+            light_adc, soil_adc = adc_bus.scan_channels(
+                [sensor_pins['photo_channel'], sensor_pins['soil_channel']],
+                samples=ADC_SAMPLES,
+            )
+    except Exception as e:
+        log.warning("ADC 센서 읽기 오류: %s", e, extra=fields(slot=key, sensor="ADC"))
+        light_adc, soil_adc = None, None
     
-    finally:
-        photo_sensor.close()
-        soil_sensor.close()
+    history = get_history()
+    history.record(key, 'light', light_adc)
+    history.record(key, 'soil', soil_adc)
+    
+    # CO2 - 캐시에서 가져오기
+    co2 = None
+    if has_co2 and key in _co2_caches:
+        with timer("sensor.cache_lookup"):
+            co2 = _co2_caches[key].get()
+    
+    return temp, hum, light_adc, soil_adc, co2
 
 
-def read_ultrasonic_sensor(trig_pin=23, echo_pin=24):
-    """초음파 센서 읽기 (통합 - 슬롯 공유)
+def read_ultrasonic_sensor(trig_pin=23, echo_pin=24, device=None):
+    """초음파 센서 읽기 (통합 - 슬롯 공유, 백그라운드 측정의 최근 추정값을 바로 반환)
     
     Args:
         trig_pin: TRIG 핀 번호 (기본값: 23)
         echo_pin: ECHO 핀 번호 (기본값: 24)
+        device: 디바이스 시리얼 (게이트웨이 모드, 이력 키 구분용)
     
     Returns:
-        distance: 거리 (cm)
+        distance: 거리 (cm), 측정값이 없으면 None
     """
-    
-    print("\n[통합] 초음파 센서 읽기...")
-    
-    ultrasonic_sensor = UltrasonicSensor(trig_pin, echo_pin)
-    try:
-        distance = ultrasonic_sensor.read()
-        print(f"[통합] 초음파 센서: {distance} cm")
-        return distance
-    finally:
-        pass  # 초음파 센서는 GPIO만 사용하므로 별도 정리 불필요
+    ultrasonic = init_ultrasonic_sensor(trig_pin, echo_pin)
+    with timer("sensor.ultrasonic.read"):
+        distance = ultrasonic.read()
+        if distance is None and ultrasonic.wait_ready(ULTRASONIC_FIRST_READ_TIMEOUT):
+            distance = ultrasonic.read()  # 시작 직후 첫 측정
+    get_history().record(sensor_key(DEVICE_SLOT, device), 'distance', distance)
+    log.debug("초음파 센서 거리", extra=fields(sensor="HC-SR04", device=device, value=distance))
+    return distance
 
 
 def read_water_tank_sensor(water_pin):
-    """물통 수위 센서 읽기 (통합 - 슬롯 공유)
+    """물통 수위 센서 읽기 (통합 - 슬롯 공유, 디바운스된 현재 값을 바로 반환)
     
     Args:
         water_pin: GPIO 핀 (기본값: board.D26)
@@ -104,17 +232,11 @@ def read_water_tank_sensor(water_pin):
     Returns:
         water_detected: True(물 있음), False(물 없음)
     """
-    
-    print("\n[통합] 물통 수위 센서 읽기...")
-    
-    water_sensor = WaterLevelSensor(water_pin)
-    try:
+    water_sensor = init_water_tank_sensor(water_pin)
+    with timer("sensor.water_level.read"):
         water_detected = water_sensor.read()
-        status = "정상" if water_detected else "낮음 (보충 필요)"
-        print(f"[통합] 물통 수위: {status}")
-        return water_detected
-    finally:
-        water_sensor.close()
+    log.debug("물통 수위", extra=fields(sensor="water_level", value=water_detected))
+    return water_detected
 
 
 if __name__ == "__main__":
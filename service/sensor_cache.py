@@ -1,44 +1,210 @@
 """
 불안정한 센서(DHT11, CO2)를 위한 백그라운드 캐싱 시스템
-2초마다 센서를 읽고, 최근 성공한 값을 저장
+공유 스케줄러 스레드 하나가 센서별 주기로 읽고, 최근 성공한 값을 저장
+
+- 실패가 이어지면 읽기 간격을 지수적으로 늘림 (백오프)
+- 값이 빠르게 변하면 최소 간격으로 당기고, 안정적이면 최대 간격까지 늘림
+- 마지막 성공 시각(monotonic)을 기록하고, max_age보다 오래된 값은 오래된 값으로 취급
+- 센서에 read_async()가 있으면 Future만 받고 바로 돌아감 (응답은 완료 콜백에서 반영)
+- 첫 성공 시 준비 이벤트를 켜서 시작 시 고정 대기 없이 wait_ready()로 첫 값을 기다릴 수 있음
 """
 import threading
 import time
-from collections import deque
+from service.sensor_scheduler import get_scheduler
+from service.metrics import timer, increment, get_registry
+from service.log import get_logger, fields
+
+log = get_logger("sensor_cache")
 
 
 class SensorCache:
     """센서 값을 백그라운드에서 주기적으로 읽어 캐싱"""
-    
-    def __init__(self, sensor, sensor_name="Sensor"):
+
+    def __init__(self, sensor, sensor_name="Sensor", interval=2.0, min_interval=None,
+                 max_interval=None, change_threshold=None, max_backoff=60.0, max_age=None,
+                 scheduler=None, on_value=None):
+        """
+        Args:
+            sensor: read() 메서드를 가진 센서 객체 (실패 시 None 반환)
+            sensor_name: 센서 이름 (로그용)
+            interval: 기본 읽기 간격 (초)
+            min_interval: 값이 빠르게 변할 때 간격 (기본값: interval)
+            max_interval: 값이 안정적일 때 최대 간격 (기본값: interval)
+            change_threshold: 이 이상 변하면 "빠르게 변함"으로 판단 (None이면 적응 안 함)
+            max_backoff: 연속 실패 시 최대 간격 (초)
+            max_age: 이 시간(초)보다 오래된 값은 get()에서 None 처리 (None이면 무제한)
+            scheduler: 사용할 스케줄러 (기본값: 공유 스케줄러)
+            on_value: function(value) - 읽기 성공 시마다 호출 (이력 기록 등)
+        """
         self.sensor = sensor
         self.sensor_name = sensor_name
         self.last_value = None
+        self.last_time = None  # 마지막 성공 시각 (time.monotonic)
+        self.success_count = 0
+        self.failure_count = 0
+        self.max_age = max_age
         self.running = False
-        self.thread = None
-    
+        self.scheduler = scheduler
+        self.on_value = on_value
+
+        self.interval = interval
+        self.min_interval = min_interval if min_interval is not None else interval
+        self.max_interval = max_interval if max_interval is not None else interval
+        self.change_threshold = change_threshold
+        self.max_backoff = max_backoff
+        self.current_interval = interval
+        self.consecutive_failures = 0
+        self._pending = None  # read_async() 응답 대기 중인 Future
+        self._next_delay = interval  # read_async() 사용 시 직전 결과로 정한 다음 간격
+        self._ready = threading.Event()  # 첫 읽기 성공 시 설정
+
+        # 계측 이름
+        self._read_metric = f"sensor.{sensor_name}.read"
+        self._failure_metric = f"sensor.{sensor_name}.failures"
+
     def start(self):
-        """백그라운드 센서 읽기 시작"""
+        """백그라운드 센서 읽기 시작 (공유 스케줄러에 등록)"""
+        if self.scheduler is None:
+            self.scheduler = get_scheduler()
         self.running = True
-        self.thread = threading.Thread(target=self._read_loop, daemon=True)
-        self.thread.start()
-    
+        self.scheduler.add(self)
+
     def stop(self):
         """백그라운드 센서 읽기 중지"""
         self.running = False
-    
-    def _read_loop(self):
-        """2초마다 센서 읽기"""
-        while self.running:
-            try:
+        if self.scheduler is not None:
+            self.scheduler.remove(self)
+
+    def poll(self):
+        """
+        센서 1회 읽기 (스케줄러 스레드에서 호출)
+
+        Returns:
+            float: 다음 읽기까지 대기 시간 (초)
+        """
+        read_async = getattr(self.sensor, 'read_async', None)
+        if read_async is not None:
+            return self._poll_async(read_async)
+        try:
+            with timer(self._read_metric):
                 value = self.sensor.read()
-                if value is not None:
-                    self.last_value = value
-            except:
-                pass
-            time.sleep(2)
-    
-    def get(self):
-        """최근 성공한 값 반환"""
+        except Exception:
+            value = None
+        return self._record(value)
+
+    def _poll_async(self, read_async):
+        """응답을 기다리지 않는 읽기 요청 (이전 요청이 끝나지 않았으면 건너뜀)"""
+        if self._pending is not None and not self._pending.done():
+            return self._next_delay
+        start = time.perf_counter()
+        try:
+            self._pending = read_async()
+        except Exception:
+            self._pending = None
+            self._next_delay = self._record(None)
+            return self._next_delay
+
+        def done(future):
+            registry = get_registry()
+            if registry.enabled:
+                registry.observe(self._read_metric, (time.perf_counter() - start) * 1000.0)
+            try:
+                value = future.result()
+            except Exception:
+                value = None
+            self._next_delay = self._record(value)
+
+        self._pending.add_done_callback(done)
+        return self._next_delay
+
+    def _record(self, value):
+        """읽은 값 반영 (실패면 백오프), 다음 읽기까지 대기 시간 반환"""
+        if not self._is_valid(value):
+            # 연속 실패 시 지수 백오프
+            increment(self._failure_metric)
+            self.failure_count += 1
+            self.consecutive_failures += 1
+            backoff = self.interval * (2 ** min(self.consecutive_failures, 6))
+            return min(backoff, self.max_backoff)
+
+        self.success_count += 1
+        self.consecutive_failures = 0
+        self.current_interval = self._adapt_interval(self.last_value, value)
+        self.last_value = value
+        self.last_time = time.monotonic()
+        self._ready.set()
+        if self.on_value:
+            try:
+                self.on_value(value)
+            except Exception as e:
+                log.error("%s 콜백 오류: %s", self.sensor_name, e, extra=fields(sensor=self.sensor_name))
+        return self.current_interval
+
+    def _is_valid(self, value):
+        # DHT11은 실패 시 (None, None) 반환
+        if value is None:
+            return False
+        if isinstance(value, tuple):
+            return all(v is not None for v in value)
+        return True
+
+    def _adapt_interval(self, previous, value):
+        """값 변화량에 따라 다음 읽기 간격 결정"""
+        if self.change_threshold is None or previous is None:
+            return self.interval
+        if _max_change(previous, value) >= self.change_threshold:
+            return self.min_interval
+        # 안정적이면 간격을 점진적으로 늘림
+        return min(self.current_interval * 1.5, self.max_interval)
+
+    def wait_ready(self, timeout=None):
+        """
+        첫 읽기 성공까지 대기
+
+        Returns:
+            bool: 값이 있는지 (timeout초 안에 성공하지 못하면 False)
+        """
+        return self._ready.wait(timeout)
+
+    def age(self):
+        """마지막 성공 이후 경과 시간 (초), 성공한 적 없으면 None"""
+        if self.last_time is None:
+            return None
+        return time.monotonic() - self.last_time
+
+    def is_stale(self):
+        """값이 없거나 max_age보다 오래되었는지 여부"""
+        age = self.age()
+        if age is None:
+            return True
+        return self.max_age is not None and age > self.max_age
+
+    def get(self, allow_stale=False):
+        """
+        최근 성공한 값 반환
+
+        Args:
+            allow_stale: True면 max_age를 넘긴 값도 반환
+
+        Returns:
+            최근 값, 오래된 값이면 None
+        """
+        if not allow_stale and self.is_stale():
+            return None
         return self.last_value
 
+    def get_entry(self):
+        """
+        캐시 항목 조회 (값, 경과 시간, 오래됨 여부)
+
+        Returns:
+            tuple: (value, age, stale) - 오래된 값도 그대로 반환
+        """
+        return self.last_value, self.age(), self.is_stale()
+
+
+def _max_change(previous, value):
+    """두 값(단일 값 또는 튜플) 사이의 최대 변화량"""
+    if isinstance(value, tuple):
+        return max(abs(a - b) for a, b in zip(value, previous))
+    return abs(value - previous)
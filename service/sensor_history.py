@@ -0,0 +1,163 @@
+"""
+센서 값 이력 저장소 (고정 크기 링 버퍼)
+
+슬롯/측정항목별로 최근 N개의 (시각, 값)을 array 버퍼에 보관합니다.
+- 추가는 O(1), 메모리는 가동 시간과 무관하게 고정
+- 이동 평균/최소/최대/기울기는 버퍼 구간 단위로 한 번에 계산
+"""
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from operator import mul
+
+
+class RingBuffer:
+    """(시각, 값) 고정 크기 링 버퍼"""
+    __slots__ = ("capacity", "_times", "_values", "_index", "_count")
+
+    def __init__(self, capacity=512):
+        if capacity < 2:
+            raise ValueError("capacity는 2 이상이어야 합니다")
+        self.capacity = capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._index = 0  # 다음에 쓸 위치
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value, timestamp=None):
+        """값 추가 (가득 차면 가장 오래된 값을 덮어씀)"""
+        i = self._index
+        self._times[i] = time.monotonic() if timestamp is None else timestamp
+        self._values[i] = value
+        self._index = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def latest(self):
+        """가장 최근 값, 비어 있으면 None"""
+        if not self._count:
+            return None
+        return self._values[self._index - 1]
+
+    def window(self, seconds=None, count=None, now=None):
+        """
+        오래된 순으로 정렬된 구간 반환
+
+        Args:
+            seconds: 최근 몇 초 구간 (None이면 전체)
+            count: 최근 몇 개 (None이면 전체)
+            now: 기준 시각 (기본값: time.monotonic())
+
+        Returns:
+            tuple: (times array, values array)
+        """
+        if self._count < self.capacity:
+            times = self._times[:self._count]
+            values = self._values[:self._count]
+        else:
+            i = self._index
+            times = self._times[i:] + self._times[:i]
+            values = self._values[i:] + self._values[:i]
+
+        start = 0
+        if seconds is not None:
+            if now is None:
+                now = time.monotonic()
+            start = bisect_left(times, now - seconds)
+        if count is not None:
+            start = max(start, len(values) - count)
+        return times[start:], values[start:]
+
+    def stats(self, seconds=None, count=None, now=None):
+        """
+        구간 통계
+
+        Returns:
+            dict: count, mean, min, max, slope(단위 시간당 변화량), 비어 있으면 None
+        """
+        times, values = self.window(seconds, count, now)
+        n = len(values)
+        if n == 0:
+            return None
+        total = sum(values)
+        return {
+            'count': n,
+            'mean': total / n,
+            'min': min(values),
+            'max': max(values),
+            'slope': _slope(times, values, total),
+        }
+
+
+def _slope(times, values, total):
+    """최소제곱 기울기 (값/초), 샘플이 부족하면 0.0"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    # 시각을 구간 시작 기준으로 옮겨 큰 monotonic 값의 정밀도 손실 방지
+    t0 = times[0]
+    ts = array('d', (t - t0 for t in times))
+    sum_t = sum(ts)
+    sum_tt = sum(map(mul, ts, ts))
+    sum_tv = sum(map(mul, ts, values))
+    denom = n * sum_tt - sum_t * sum_t
+    if denom == 0:
+        return 0.0
+    return (n * sum_tv - sum_t * total) / denom
+
+
+class SensorHistory:
+    """슬롯/측정항목별 링 버퍼 모음 (스레드 안전)"""
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def buffer(self, slot, metric):
+        """(slot, metric) 버퍼 반환 (없으면 생성)"""
+        key = (slot, metric)
+        buf = self._buffers.get(key)
+        if buf is None:
+            with self._lock:
+                buf = self._buffers.setdefault(key, RingBuffer(self.capacity))
+        return buf
+
+    def record(self, slot, metric, value, timestamp=None):
+        """값 기록 (None은 무시)"""
+        if value is None:
+            return
+        buf = self.buffer(slot, metric)
+        with self._lock:
+            buf.append(value, timestamp)
+
+    def stats(self, slot, metric, seconds=None, count=None):
+        """구간 통계 (기록이 없으면 None)"""
+        buf = self._buffers.get((slot, metric))
+        if buf is None:
+            return None
+        with self._lock:
+            return buf.stats(seconds, count)
+
+    def mean(self, slot, metric, seconds=None, count=None):
+        """구간 평균 (기록이 없으면 None)"""
+        result = self.stats(slot, metric, seconds, count)
+        return result['mean'] if result else None
+
+    def slope(self, slot, metric, seconds=None, count=None):
+        """구간 기울기 (값/초, 기록이 없으면 None)"""
+        result = self.stats(slot, metric, seconds, count)
+        return result['slope'] if result else None
+
+
+# 프로세스 공유 이력 저장소
+_history = SensorHistory()
+
+
+def get_history():
+    """공유 이력 저장소 반환"""
+    return _history
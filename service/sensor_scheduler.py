@@ -0,0 +1,124 @@
+"""
+센서 폴링 스케줄러 (단일 스레드, 힙 기반)
+
+센서마다 스레드를 띄우는 대신 다음 읽기 시각을 힙에 넣어두고
+한 스레드가 가장 빠른 작업부터 순서대로 실행합니다.
+"""
+import heapq
+import itertools
+import threading
+import time
+from service.log import get_logger
+
+log = get_logger("sensor_scheduler")
+
+
+class SensorScheduler:
+    """등록된 작업을 각자의 주기로 실행하는 단일 스레드 스케줄러"""
+
+    def __init__(self, name="sensor-scheduler"):
+        self.name = name
+        self._heap = []  # (실행 시각, 순번, 작업, 등록 번호)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._jobs = {}  # 작업 -> 등록 번호 (다시 등록하면 바뀌어서 예전 힙 항목은 버려짐)
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """스케줄러 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """스케줄러 스레드 중지"""
+        with self._cond:
+            self.running = False
+            self._heap.clear()
+            self._jobs.clear()
+            self._cond.notify()
+
+    def add(self, job, delay=0.0):
+        """
+        작업 등록
+
+        Args:
+            job: poll() -> 다음 실행까지 대기 시간(초)을 반환하는 객체
+            delay: 첫 실행까지 대기 시간 (초)
+        """
+        with self._cond:
+            token = self._jobs[job] = next(self._seq)
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), job, token))
+            self._cond.notify()
+
+    def remove(self, job):
+        """작업 제거 (힙에 남은 항목은 실행 시점에 버려짐)"""
+        with self._cond:
+            self._jobs.pop(job, None)
+
+    def _is_current(self, job, token):
+        """마지막 등록의 항목인지 (제거됐거나 다시 등록된 작업의 예전 항목이면 False)"""
+        return self._jobs.get(job) == token
+
+    def _next_due_job(self):
+        """실행 시각이 된 (작업, 등록 번호)를 꺼낼 때까지 대기 (중지되면 None)"""
+        while self.running:
+            if not self._heap:
+                self._cond.wait()
+                continue
+            due, _, job, token = self._heap[0]
+            wait = due - time.monotonic()
+            if wait > 0:
+                self._cond.wait(wait)
+                continue
+            heapq.heappop(self._heap)
+            if self._is_current(job, token):
+                return job, token
+        return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                entry = self._next_due_job()
+            if entry is None:
+                return
+            job, token = entry
+
+            # 센서 읽기는 락 밖에서 실행 (등록/제거가 막히지 않도록)
+            try:
+                delay = job.poll()
+            except Exception as e:
+                log.error("스케줄러 작업 오류: %s", e)
+                delay = 1.0
+
+            with self._cond:
+                if self.running and self._is_current(job, token):
+                    heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), job, token))
+
+
+# 프로세스 공유 스케줄러
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """공유 스케줄러 반환 (최초 호출 시 생성 및 시작)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None or not _scheduler.running:
+            _scheduler = SensorScheduler()
+            _scheduler.start()
+        return _scheduler
+
+
+def stop_scheduler():
+    """공유 스케줄러 중지"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler.stop()
+            _scheduler = None
@@ -0,0 +1,78 @@
+"""
+시작 시간 단계별 기록
+
+main.py/gateway.py가 단계가 끝날 때마다 mark()를 호출하고, 첫 제어 주기가 끝나면 finish()로
+단계별 소요 시간을 화면과 로그에 남깁니다. 계측이 켜져 있으면 startup.<단계> 히스토그램에도 기록되어
+smartfarm/{시리얼}/metrics 로 함께 전송됩니다.
+
+    startup = StartupTimer()
+    ...
+    startup.mark("slots")
+    ...
+    startup.finish("first_cycle")
+"""
+import time
+from service.metrics import get_registry
+from service.log import get_logger
+
+log = get_logger("startup")
+
+# 단계 이름 -> 화면 표시 이름
+PHASE_LABELS = {
+    'config': "설정",
+    'connect': "MQTT 연결",
+    'slots': "슬롯 초기화",
+    'sensors': "센서 첫 값",
+    'presets': "프리셋",
+    'first_cycle': "첫 주기",
+}
+
+
+class StartupTimer:
+    """시작 단계별 소요 시간 (직전 mark() 이후 경과 시간)"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self._last = self.started
+        self.phases = []  # [(단계 이름, 초)]
+        self.reported = False
+
+    def mark(self, name):
+        """직전 mark() 이후 경과 시간을 name 단계로 기록, 기록한 시간(초) 반환"""
+        now = self.clock()
+        seconds = now - self._last
+        self._last = now
+        self.phases.append((name, seconds))
+        return seconds
+
+    def finish(self, name):
+        """마지막 단계 기록 후 보고"""
+        self.mark(name)
+        self.report()
+
+    def total(self):
+        return sum(seconds for _, seconds in self.phases)
+
+    def as_dict(self):
+        """{단계: 초} (계측 게이지, 로그용)"""
+        result = {name: round(seconds, 3) for name, seconds in self.phases}
+        result['total'] = round(self.total(), 3)
+        return result
+
+    def summary(self):
+        """한 줄 요약: "합계 1.23초 (설정 0.01 · 슬롯 초기화 0.12 · ...)" """
+        parts = " · ".join(f"{PHASE_LABELS.get(name, name)} {seconds:.2f}" for name, seconds in self.phases)
+        return f"합계 {self.total():.2f}초 ({parts})"
+
+    def report(self):
+        """단계별 시간 출력 + 로그 + 계측 기록 (한 번만)"""
+        if self.reported:
+            return
+        self.reported = True
+        print(f"\n⏱️  시작 시간: {self.summary()}\n")
+        log.info("시작 완료: %s", self.summary())
+        registry = get_registry()
+        if registry.enabled:
+            for name, seconds in self.phases:
+                registry.observe(f"startup.{name}", seconds * 1000.0)
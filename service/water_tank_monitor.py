@@ -8,15 +8,20 @@
 import time
 from datetime import datetime
 
+from service.log import get_logger, fields
+
+log = get_logger("water_tank")
+
 
 class WaterTankMonitor:
-    def __init__(self, mqtt_client, device_serial):
+    def __init__(self, mqtt_client, device_serial, config=None):
         """
         물탱크 모니터링 초기화
         
         Args:
             mqtt_client: MQTT 클라이언트 인스턴스
             device_serial: 디바이스 시리얼 번호 (예: "A1001")
+            config: WaterTankConfig (설정 파일 water_tank, 없으면 아래 기본값)
         """
         self.mqtt_client = mqtt_client
         self.device_serial = device_serial
@@ -40,6 +45,20 @@ class WaterTankMonitor:
         # 상태 추적
         self.supply_status = "정상"  # 정상, 낮음, 위험
         self.overflow_status = "정상"  # 정상, 넘침
+        
+        if config is not None:
+            self.configure(config)
+    
+    def configure(self, config):
+        """임계값/쿨다운 변경 (설정 다시 읽기, 상태와 알림 시각은 유지)
+        
+        Args:
+            config: WaterTankConfig
+        """
+        self.supply_tank_height = config.supply_tank_height
+        self.supply_low_threshold = config.supply_low_threshold
+        self.supply_critical_threshold = config.supply_critical_threshold
+        self.alert_cooldown = config.alert_cooldown
     
     def check_supply_tank(self, distance_cm):
         """
@@ -55,7 +74,7 @@ class WaterTankMonitor:
             status: "정상", "낮음", "위험"
         """
         if distance_cm is None:
-            print("⚠️  급수탱크: 센서 읽기 실패")
+            log.warning("급수탱크 센서 읽기 실패", extra=fields(tank="supply"))
             return self.supply_status
         
         # 수위 계산 (탱크 높이 - 센서 거리 = 물 높이)
@@ -66,7 +85,7 @@ class WaterTankMonitor:
         # 위험 수준 (거의 비어있음)
         if water_level <= self.supply_critical_threshold:
             status = "위험"
-            print(f"🚨 급수탱크: 위험! (수위: {water_level:.1f}cm)")
+            log.warning("급수탱크 수위 위험", extra=fields(tank="supply", value=round(water_level, 1)))
             
             # 쿨다운 체크 후 알림 전송
             if current_time - self.last_supply_critical_alert > self.alert_cooldown:
@@ -80,7 +99,7 @@ class WaterTankMonitor:
         # 낮음 수준
         elif water_level <= self.supply_low_threshold:
             status = "낮음"
-            print(f"⚠️  급수탱크: 낮음 (수위: {water_level:.1f}cm)")
+            log.warning("급수탱크 수위 낮음", extra=fields(tank="supply", value=round(water_level, 1)))
             
             # 쿨다운 체크 후 알림 전송
             if current_time - self.last_supply_low_alert > self.alert_cooldown:
@@ -94,7 +113,7 @@ class WaterTankMonitor:
         # 정상
         else:
             status = "정상"
-            print(f"✅ 급수탱크: 정상 (수위: {water_level:.1f}cm)")
+            log.debug("급수탱크 정상", extra=fields(tank="supply", value=round(water_level, 1)))
         
         self.supply_status = status
         return status
@@ -112,7 +131,7 @@ class WaterTankMonitor:
             status: "정상", "넘침"
         """
         if water_detected is None:
-            print("⚠️  물받이탱크: 센서 읽기 실패")
+            log.warning("물받이탱크 센서 읽기 실패", extra=fields(tank="overflow"))
             return self.overflow_status
         
         current_time = time.time()
@@ -120,7 +139,7 @@ class WaterTankMonitor:
         # 물이 감지됨 = 넘침 발생
         if water_detected:
             status = "넘침"
-            print(f"🚨 물받이탱크: 넘침 감지!")
+            log.warning("물받이탱크 넘침 감지", extra=fields(tank="overflow"))
             
             # 쿨다운 체크 후 알림 전송
             if current_time - self.last_overflow_alert > self.alert_cooldown:
@@ -134,7 +153,7 @@ class WaterTankMonitor:
         # 정상
         else:
             status = "정상"
-            print(f"✅ 물받이탱크: 정상 (넘침 없음)")
+            log.debug("물받이탱크 정상", extra=fields(tank="overflow"))
         
         self.overflow_status = status
         return status
@@ -156,7 +175,7 @@ class WaterTankMonitor:
         # MQTT로 알림 전송
         self.mqtt_client.send_notification_logs(notification)
         
-        print(f"📢 알림 전송: {notification}")
+        log.info("알림 전송: %s", notification, extra=fields(tank=tank))
     
     def get_status_summary(self):
         """
@@ -180,18 +199,21 @@ class WaterTankMonitor:
         """
         # 급수탱크가 위험 수준이면 펌프 작동 금지
         if self.supply_status == "위험":
-            print("🚫 급수탱크 수위 위험 - 물펌프 작동 차단!")
+            log.warning("급수탱크 수위 위험 - 물펌프 작동 차단", extra=fields(tank="supply"))
             return True
         
         # 물받이탱크에 넘침이 감지되면 펌프 작동 금지
         if self.overflow_status == "넘침":
-            print("🚫 물받이탱크 넘침 감지 - 물펌프 작동 차단!")
+            log.warning("물받이탱크 넘침 - 물펌프 작동 차단", extra=fields(tank="overflow"))
             return True
         
         return False
 
 
 if __name__ == "__main__":
+    from service.log import configure_logging
+    configure_logging(level="DEBUG", sink="console", rate_limit=0)
+
     # 테스트용 Mock MQTT 클라이언트
     class MockMqttClient:
         def send_notification_logs(self, message):
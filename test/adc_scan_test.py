@@ -0,0 +1,60 @@
+"""
+ADC 스캔 엔진 필터 테스트
+
+MCP3008 없이 가짜 변환 함수로 스파이크 노이즈를 섞어
+중앙값/절사평균 필터가 안정적인 값을 내는지 확인합니다.
+"""
+from sensor.adc_scan import ADCScanner, TRIMMED_MEAN
+
+
+def make_convert(base, spikes):
+    """채널별 기준값에 정해진 순서로 스파이크를 섞는 가짜 변환 함수"""
+    counters = {ch: 0 for ch in base}
+
+    def convert(ch):
+        i = counters[ch]
+        counters[ch] += 1
+        return base[ch] + spikes[i % len(spikes)]
+    return convert
+
+
+def test_adc_scan():
+    print("=" * 70)
+    print("📈 ADC 스캔 엔진 테스트")
+    print("=" * 70)
+
+    base = {0: 30000, 1: 12000}
+    spikes = [0, 40, -40, 20000, 0, -20, 20, -12000, 0]
+
+    print("\n[1] 중앙값 필터 (9샘플, 스파이크 2개)")
+    scanner = ADCScanner([0, 1], samples=9)
+    values = scanner.scan(make_convert(base, spikes))
+    print(f"   결과: {list(values)}")
+    assert list(values) == [30000, 12000], f"예상: [30000, 12000], 실제: {list(values)}"
+
+    print("\n[2] 절사평균 필터 (양쪽 2개씩 제외)")
+    scanner = ADCScanner([0, 1], samples=9, mode=TRIMMED_MEAN, trim=2)
+    values = scanner.scan(make_convert(base, spikes))
+    print(f"   결과: {list(values)}")
+    assert abs(values[0] - 30000) <= 20 and abs(values[1] - 12000) <= 20
+
+    print("\n[3] 짝수 샘플 중앙값")
+    scanner = ADCScanner([3], samples=4)
+    values = scanner.scan(make_convert({3: 1000}, [0, 10, 20, 30]))
+    assert values[0] == 1015, f"예상: 1015, 실제: {values[0]}"
+
+    print("\n[4] 버퍼 재사용 (두 번째 스캔도 같은 결과)")
+    scanner = ADCScanner([0, 1], samples=9)
+    convert = make_convert(base, spikes)
+    first = list(scanner.scan(convert))
+    second = list(scanner.scan(convert))
+    assert first == second == [30000, 12000]
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_adc_scan()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
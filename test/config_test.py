@@ -0,0 +1,205 @@
+"""
+설정 파일 테스트
+
+TOML/JSON 읽기, 기본값/디바이스별 덮어쓰기, 잘못된 값 거부(위치 포함 메시지), 읽기 전용 객체,
+SIGHUP 다시 읽기(튜닝값만 바로 반영, 재시작 필요 항목은 경고 후 무시, 실패 시 기존 설정 유지,
+메인 스레드가 락을 잡은 중간에 와도 교착 없음)를 확인합니다.
+"""
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+from hal.backend import set_backend, SIM
+
+set_backend(SIM)
+
+from service.config import (  # noqa: E402
+    load_config, parse_config, restart_required, ConfigReloader, MODEL_PROFILES,
+)
+from service.control_engine import ControlEngine, make_rules  # noqa: E402
+from service.water_tank_monitor import WaterTankMonitor  # noqa: E402
+from mqtt.preset import Preset  # noqa: E402
+
+TOML = """
+broker = "10.0.0.5"
+interval = 5
+
+[water_tank]
+alert_cooldown = 120
+
+[control]
+led_hours = [6, 20]
+
+[control.margins]
+temp = 1.5
+
+[[devices]]
+serial = "A4010"
+
+[devices.slots.2]
+heater_mode = "pid"
+actuators = { heater = [16, 17], led = [27, 25, 18], water_ib1 = 5, water_ib2 = 6, fan = [20, 12], servo = 21 }
+sensors = { dht11_pin = "D22", photo_channel = 0, soil_channel = 1, co2_port = "/dev/ttyUSB0" }
+
+[devices.water_tank]
+supply_tank_height = 35
+"""
+
+
+def device_entry(**changes):
+    entry = {
+        "serial": "B1003",
+        "slots": {"1": {"actuators": {"heater": 16, "led": 27, "water_ib1": 5, "water_ib2": 6, "fan": 20},
+                        "sensors": {"dht11_pin": 22, "photo_channel": 0, "soil_channel": 1}}},
+    }
+    entry.update(changes)
+    return entry
+
+
+def expect_error(data, text):
+    try:
+        parse_config(data)
+    except ValueError as e:
+        assert text in str(e), f"실제: {e}"
+        return
+    raise AssertionError(f"ValueError 없음: {text}")
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_config():
+    print("=" * 70)
+    print("⚙️  설정 파일 테스트")
+    print("=" * 70)
+
+    tmp = tempfile.mkdtemp()
+
+    print("\n[1] TOML 읽기 (최상위 기본값 + 디바이스별 덮어쓰기)")
+    path = os.path.join(tmp, "farm.toml")
+    write(path, TOML)
+    config = load_config(path)
+    device = config.devices[0]
+    assert device.model == "A4" and device.has_co2 and device.slot_numbers == [2]
+    assert device.broker == "10.0.0.5" and device.interval == 5
+    assert device.water_tank.supply_tank_height == 35 and device.water_tank.alert_cooldown == 120
+    assert device.control.led_hours == (6, 20)
+    assert device.control.margins['temp'] == 1.5 and device.control.margins['soil_dry'] == 500.0
+    assert device.actuator_pin_map[2]['heater'] == (16, 17)
+    assert device.sensor_pin_map[2]['dht11_pin'].id == 22
+    assert device.heater_mode_map == {2: "pid"}
+
+    print("\n[2] JSON도 같은 구조, 같은 내용이면 같은 객체")
+    json_path = os.path.join(tmp, "farm.json")
+    write(json_path, json.dumps({"devices": [device_entry()]}))
+    assert load_config(json_path) == parse_config({"devices": [device_entry()]})
+    assert load_config(json_path).devices[0].sensor_pin_map[1]['co2_port'] is None
+
+    print("\n[3] 읽기 전용")
+    for target, name in ((config, 'broker'), (device, 'interval'), (device.control, 'led_hours')):
+        try:
+            setattr(target, name, 1)
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError(f"{type(target).__name__}.{name} 변경됨")
+    try:
+        device.control.margins['temp'] = 9
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("margins 변경됨")
+    assert not hasattr(device, '__dict__')
+
+    print("\n[4] 잘못된 값은 위치와 함께 거부")
+    expect_error({"devices": [device_entry(intervall=3)]}, "알 수 없는 항목 ['intervall']")
+    expect_error({"devices": [device_entry()], "water_tank": {"supply_low_threshold": 30}},
+                 "water_tank.supply_low_threshold: 범위")
+    expect_error({"devices": [device_entry()], "control": {"led_hours": [8, 25]}}, "control.led_hours")
+    expect_error({"devices": [device_entry()], "control": {"margins": {"tmp": 1}}}, "margins: 알 수 없는 항목")
+    bad = device_entry()
+    bad['slots']['1']['sensors']['photo_channel'] = 8
+    expect_error({"devices": [bad]}, "slots.1.sensors.photo_channel: 범위")
+    bad = device_entry()
+    del bad['slots']['1']['actuators']['fan']
+    expect_error({"devices": [bad]}, "slots.1.actuators.fan: 설정이 없음")
+    expect_error({"devices": [device_entry(payload_encoding="xml")]}, "payload_encoding")
+    write(os.path.join(tmp, "bad.toml"), "interval = ")
+    try:
+        load_config(os.path.join(tmp, "bad.toml"))
+    except ValueError as e:
+        assert "bad.toml" in str(e)
+    else:
+        raise AssertionError("TOML 형식 오류 통과")
+
+    print("\n[5] 모델 프로필 추가")
+    custom = parse_config({"models": {"c2": {"slots": [1, 2], "has_co2": True}},
+                           "devices": [device_entry(serial="C2001")]})
+    assert custom.devices[0].model == "C2" and custom.devices[0].has_co2
+    assert "C2" not in MODEL_PROFILES  # 기본 프로필은 그대로
+
+    print("\n[6] LED 시간대는 규칙 테이블, 여유값은 프리셋 임계값에 반영")
+    engine = ControlEngine(make_rules(device.control.led_hours))
+    preset = Preset().with_margins(device.control.margins)
+    assert preset.temp_low == 23.5
+    states = {'led': [False]}
+    columns = {'light': [0], 'temp': [None], 'humidity': [None], 'soil': [None], 'co2': [None], 'blocked': [False]}
+    assert [d.rule for d in engine.evaluate(columns, [preset], states, hour=7)] == ['led_dark']
+    assert engine.evaluate(columns, [preset], states, hour=21) == []
+
+    print("\n[7] SIGHUP 다시 읽기 (튜닝값만 반영, 실패 시 기존 설정 유지)")
+    monitor = WaterTankMonitor(None, "A4010", config=device.water_tank)
+    applied = []
+
+    def apply(new_config):
+        monitor.configure(new_config.devices[0].water_tank)
+        applied.append(new_config)
+
+    reloader = ConfigReloader(path, config, apply)
+    assert reloader.install()
+    write(path, TOML.replace("alert_cooldown = 120", "alert_cooldown = 30").replace('"10.0.0.5"', '"10.0.0.6"'))
+    assert restart_required(config, load_config(path)) == ['broker', 'A4010.broker']
+    start = time.monotonic()
+    os.kill(os.getpid(), signal.SIGHUP)
+    while not applied and time.monotonic() - start < 1.0:
+        time.sleep(0.01)
+    assert applied and monitor.alert_cooldown == 30, f"쿨다운: {monitor.alert_cooldown}"
+    assert reloader.config.devices[0].water_tank.alert_cooldown == 30
+
+    write(path, "interval = ")
+    assert not reloader.reload()
+    assert reloader.config.devices[0].water_tank.alert_cooldown == 30 and len(applied) == 1
+
+    print("\n[8] 메인 스레드가 락을 잡은 중간에 SIGHUP이 와도 교착 없음 (다시 읽기는 별도 스레드)")
+    busy = threading.Lock()  # 로그 필터 락처럼 메인 스레드와 반영 작업이 같이 잡는 락
+
+    def apply_locked(new_config):
+        with busy:
+            apply(new_config)
+
+    reloader.apply = apply_locked
+    write(path, TOML.replace("alert_cooldown = 120", "alert_cooldown = 45"))
+    try:
+        with busy:
+            os.kill(os.getpid(), signal.SIGHUP)
+            time.sleep(0.05)  # 핸들러 실행 (예전에는 여기서 멈춤)
+            assert len(applied) == 1
+        start = time.monotonic()
+        while len(applied) < 2 and time.monotonic() - start < 1.0:
+            time.sleep(0.01)
+        assert monitor.alert_cooldown == 45, f"쿨다운: {monitor.alert_cooldown}"
+    finally:
+        signal.signal(signal.SIGHUP, signal.SIG_DFL)
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_config()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,81 @@
+"""
+규칙 테이블 제어 엔진 테스트
+
+하드웨어 없이 가짜 액추에이터로 여러 슬롯을 한 번에 평가했을 때
+바뀌어야 하는 액추에이터만 변경되는지 확인합니다.
+"""
+from mqtt.preset import Preset
+from service.control_engine import ControlEngine, Rule, DEFAULT_RULES
+
+
+def evaluate(engine, rows, presets, states, hour=12, blocked=None):
+    columns = {metric: [row.get(metric) for row in rows] for metric in ('temp', 'humidity', 'light', 'soil', 'co2')}
+    columns['blocked'] = blocked or [False] * len(rows)
+    return {(d.index, d.actuator): d.state for d in engine.evaluate(columns, presets, states, hour=hour)}
+
+
+def all_off(n, servo=True):
+    states = {a: [False] * n for a in ('heater', 'fan', 'pump', 'led')}
+    states['co2_servo'] = [False if servo else None] * n
+    return states
+
+
+def test_control_engine():
+    print("=" * 70)
+    print("⚙️  규칙 테이블 제어 엔진 테스트")
+    print("=" * 70)
+
+    engine = ControlEngine()
+    preset = Preset()  # 25도, 습도 60, 조도 3000, 토양 2000, CO2 800
+
+    print("\n[1] 슬롯별로 다른 상황을 한 번에 평가")
+    rows = [
+        {'temp': 20.0, 'humidity': 60.0, 'light': 3000, 'soil': 2000, 'co2': 800},  # 추움
+        {'temp': 30.0, 'humidity': 60.0, 'light': 3000, 'soil': 2000, 'co2': 800},  # 더움
+        {'temp': 25.0, 'humidity': 80.0, 'light': 2000, 'soil': 2600, 'co2': 500},  # 습함/어두움/건조/CO2 낮음
+        {'temp': 25.0, 'humidity': 60.0, 'light': 3000, 'soil': 2000, 'co2': 800},  # 정상
+    ]
+    diffs = evaluate(engine, rows, [preset] * 4, all_off(4))
+    print(f"   변경: {diffs}")
+    assert diffs == {
+        (0, 'heater'): True,
+        (1, 'fan'): True,
+        (2, 'fan'): True, (2, 'led'): True, (2, 'pump'): True, (2, 'co2_servo'): True,
+    }
+
+    print("\n[2] 히스테리시스 구간에서는 상태 유지 (변경 없음)")
+    states = all_off(1)
+    states['pump'] = [True]
+    diffs = evaluate(engine, [{'soil': 2300}], [preset], states)
+    assert diffs == {}, f"실제: {diffs}"
+
+    print("\n[3] 물탱크 차단이 토양 규칙보다 우선")
+    diffs = evaluate(engine, [{'soil': 2600}], [preset], states, blocked=[True])
+    assert diffs == {(0, 'pump'): False}
+
+    print("\n[4] 시간대 규칙 (22시~8시 LED 끄기)")
+    states = all_off(1)
+    states['led'] = [True]
+    assert evaluate(engine, [{'light': 100}], [preset], states, hour=23) == {(0, 'led'): False}
+    assert evaluate(engine, [{'light': 100}], [preset], states, hour=12) == {}
+
+    print("\n[5] 서보 없는 슬롯은 CO2 규칙 무시")
+    assert evaluate(engine, [{'co2': 100}], [preset], all_off(1, servo=False)) == {}
+
+    print("\n[6] 규칙 추가 (높은 우선순위로 덮어쓰기)")
+    frost = Rule('heater_frost', 'heater', True, 50, (('temp', '<', 5.0),))
+    engine = ControlEngine(DEFAULT_RULES + (frost,))
+    states = all_off(1)
+    low = Preset({'OptimalTemp': 0})
+    diffs = evaluate(engine, [{'temp': 3.0}], [low], states)
+    assert diffs[(0, 'heater')] is True, f"실제: {diffs}"
+    assert (0, 'heater') not in evaluate(ControlEngine(), [{'temp': 3.0}], [low], states)
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_control_engine()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,162 @@
+"""
+게이트웨이 모드 테스트
+
+시뮬레이션 HAL과 로컬 브로커로 슬롯 번호가 겹치는 디바이스 2대를 프로세스 하나에서 실행해서
+설정 검증(핀/시리얼 중복, 모델에 없는 슬롯), 브로커 연결 공유, 디바이스별 센서 캐시/이력 분리,
+디바이스별 센서 데이터 전송, 두 디바이스의 일괄 제어 동시 실행(공유 GPIO 출력 뱅크)을 확인합니다.
+"""
+import asyncio
+import copy
+import threading
+import time
+from hal.backend import set_backend, SIM
+
+set_backend(SIM)
+
+from hal import sim  # noqa: E402
+from benchmarks.local_broker import LocalBroker  # noqa: E402
+from mqtt.mqtt_connection import set_client_factory  # noqa: E402
+from service.config import parse_config  # noqa: E402
+from service.control_engine import control_all  # noqa: E402
+from mqtt.preset import Preset  # noqa: E402
+from service.gateway import Gateway  # noqa: E402
+from service.sensor_history import get_history  # noqa: E402
+from service import read_sensors  # noqa: E402
+
+
+def slot_config(base, dht11_pin, photo_channel):
+    return {
+        "actuators": {"heater": [base, base + 1], "led": [base + 2, base + 3, base + 4],
+                      "water_ib1": base + 5, "water_ib2": base + 6, "fan": [base + 7, base + 8]},
+        "sensors": {"dht11_pin": dht11_pin, "photo_channel": photo_channel, "soil_channel": photo_channel + 1,
+                    "co2_port": f"/dev/sim{base}"},
+    }
+
+
+CONFIG = {
+    "gateway_id": "GW-TEST",
+    "broker": "local",
+    "interval": 0.2,
+    "devices": [
+        {"serial": "A1901", "slots": {"1": slot_config(300, 4, 0)}, "water_tank_pin": 26},
+        {"serial": "B1902", "slots": {"1": slot_config(320, "D5", 2)}, "water_tank_pin": 26},
+    ],
+}
+
+
+def expect_error(data, text):
+    try:
+        parse_config(data)
+    except ValueError as e:
+        assert text in str(e), f"실제: {e}"
+        return
+    raise AssertionError(f"ValueError 없음: {text}")
+
+
+def test_gateway():
+    print("=" * 70)
+    print("🛰️  게이트웨이 모드 테스트")
+    print("=" * 70)
+
+    print("\n[1] 설정 변환 (모델 판별, 핀 변환, 기본값)")
+    config = parse_config(CONFIG)
+    a, b = config.devices
+    assert a.has_co2 and not b.has_co2
+    assert b.sensor_pin_map[1]['co2_port'] is None  # 일반형은 CO2 포트 무시
+    assert a.sensor_pin_map[1]['dht11_pin'].id == 4 and b.sensor_pin_map[1]['dht11_pin'].id == 5
+    assert a.broker == "local" and a.interval == 0.2
+
+    print("\n[2] 잘못된 설정은 시작 전에 거부")
+    bad = copy.deepcopy(CONFIG)
+    bad['devices'][1]['slots']['1']['actuators']['fan'] = [301, 340]
+    expect_error(bad, "GPIO 301 중복")
+    bad = copy.deepcopy(CONFIG)
+    bad['devices'][1]['serial'] = "A1901"
+    expect_error(bad, "시리얼 중복")
+    bad = copy.deepcopy(CONFIG)
+    bad['devices'][1]['slots']['2'] = slot_config(360, 6, 4)
+    expect_error(bad, "모델 B1에 없는 슬롯 2")
+    expect_error({"devices": []}, "devices")
+
+    print("\n[3] 디바이스 2대를 공유 연결 하나로 실행")
+    sim.reset_world(latency_scale=0)
+    broker = LocalBroker()
+    broker.add_preset_responder()
+    published = {}
+    broker.add_observer("smartfarm/+/sensor/#",
+                        lambda topic, payload: published.setdefault(topic.split('/')[1], 0))
+    set_client_factory(broker.client)
+    gateway = Gateway(config)
+    try:
+        gateway.setup()
+        assert len(gateway.connections) == 1
+        assert gateway.slot_count() == 2
+        gateway.request_presets()
+        assert gateway.wait_presets(timeout=2.0), "프리셋 응답 없음"
+
+        async def run_briefly():
+            task = asyncio.ensure_future(gateway.run())
+            deadline = time.monotonic() + 3.0
+            while len(published) < 2 and time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+            gateway.stop()
+            await task
+
+        asyncio.run(run_briefly())
+        assert set(published) == {"A1901:1", "B1902:1"}, f"실제: {published}"
+        assert all(loop.cycle_count >= 1 for loop in gateway.loops)
+        assert gateway.loops[0].executor is gateway.loops[1].executor  # 스레드 풀 공유
+
+        print("\n[4] 슬롯 번호가 같아도 디바이스별 센서 캐시/이력 분리")
+        assert {"A1901:1", "B1902:1"} <= set(read_sensors._dht11_caches)
+        assert set(read_sensors._co2_caches) == {"A1901:1"}
+        history = get_history()
+        assert history.stats("A1901:1", 'light') is not None
+        assert history.stats("B1902:1", 'light') is not None
+
+        print("\n[5] 두 디바이스의 일괄 제어가 동시에 실행돼도 둘 다 적용 (공유 출력 뱅크)")
+        inside = threading.Barrier(2, timeout=2.0)
+        hot = Preset.from_payload("OptimalTemp=60")
+        row = {'temp': 20.0, 'humidity': 60.0, 'light': 3000, 'soil': 2000, 'co2': None}
+        errors = []
+
+        def control(device):
+            controller = device.controllers[1]
+            controller.heater.turn_off()
+            apply = controller.apply
+            waited = []
+
+            def apply_together(*args):
+                if not waited:
+                    waited.append(True)
+                    inside.wait()  # 다른 디바이스도 batch 안에 들어올 때까지
+                apply(*args)
+
+            controller.apply = apply_together
+            try:
+                control_all([controller], [row], [hot])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                del controller.apply
+
+        threads = [threading.Thread(target=control, args=(device,)) for device in gateway.devices]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors, f"실제: {errors}"
+        assert all(device.controllers[1].heater.is_on for device in gateway.devices)
+    finally:
+        gateway.close()
+        set_client_factory(None)
+    assert not read_sensors._dht11_caches
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_gateway()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,115 @@
+"""
+GPIO 출력 뱅크 테스트
+
+하드웨어 없이 가짜 GPIO 모듈로 섀도 레지스터가
+같은 값 쓰기를 생략하고, batch 구간의 변경을 한 번의 호출로 적용하는지 확인합니다.
+"""
+import threading
+from Actuator.gpio_output import GPIOOutputBank, HIGH, LOW
+from Actuator.heater import Heater
+from Actuator.water_pump import WaterPump
+
+
+class FakeGPIO:
+    BCM = 11
+    OUT = 0
+
+    def __init__(self):
+        self.calls = []  # (핀 또는 핀 리스트, 값 또는 값 리스트)
+        self.levels = {}
+
+    def setmode(self, mode):
+        pass
+
+    def setup(self, pin, mode, initial=LOW):
+        self.levels[pin] = initial
+
+    def output(self, pins, values):
+        self.calls.append((pins, values))
+        if isinstance(pins, list):
+            self.levels.update(zip(pins, values))
+        else:
+            self.levels[pins] = values
+
+    def cleanup(self, pins):
+        for pin in pins:
+            self.levels.pop(pin, None)
+
+
+def test_gpio_output_bank():
+    print("=" * 70)
+    print("🔌 GPIO 출력 뱅크 테스트")
+    print("=" * 70)
+
+    gpio = FakeGPIO()
+    bank = GPIOOutputBank(gpio)
+    heater = Heater([16, 17], bank=bank)
+    pump = WaterPump(5, 6, bank=bank)
+
+    print("\n[1] 여러 핀 액추에이터는 한 번의 호출로 씀")
+    heater.turn_on()
+    assert gpio.calls == [([16, 17], [HIGH, HIGH])], f"실제: {gpio.calls}"
+
+    print("\n[2] 같은 값 다시 쓰기는 생략")
+    heater.turn_on()
+    pump.turn_off()
+    assert len(gpio.calls) == 1
+    assert bank.skipped == 4
+
+    print("\n[3] batch 구간의 변경은 끝에서 한 번에 적용")
+    gpio.calls.clear()
+    with bank.batch():
+        heater.turn_off()
+        pump.turn_on()
+        heater.turn_on()  # 같은 사이클 안에서 되돌림 -> 쓰기 없음
+        assert gpio.calls == []
+        assert bank.level(16) == HIGH
+    assert gpio.calls == [(5, HIGH)], f"실제: {gpio.calls}"
+    assert gpio.levels[5] == HIGH and gpio.levels[6] == LOW
+
+    print("\n[4] batch 중 다른 스레드(비상 정지)의 쓰기는 즉시 적용되고 대기 값을 버림")
+    pump.turn_off()
+    gpio.calls.clear()
+    with bank.batch():
+        pump.turn_on()  # 제어 사이클에서 대기
+        t = threading.Thread(target=pump.turn_off)
+        t.start()
+        t.join()
+    assert gpio.calls == [], f"실제: {gpio.calls}"
+    assert gpio.levels[5] == LOW and not pump.is_on
+
+    print(f"\n통계: {bank.stats()}")
+    assert bank.write_count == 3
+
+    print("\n[5] 여러 스레드가 동시에 batch 해도 각자의 변경을 모두 적용")
+    gpio.calls.clear()
+    inside = threading.Barrier(2, timeout=2.0)
+    errors = []
+
+    def control(actuator):
+        try:
+            with bank.batch():
+                actuator.turn_on() if not actuator.is_on else actuator.turn_off()
+                inside.wait()  # 두 스레드가 모두 batch 안에 있을 때까지 (예전에는 RuntimeError)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=control, args=(actuator,)) for actuator in (heater, pump)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, f"실제: {errors}"
+    assert gpio.levels[16] == LOW and gpio.levels[5] == HIGH, f"실제: {gpio.calls}"
+    assert len(gpio.calls) == 2
+
+    heater.cleanup()
+    assert bank.level(16) is None
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_gpio_output_bank()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,65 @@
+"""
+시뮬레이션 HAL 테스트
+
+파형 스크립트, seed 고정 재현성, MCP3008 SPI 응답, 지연 재현을 확인합니다.
+(SMARTFARM_HAL=sim 으로 실행하면 sensor/, Actuator/ 드라이버가 이 모듈을 사용)
+"""
+import time
+from hal import sim
+
+
+def test_hal_sim():
+    print("=" * 70)
+    print("🧪 시뮬레이션 HAL 테스트")
+    print("=" * 70)
+
+    print("\n[1] 파형 스크립트")
+    world = sim.reset_world(seed=1, latency_scale=0)
+    world.failure_rate['dht11'] = 0.0
+    world.set_signal('temp', 22, sim.steps([(0, 20.0), (3600, 30.0)]))
+    world.set_signal('humidity', 22, 55)
+    dht = sim.DHT11(sim.board.D22)
+    assert (dht.temperature, dht.humidity) == (20.0, 55)
+    ramp = sim.ramp(0.0, 10.0, 100.0)
+    assert ramp(50) == 5.0 and ramp(200) == 10.0
+
+    print("\n[2] 같은 seed면 같은 실패 순서")
+    def failures(seed):
+        w = sim.reset_world(seed=seed, latency_scale=0)
+        return [w.fails('dht11', 22) for _ in range(50)]
+    assert failures(7) == failures(7)
+    assert 0 < sum(failures(7)) < 50
+
+    print("\n[3] MCP3008 SPI 응답")
+    world = sim.reset_world(latency_scale=0)
+    world.set_signal('adc', 3, 700)
+    spi = sim.SPI()
+    out_buf = bytearray([0x01, 0x80 | (3 << 4), 0])
+    in_buf = bytearray(3)
+    spi.write_readinto(out_buf, in_buf)
+    assert ((in_buf[1] & 0x03) << 8) | in_buf[2] == 700
+
+    print("\n[4] 지연 재현 (HC-SR04: 샘플 수 x 대기 시간)")
+    sim.reset_world(latency_scale=1.0).set_signal('distance', 23, 50.0)
+    start = time.perf_counter()
+    distance = sim.Measurement(23, 24).raw_distance(sample_size=5, sample_wait=0.01)
+    elapsed = time.perf_counter() - start
+    print(f"   거리 {distance}cm, {elapsed * 1000:.1f}ms")
+    assert distance == 50.0
+    assert elapsed >= 5 * (0.01 + 2 * 50.0 / sim.SPEED_OF_SOUND)
+
+    print("\n[5] GPIO 출력 기록")
+    world = sim.reset_world(latency_scale=0)
+    sim.gpio.setup([5, 6], sim.gpio.OUT, initial=sim.gpio.LOW)
+    sim.gpio.output([5, 6], [1, 0])
+    assert world.outputs == {5: 1, 6: 0}
+    assert world.counters['gpio_output'] == 1
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_hal_sim()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,103 @@
+"""
+로깅 테스트
+
+같은 메시지 반복 억제(생략 횟수 표시), 구조화 필드 출력, RAM 링 버퍼 크기 제한,
+비동기 리스너를 거친 출력과 레벨 필터, 액추에이터별 상태 변경 로그가 서로 억제하지 않는지 확인합니다.
+"""
+import io
+import logging
+import time
+
+from service.log import (
+    FieldFormatter, RateLimitFilter, RingBufferHandler, DEFAULT_FORMAT,
+    configure_logging, shutdown_logging, dump_ring, get_logger, fields,
+)
+from service.actuator_control import ActuatorController
+
+
+def make_record(msg, level=logging.WARNING, **extra):
+    record = logging.LogRecord("smartfarm.test", level, __file__, 0, msg, (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class FakeActuator:
+    def __init__(self):
+        self.is_on = False
+
+    def turn_on(self):
+        self.is_on = True
+
+    def turn_off(self):
+        self.is_on = False
+
+
+def test_log():
+    print("=" * 70)
+    print("📝 로깅 테스트")
+    print("=" * 70)
+
+    print("\n[1] 같은 메시지는 간격 안에서 한 번만 통과")
+    limiter = RateLimitFilter(interval=0.2)
+    passed = [limiter.filter(make_record("급수탱크 수위 낮음", tank="supply")) for _ in range(5)]
+    assert passed == [True, False, False, False, False], f"실제: {passed}"
+    # 슬롯이 다르면 다른 메시지
+    assert limiter.filter(make_record("급수탱크 수위 낮음", slot=2))
+    time.sleep(0.25)
+    record = make_record("급수탱크 수위 낮음", tank="supply")
+    assert limiter.filter(record)
+    assert record.suppressed == 4, f"생략 횟수: {record.suppressed}"
+
+    print("\n[2] 구조화 필드와 생략 횟수 출력")
+    formatter = FieldFormatter("%(levelname)s %(message)s%(fields)s")
+    line = formatter.format(record)
+    assert line == "WARNING 급수탱크 수위 낮음 tank=supply repeated=4", f"실제: {line}"
+    assert fields(slot=1, value=None) == {'slot': 1}
+
+    print("\n[3] 링 버퍼는 최근 N줄만 보관")
+    ring = RingBufferHandler(capacity=3)
+    ring.setFormatter(FieldFormatter(DEFAULT_FORMAT))
+    for i in range(5):
+        ring.handle(make_record(f"메시지 {i}", level=logging.INFO, slot=1))
+    lines = ring.lines()
+    assert len(lines) == 3 and lines[-1].endswith("메시지 4 slot=1"), f"실제: {lines}"
+
+    print("\n[4] 비동기 리스너 + 레벨 필터 (DEBUG는 INFO 설정에서 버려짐)")
+    configure_logging(level="INFO", sink="ram", rate_limit=60, console_level=None)
+    log = get_logger("test")
+    for value in range(100):
+        log.debug("주기 센서값", extra=fields(slot=1, sensor="DHT11", value=value))
+        log.warning("센서 읽기 실패", extra=fields(slot=1, sensor="DHT11"))
+    log.info("액추에이터 ON", extra=fields(actuator="fan", rule="fan_on"))
+    shutdown_logging()  # 큐에 남은 로그를 모두 씀
+    out = io.StringIO()
+    assert dump_ring(out) == 2, f"실제: {out.getvalue()}"
+    text = out.getvalue()
+    assert "센서 읽기 실패 slot=1 sensor=DHT11" in text
+    assert "actuator=fan rule=fan_on" in text
+    assert "주기 센서값" not in text
+    assert logging.getLogger("smartfarm").propagate
+
+    print("\n[5] 액추에이터/슬롯이 다른 상태 변경 로그는 서로 억제하지 않음")
+    configure_logging(level="INFO", sink="ram", rate_limit=60, console_level=None)
+    controllers = [ActuatorController(FakeActuator(), FakeActuator(), FakeActuator(), FakeActuator(), None,
+                                      slot=slot, device="A4777") for slot in (1, 2)]
+    controllers[0].apply('heater', True, 'heater_on')
+    controllers[0].apply('fan', True, 'fan_on')
+    controllers[0].apply('heater', False, 'heater_off')
+    controllers[1].apply('heater', True, 'heater_on')
+    shutdown_logging()
+    out = io.StringIO()
+    assert dump_ring(out) == 4, f"실제: {out.getvalue()}"
+    lines = out.getvalue().splitlines()
+    assert "액추에이터 ON slot=1 actuator=heater device=A4777 rule=heater_on" in lines[0], f"실제: {lines}"
+    assert "actuator=fan" in lines[1] and "액추에이터 OFF" in lines[2] and "slot=2" in lines[3]
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_log()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,89 @@
+"""
+주기 계측(히스토그램) 테스트
+
+고정 버킷 히스토그램, 꺼져 있을 때의 공용 타이머, 데코레이터, 게이지,
+저장소 락을 잡은 중간에 SIGUSR1이 와도 교착되지 않는지 확인합니다.
+"""
+import io
+import json
+import os
+import signal
+import time
+from service import metrics
+from service.metrics import Histogram, BUCKET_BOUNDS_MS
+
+
+def test_metrics():
+    print("=" * 70)
+    print("⏱️  주기 계측 테스트")
+    print("=" * 70)
+
+    print("\n[1] 고정 버킷 히스토그램")
+    h = Histogram()
+    for ms in [0.05, 3, 3, 4, 80, 20000]:
+        h.observe(ms)
+    assert h.count == 6 and h.min == 0.05 and h.max == 20000
+    assert h.counts[0] == 1 and h.counts[BUCKET_BOUNDS_MS.index(5)] == 3
+    assert h.counts[-1] == 1  # 10초 초과
+    assert h.percentile(50) == 5
+    assert h.percentile(99) == 20000
+
+    print("\n[2] 꺼져 있으면 기록하지 않음 (공용 타이머)")
+    registry = metrics.get_registry()
+    metrics.enable_metrics(False)
+    registry.reset()
+    assert metrics.timer("a") is metrics.timer("b")
+    with metrics.timer("off"):
+        pass
+    metrics.increment("off.count")
+    assert metrics.snapshot()['timers'] == {} and metrics.snapshot()['counters'] == {}
+
+    print("\n[3] 켜면 구간/함수 시간 기록")
+    metrics.enable_metrics()
+    try:
+        @metrics.timed("fn")
+        def work(x):
+            return x * 2
+
+        with metrics.timer("block"):
+            assert work(2) == 4
+        metrics.increment("calls", 2)
+        metrics.register_gauge("answer", lambda: 42)
+        snap = metrics.snapshot()
+        assert snap['timers']['fn']['count'] == 1
+        assert snap['timers']['block']['count'] == 1
+        assert snap['counters'] == {'calls': 2}
+        assert snap['gauges']['answer'] == 42
+
+        print("\n[4] JSON 출력 (SIGUSR1 덤프와 같은 형식)")
+        out = io.StringIO()
+        metrics.dump(out)
+        assert json.loads(out.getvalue())['timers']['block']['count'] == 1
+
+        print("\n[5] 저장소 락을 잡은 중간에 SIGUSR1이 와도 교착 없음 (출력은 별도 스레드)")
+        out = io.StringIO()
+        assert metrics.install_dump_signal(stream=out)
+        try:
+            with registry._lock:  # observe() 도중 시그널이 온 상황
+                os.kill(os.getpid(), signal.SIGUSR1)
+                time.sleep(0.05)  # 핸들러 실행 (예전에는 여기서 멈춤)
+                assert out.getvalue() == ""
+            deadline = time.monotonic() + 2.0
+            while not out.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert json.loads(out.getvalue())['timers']['block']['count'] == 1
+        finally:
+            signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+    finally:
+        metrics.enable_metrics(False)
+        registry.unregister_gauge("answer")
+        registry.reset()
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_metrics()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
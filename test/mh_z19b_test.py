@@ -0,0 +1,102 @@
+"""
+MH-Z19B CO2 센서 드라이버 테스트
+
+9바이트 프레임/체크섬, 시뮬레이션 시리얼 포트(hal/sim.py) 여러 개를 리더 스레드 하나로 동시에 읽기,
+깨진 응답/응답 없음 처리, 센서 캐시가 응답을 기다리지 않는지 확인합니다.
+"""
+import threading
+import time
+from types import SimpleNamespace
+from hal.backend import set_backend, SIM
+
+set_backend(SIM)
+
+from hal import sim  # noqa: E402
+from sensor.MH_Z19B import (  # noqa: E402
+    MHZ19Reader, CO2Sensor, READ_CO2_FRAME, checksum, parse_co2_response,
+)
+from service.sensor_cache import SensorCache  # noqa: E402
+from service.sensor_scheduler import SensorScheduler  # noqa: E402
+
+
+class SilentSerial(sim.Serial):
+    """응답하지 않는 포트 (센서 미연결)"""
+
+    def write(self, data):
+        return len(data)
+
+
+def test_mh_z19b():
+    print("=" * 70)
+    print("🫧 MH-Z19B CO2 센서 드라이버 테스트")
+    print("=" * 70)
+
+    print("\n[1] 명령/응답 프레임")
+    assert READ_CO2_FRAME == bytes.fromhex("ff0186000000000079")
+    response = bytearray.fromhex("ff86027f4700000000")
+    response[8] = checksum(response)
+    assert parse_co2_response(bytes(response)) == 0x027F
+    response[8] ^= 0x01
+    try:
+        parse_co2_response(bytes(response))
+        assert False, "체크섬 오류를 놓침"
+    except ValueError:
+        pass
+
+    print("\n[2] 포트 2개를 리더 스레드 하나로 동시에 읽기 (포트는 한 번만 열림)")
+    world = sim.reset_world(latency_scale=1.0)
+    world.set_signal('co2', '/dev/simA', 650)
+    world.set_signal('co2', '/dev/simB', 1200)
+    reader = MHZ19Reader(timeout=0.5)
+    sensors = [CO2Sensor('/dev/simA', reader=reader), CO2Sensor('/dev/simB', reader=reader)]
+    start = time.perf_counter()
+    futures = [sensor.read_async() for sensor in sensors for _ in range(3)]
+    results = [future.result(2.0) for future in futures]
+    elapsed = time.perf_counter() - start
+    print(f"   결과: {results}, {elapsed * 1000:.0f}ms")
+    assert results == [650] * 3 + [1200] * 3
+    # 포트별로는 순서대로(30ms x 3), 포트끼리는 동시에
+    assert elapsed < 0.17, f"{elapsed:.3f}s"
+    assert world.counters['serial_open'] == 2
+    assert {t.name for t in threading.enumerate()} >= {"mh-z19-reader"}
+
+    print("\n[3] 깨진 응답은 타임아웃을 기다리지 않고 실패")
+    world.failure_rate['mh_z19'] = 1.0
+    start = time.perf_counter()
+    assert sensors[0].read() is None
+    assert time.perf_counter() - start < 0.3
+    assert reader.bad_frames == 1
+    world.failure_rate['mh_z19'] = 0.0
+    reader.close()
+
+    print("\n[4] 응답이 없으면 타임아웃")
+    silent = MHZ19Reader(timeout=0.1, serial_module=SimpleNamespace(Serial=SilentSerial))
+    try:
+        silent.request('/dev/none').result(1.0)
+        assert False, "타임아웃이 발생하지 않음"
+    except TimeoutError:
+        pass
+    assert silent.timeouts == 1
+    silent.close()
+
+    print("\n[5] 센서 캐시는 응답을 기다리지 않고 완료 시 값 반영")
+    reader = MHZ19Reader(timeout=0.5)
+    cache = SensorCache(CO2Sensor('/dev/simA', reader=reader), "CO2", interval=5.0,
+                        scheduler=SensorScheduler("co2-test"))
+    start = time.perf_counter()
+    delay = cache.poll()
+    assert time.perf_counter() - start < 0.01 and delay == 5.0
+    deadline = time.monotonic() + 2.0
+    while cache.get() is None and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert cache.get() == 650, f"실제: {cache.get()}"
+    reader.close()
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_mh_z19b()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
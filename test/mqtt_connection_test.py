@@ -0,0 +1,86 @@
+"""
+공유 MQTT 연결 테스트
+
+브로커 없이 benchmarks/local_broker.py의 로컬 브로커로
+토픽 라우팅(와일드카드 포함), 재연결 시 재구독, 오프라인 대기열 재전송
+(저장 도중 연결된 경우 포함)을 확인합니다.
+"""
+import time
+from benchmarks.local_broker import LocalBroker
+from mqtt.mqtt_connection import MqttConnection, topic_matches
+from mqtt.offline_queue import OfflineQueue
+
+
+def wait_until(condition, timeout=5.0):
+    """조건이 참이 될 때까지 대기 (재전송 스레드 내부 상태 대신 관찰 가능한 결과로 확인)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_mqtt_connection():
+    print("=" * 70)
+    print("📡 공유 MQTT 연결 테스트")
+    print("=" * 70)
+
+    print("\n[1] 토픽 필터 일치 규칙")
+    assert topic_matches("smartfarm/+/sensor/#", "smartfarm/A1:1/sensor/data")
+    assert topic_matches("smartfarm/#", "smartfarm")
+    assert not topic_matches("smartfarm/+/preset", "smartfarm/A1:1/preset/response")
+    assert not topic_matches("smartfarm/+", "smartfarm/A1/x")
+
+    print("\n[2] 토픽별 핸들러 라우팅")
+    broker = LocalBroker()
+    connection = MqttConnection("local", client_factory=broker.client)
+    received = []
+    connection.subscribe("smartfarm/A1:1/preset", lambda c, u, m: received.append(("exact", m.payload)))
+    connection.subscribe("smartfarm/+/preset", lambda c, u, m: received.append(("wild", m.payload)))
+    sender = broker.client()
+    sender.reconnect()
+    sender.publish("smartfarm/A1:1/preset", "OptimalTemp=20")
+    broker.wait_idle()
+    assert received == [("exact", b"OptimalTemp=20")], f"실제: {received}"
+
+    print("\n[3] 연결이 끊긴 동안 대기열에 저장, 재연결 시 재구독 + 재전송")
+    queue = OfflineQueue(":memory:")
+    offline = MqttConnection("local", offline_queue=queue, client_factory=broker.client, drain_rate=10000)
+    sink = []
+    sender.subscribe("smartfarm/+/sensor/data")
+    sender.on_message = lambda c, u, m: sink.append(m.payload)
+    offline.client.disconnect(rc=1)
+    assert offline.publish("smartfarm/A1:1/sensor/data", "temp=20", stamp=True) is False
+    assert len(queue) == 1
+    offline.client.reconnect()
+    assert wait_until(lambda: len(queue) == 0 and sink), f"남은 {len(queue)}건, 수신 {sink}"
+    assert sink[0].startswith(b"temp=20;ts="), f"실제: {sink}"
+
+    print("\n[4] 저장하는 사이에 연결돼도 다음 재연결을 기다리지 않고 재전송")
+    sink.clear()
+    offline.client.disconnect(rc=1)
+    put = queue.put
+
+    def put_after_connect(*args, **kwargs):
+        offline.client.reconnect()  # 연결 시 재전송 확인은 아직 빈 대기열을 봄
+        put(*args, **kwargs)
+
+    queue.put = put_after_connect
+    try:
+        assert offline.publish("smartfarm/A1:1/sensor/data", "temp=21") is False
+    finally:
+        del queue.put
+    assert wait_until(lambda: len(queue) == 0 and sink), f"남은 {len(queue)}건"
+    assert sink == [b"temp=21"], f"실제: {sink}"
+
+    connection.close()
+    offline.close()
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_mqtt_connection()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,59 @@
+"""
+오프라인 전송 대기열 테스트
+
+브로커 없이 SQLite 대기열의 순서 보존, 용량 초과 시 오래된 메시지 삭제,
+재시작 후 복원, 원래 시각 보존을 확인합니다.
+"""
+import os
+import tempfile
+from mqtt.offline_queue import OfflineQueue, stamped_payload
+
+
+def test_offline_queue():
+    print("=" * 70)
+    print("📦 오프라인 전송 대기열 테스트")
+    print("=" * 70)
+
+    print("\n[1] 오래된 순서대로 꺼내기")
+    queue = OfflineQueue(":memory:", max_messages=100)
+    for i in range(5):
+        queue.put("smartfarm/A1001:1/sensor/data", f"temp={20 + i}", qos=0, stamp=True, created_at=1000.0 + i)
+    rows = queue.peek(3)
+    assert [r[2] for r in rows] == [b"temp=20", b"temp=21", b"temp=22"]
+    queue.remove([r[0] for r in rows])
+    assert len(queue) == 2
+    assert queue.peek(10)[0][2] == b"temp=23"
+
+    print("\n[2] 최대 개수 초과 시 가장 오래된 메시지부터 삭제")
+    queue = OfflineQueue(":memory:", max_messages=3)
+    for i in range(5):
+        queue.put("t", f"m{i}")
+    print(f"   남은 메시지: {[r[2] for r in queue.peek(10)]}, 버린 메시지: {queue.evicted}")
+    assert [r[2] for r in queue.peek(10)] == [b"m2", b"m3", b"m4"]
+    assert queue.evicted == 2
+
+    print("\n[3] 최대 바이트 초과 시 삭제")
+    queue = OfflineQueue(":memory:", max_messages=100, max_bytes=10)
+    for i in range(4):
+        queue.put("t", "abcd")
+    assert len(queue) == 2, f"실제: {len(queue)}"
+
+    print("\n[4] 재시작 후 복원 + 원래 시각 보존")
+    path = os.path.join(tempfile.mkdtemp(), "queue.db")
+    queue = OfflineQueue(path)
+    queue.put("smartfarm/A1001:1/sensor/data", "temp=24.5", stamp=True, created_at=1700000000.7)
+    queue.close()
+    queue = OfflineQueue(path)
+    assert len(queue) == 1
+    _, topic, payload, qos, created_at, stamp = queue.peek(1)[0]
+    assert stamp and stamped_payload(payload, created_at) == b"temp=24.5;ts=1700000000"
+    queue.close()
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_offline_queue()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
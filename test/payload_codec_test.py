@@ -0,0 +1,46 @@
+"""
+센서 데이터 묶음 인코딩 테스트
+
+text/binary 형식이 같은 값으로 복원되는지, binary가 text보다 작은지 확인합니다.
+"""
+from mqtt.payload_codec import encode_text, encode_binary, decode
+
+
+def test_payload_codec():
+    print("=" * 70)
+    print("📦 센서 데이터 묶음 인코딩 테스트")
+    print("=" * 70)
+
+    batch = {
+        1: {'temp': 24.5, 'humidity': 61.0, 'light': 30000, 'soil': 2100, 'co2': 812, 'age': 3.2},
+        2: {'temp': -3.5, 'humidity': None, 'light': 28000, 'soil': 1900, 'co2': None, 'age': None},
+        3: {'temp': 22.0, 'humidity': 55.0, 'light': 65535, 'soil': 0, 'co2': 5000, 'age': 0.0},
+        4: {'temp': 21.1, 'humidity': 40.0, 'light': 100, 'soil': 4000, 'co2': 400, 'age': 12.5},
+    }
+    expected = {slot: {k: v for k, v in data.items() if v is not None} for slot, data in batch.items()}
+
+    print("\n[1] text 왕복")
+    text = encode_text(batch)
+    print(f"   {text}")
+    assert text.startswith("slot=1;temp=24.5;humidity=61.0;measuredLight=30000")
+    assert decode(text) == expected, f"실제: {decode(text)}"
+    assert decode(text.encode()) == expected
+
+    print("\n[2] binary 왕복")
+    binary = encode_binary(batch)
+    print(f"   {len(binary)} bytes (text {len(text.encode())} bytes)")
+    assert decode(binary) == expected, f"실제: {decode(binary)}"
+    assert len(binary) < len(text.encode()) / 2
+
+    print("\n[3] 범위를 넘는 값은 잘라냄")
+    clipped = decode(encode_binary({1: {'light': 70000, 'soil': -5}}))
+    assert clipped == {1: {'light': 65535, 'soil': 0}}, f"실제: {clipped}"
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_payload_codec()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
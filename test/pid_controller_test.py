@@ -0,0 +1,85 @@
+"""
+PID 히터 제어 테스트
+
+하드웨어 없이 간단한 온실 열 모델로 bang-bang 제어와 PID + 시간 비례 출력을 비교합니다.
+- 적분 누적 제한(anti-windup)
+- 최소 ON/OFF 시간 보장
+- 릴레이 전환 횟수 감소
+"""
+from service.pid_controller import PIDController, TimeProportionalOutput
+
+
+def simulate(controller, minutes=240, step=10.0, setpoint=25.0, ambient=15.0):
+    """
+    열 모델: 히터 ON이면 가열, 항상 외기로 열 손실 (1차 지연 + 센서 지연 없음)
+
+    Returns:
+        (온도 기록, 전환 횟수)
+    """
+    temp = 20.0
+    heater_on = False
+    switches = 0
+    temps = []
+    for i in range(int(minutes * 60 / step)):
+        now = i * step
+        desired = controller(temp, heater_on, now)
+        if desired != heater_on:
+            switches += 1
+            heater_on = desired
+        temp += step * (0.02 * heater_on - 0.001 * (temp - ambient))
+        temps.append(temp)
+    return temps, switches
+
+
+def test_pid_controller():
+    print("=" * 70)
+    print("🔥 PID 히터 제어 테스트")
+    print("=" * 70)
+
+    print("\n[1] 적분 누적 제한 (포화 중에는 적분하지 않음)")
+    pid = PIDController(kp=0.3, ki=0.01)
+    for t in range(0, 3600, 10):
+        out = pid.update(25.0, 10.0, now=t)  # 오차 15도 -> 계속 포화
+    assert out == 1.0
+    assert pid.integral == 0.0, f"실제: {pid.integral}"
+    # 목표 도달 직후 바로 출력이 내려가야 함
+    assert pid.update(25.0, 25.5, now=3610) == 0.0
+
+    print("\n[2] 최소 ON/OFF 시간")
+    pwm = TimeProportionalOutput(window=120, min_on=30, min_off=30)
+    assert pwm.update(0.1, False, now=0) is False  # 12초 ON은 최소 시간 미만 -> OFF
+    assert pwm.update(0.5, False, now=0) is True
+    assert pwm.update(0.0, True, now=10) is True  # 켠 지 10초 -> 유지
+    assert pwm.update(0.0, True, now=40) is False
+    assert pwm.switch_count == 2
+
+    print("\n[3] bang-bang 대비 전환 횟수/온도 흔들림")
+
+    def bangbang(temp, is_on, now):
+        return temp < 23.0  # heater_cold / heater_ok 규칙
+
+    pid = PIDController()
+    pwm = TimeProportionalOutput()
+
+    def pid_mode(temp, is_on, now):
+        return pwm.update(pid.update(25.0, temp, now), is_on, now)
+
+    bb_temps, bb_switches = simulate(bangbang)
+    pid_temps, pid_switches = simulate(pid_mode)
+    # 처음 1시간(가열 구간) 이후만 비교
+    bb_tail, pid_tail = bb_temps[360:], pid_temps[360:]
+    pid_error = sum(abs(t - 25.0) for t in pid_tail) / len(pid_tail)
+    bb_error = sum(abs(t - 25.0) for t in bb_tail) / len(bb_tail)
+    print(f"   bang-bang: 전환 {bb_switches}회, 평균 오차 {bb_error:.2f}도")
+    print(f"   PID:       전환 {pid_switches}회, 평균 오차 {pid_error:.2f}도")
+    assert pid_switches < bb_switches
+    assert pid_error < bb_error
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_pid_controller()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,114 @@
+"""
+프리셋 수신 이벤트 테스트
+
+시뮬레이션 HAL과 로컬 브로커로 프리셋 응답을 폴링 없이 이벤트로 기다리는지,
+주기 중간에 프리셋이 바뀌면 다음 주기를 기다리지 않고 그 슬롯만 바로 다시 제어하는지 확인합니다.
+"""
+import asyncio
+import time
+from hal.backend import set_backend, SIM
+
+set_backend(SIM)
+
+from hal import sim  # noqa: E402
+from benchmarks.local_broker import LocalBroker  # noqa: E402
+from mqtt.mqtt_client import MqttClient  # noqa: E402
+from mqtt.mqtt_connection import MqttConnection, set_client_factory  # noqa: E402
+from service.config import parse_config  # noqa: E402
+from service.device import FarmDevice  # noqa: E402
+from service.read_sensors import stop_sensor_caches  # noqa: E402
+
+CONFIG = {
+    "broker": "local",
+    "interval": 30,  # 테스트 중에 두 번째 주기가 오지 않게
+    "devices": [{
+        "serial": "B1555",
+        "slots": {"1": {"actuators": {"heater": [500, 501], "led": [502, 503, 504], "water_ib1": 505,
+                                      "water_ib2": 506, "fan": [507, 508]},
+                        "sensors": {"dht11_pin": 9, "photo_channel": 4, "soil_channel": 5}}},
+        "water_tank_pin": 13,
+    }],
+}
+
+
+def test_preset_event():
+    print("=" * 70)
+    print("📡 프리셋 수신 이벤트 테스트")
+    print("=" * 70)
+
+    sim.reset_world(latency_scale=0)
+    sim.get_world().failure_rate['dht11'] = 0.0
+    broker = LocalBroker()
+    set_client_factory(broker.client)
+    connection = MqttConnection("local")
+    publisher = broker.client()
+    publisher.connect("local")
+    publisher.loop_start()
+
+    print("\n[1] 응답을 받는 즉시 wait_preset() 반환")
+    broker.add_preset_responder()
+    client = MqttClient("B1555:9", connection=connection)
+    assert not client.wait_preset(0)
+    start = time.monotonic()
+    client.request_preset()
+    assert client.wait_preset(2.0), "프리셋 응답 없음"
+    elapsed = time.monotonic() - start
+    print(f"   응답 대기: {elapsed * 1000:.1f}ms")
+    assert elapsed < 0.5 and client.is_preset_ready()
+
+    print("\n[2] 실시간 변경은 리스너에 알림 (준비 이벤트와 별개)")
+    received = []
+    client.add_preset_listener(received.append)
+    publisher.publish("smartfarm/B1555:9/preset", "OptimalTemp=31")
+    deadline = time.monotonic() + 1.0
+    while not received and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert received and received[0].optimal_temp == 31.0
+    client.remove_preset_listener(received.append)
+    client.close()
+
+    print("\n[3] 주기 중간의 프리셋 변경은 그 슬롯만 바로 다시 제어")
+    device = FarmDevice(parse_config(CONFIG).devices[0], connection)
+    try:
+        device.setup()
+        device.start_sensors()
+        device.request_presets()
+        assert device.wait_sensors(timeout=2.0) == []
+        assert device.wait_presets(timeout=2.0)
+        control_loop = device.create_loop()
+        heater = device.controllers[1].heater
+
+        async def change_preset():
+            task = asyncio.ensure_future(control_loop.run())
+            while control_loop.cycle_count < 1:
+                await asyncio.sleep(0.005)
+            assert not heater.is_on
+            start = time.monotonic()
+            publisher.publish("smartfarm/B1555:1/preset", "OptimalTemp=60")
+            while not heater.is_on and time.monotonic() - start < 1.0:
+                await asyncio.sleep(0.001)
+            elapsed = time.monotonic() - start
+            control_loop.stop()
+            task.cancel()  # 30초 대기 중인 다음 주기는 기다리지 않음
+            return elapsed
+
+        elapsed = asyncio.run(change_preset())
+        print(f"   프리셋 변경 → 히터 켜짐: {elapsed * 1000:.1f}ms")
+        assert heater.is_on, "프리셋 변경이 바로 반영되지 않음"
+        assert control_loop.cycle_count == 1 and control_loop.reevaluations == 1
+        assert elapsed < 0.5
+    finally:
+        device.close_clients()
+        connection.close()
+        stop_sensor_caches()
+        device.cleanup_actuators()
+        set_client_factory(None)
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_preset_event()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
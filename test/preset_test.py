@@ -0,0 +1,54 @@
+"""
+프리셋 파싱 테스트
+
+'key=value;...' 문자열이 숫자로 변환되고, 제어 임계값이 미리 계산되며,
+잘못된 값은 거부되는지 확인합니다.
+"""
+from mqtt.preset import Preset, parse_preset_payload
+
+
+def test_preset():
+    print("=" * 70)
+    print("🌱 프리셋 파싱 테스트")
+    print("=" * 70)
+
+    print("\n[1] 문자열 파싱 (공백/빈 항목 허용)")
+    params = parse_preset_payload(" OptimalTemp = 27 ;OptimalHumidity=55;;Co2Level=900; ")
+    assert params == {'OptimalTemp': '27', 'OptimalHumidity': '55', 'Co2Level': '900'}, f"실제: {params}"
+
+    print("\n[2] 숫자 변환 + 기본값 병합 + 임계값 계산")
+    preset = Preset.from_payload("OptimalTemp=27;OptimalHumidity=55;Co2Level=900")
+    print(f"   {preset}")
+    assert preset.optimal_temp == 27.0 and preset.soil_moisture == 2000.0
+    assert (preset.temp_low, preset.temp_high) == (25.0, 29.0)
+    assert (preset.humidity_low, preset.humidity_high) == (50.0, 65.0)
+    assert (preset.co2_release, preset.co2_recover) == (750.0, 800.0)
+    assert preset.get('OptimalTemp') == 27.0, "dict 방식 조회 호환"
+
+    print("\n[3] 이전 프리셋 위에 일부만 덮어쓰기")
+    updated = Preset.from_payload("SoilMoisture=2500;PlantName=basil", base=preset)
+    assert updated.optimal_temp == 27.0 and updated.soil_moisture == 2500.0
+    assert updated.soil_dry == 3000.0 and updated.get('PlantName') == 'basil'
+    assert preset.soil_moisture == 2000.0, "기존 객체는 바뀌지 않아야 함"
+
+    print("\n[4] CO2 복귀 기준은 목표값을 넘지 않음")
+    low = Preset({'Co2Level': 100})
+    assert (low.co2_release, low.co2_recover) == (0.0, 50.0)
+
+    print("\n[5] 잘못된 값 거부")
+    for payload in ("OptimalTemp=hot", "OptimalHumidity=150", "no pairs"):
+        try:
+            Preset.from_payload(payload)
+        except ValueError as e:
+            print(f"   거부: {e}")
+        else:
+            raise AssertionError(f"거부되어야 함: {payload}")
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_preset()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,115 @@
+"""
+센서 캐시 폴링 간격 테스트
+
+하드웨어 없이 가짜 센서로 백오프/적응형 간격과
+공유 스케줄러 스레드 하나로 여러 센서를 읽는지, 제거 후 바로 다시 등록해도 한 번씩만 도는지 확인합니다.
+"""
+import threading
+import time
+from service.sensor_cache import SensorCache
+from service.sensor_scheduler import SensorScheduler
+
+
+class FakeSensor:
+    """정해진 값 목록을 순서대로 반환하는 가짜 센서"""
+    def __init__(self, values):
+        self.values = list(values)
+        self.reads = 0
+        self.threads = set()
+
+    def read(self):
+        self.threads.add(threading.current_thread().name)
+        value = self.values[min(self.reads, len(self.values) - 1)]
+        self.reads += 1
+        return value
+
+
+class CountingJob:
+    """실행 시각을 기록하는 스케줄러 작업"""
+    def __init__(self, interval):
+        self.interval = interval
+        self.times = []
+
+    def poll(self):
+        self.times.append(time.monotonic())
+        return self.interval
+
+
+def test_sensor_cache():
+    print("=" * 70)
+    print("🔄 센서 캐시 폴링 테스트")
+    print("=" * 70)
+
+    print("\n[1] 연속 실패 시 지수 백오프")
+    cache = SensorCache(FakeSensor([(None, None)]), "DHT11", interval=2.0, max_backoff=30.0)
+    delays = [cache.poll() for _ in range(5)]
+    print(f"   간격: {delays}")
+    assert delays == [4.0, 8.0, 16.0, 30.0, 30.0], f"실제: {delays}"
+    assert cache.get() is None
+    assert not cache.wait_ready(0)
+
+    print("\n[2] 성공 시 백오프 해제 및 값 저장 (준비 이벤트 설정)")
+    cache.sensor = FakeSensor([(24.0, 60.0)])
+    assert cache.poll() == 2.0
+    assert cache.get() == (24.0, 60.0)
+    assert cache.wait_ready(0)
+
+    print("\n[3] 안정적이면 간격 증가, 급변하면 최소 간격")
+    cache = SensorCache(FakeSensor([800, 802, 801, 800, 900]), "CO2",
+                        interval=5.0, min_interval=5.0, max_interval=30.0, change_threshold=30)
+    delays = [cache.poll() for _ in range(5)]
+    print(f"   간격: {delays}")
+    assert delays[0] == 5.0
+    assert delays[1] < delays[2] < delays[3] <= 30.0
+    assert delays[4] == 5.0, "급변 시 최소 간격으로 돌아와야 함"
+
+    print("\n[4] max_age를 넘긴 값은 None (allow_stale로 조회 가능)")
+    cache = SensorCache(FakeSensor([(24.0, 60.0)]), "DHT11", interval=2.0, max_age=60.0)
+    assert cache.get() is None and cache.age() is None, "읽기 전에는 값 없음"
+    cache.poll()
+    assert cache.get() == (24.0, 60.0) and cache.age() < 1.0
+    cache.last_time -= 61.0  # 61초 전 값으로 만들기
+    assert cache.get() is None, "오래된 값은 None"
+    assert cache.get(allow_stale=True) == (24.0, 60.0)
+    value, age, stale = cache.get_entry()
+    assert stale and age > 60.0
+    assert (cache.success_count, cache.failure_count) == (1, 0)
+
+    print("\n[5] 스케줄러 스레드 하나로 여러 센서 읽기")
+    scheduler = SensorScheduler(name="test-scheduler")
+    scheduler.start()
+    sensors = [FakeSensor([(20.0, 50.0)]) for _ in range(4)]
+    caches = [SensorCache(s, f"DHT11-{i}", interval=0.05, scheduler=scheduler) for i, s in enumerate(sensors)]
+    for c in caches:
+        c.start()
+    time.sleep(0.3)
+    scheduler.stop()
+    threads = set().union(*(s.threads for s in sensors))
+    print(f"   읽기 스레드: {threads}")
+    assert threads == {"test-scheduler"}
+    assert all(s.reads >= 2 for s in sensors)
+    assert all(c.get() == (20.0, 50.0) for c in caches)
+
+    print("\n[6] 제거 후 예전 항목이 남아 있을 때 다시 등록해도 주기마다 한 번만 실행")
+    scheduler = SensorScheduler(name="test-scheduler")
+    scheduler.start()
+    job = CountingJob(0.1)
+    scheduler.add(job)
+    time.sleep(0.03)  # 첫 실행 후 다음 항목(0.1초 뒤)이 힙에 있음
+    scheduler.remove(job)
+    scheduler.add(job)
+    time.sleep(0.55)
+    scheduler.stop()
+    gaps = [b - a for a, b in zip(job.times[1:], job.times[2:])]
+    print(f"   실행 {len(job.times)}회")
+    assert len(job.times) <= 8, f"실행 {len(job.times)}회 (중복 실행)"
+    assert min(gaps) > 0.05, f"간격: {gaps}"
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_sensor_cache()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
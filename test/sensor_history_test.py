@@ -0,0 +1,58 @@
+"""
+센서 이력 링 버퍼 테스트
+
+고정 크기 버퍼가 오래된 값을 덮어쓰는지, 구간 통계(평균/최소/최대/기울기)가
+맞게 계산되는지 확인합니다.
+"""
+from service.sensor_history import RingBuffer, SensorHistory
+
+
+def test_sensor_history():
+    print("=" * 70)
+    print("📊 센서 이력 링 버퍼 테스트")
+    print("=" * 70)
+
+    print("\n[1] 가득 차면 가장 오래된 값부터 덮어쓰기")
+    buf = RingBuffer(capacity=5)
+    for i in range(8):
+        buf.append(float(i), timestamp=100.0 + i)
+    times, values = buf.window()
+    print(f"   값: {list(values)}")
+    assert len(buf) == 5
+    assert list(values) == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert list(times) == [103.0, 104.0, 105.0, 106.0, 107.0]
+    assert buf.latest() == 7.0
+
+    print("\n[2] 시간/개수 구간 통계")
+    stats = buf.stats(seconds=2.0, now=107.0)
+    print(f"   최근 2초: {stats}")
+    assert stats['count'] == 3 and stats['mean'] == 6.0
+    assert stats['min'] == 5.0 and stats['max'] == 7.0
+    assert buf.stats(count=2)['mean'] == 6.5
+
+    print("\n[3] 기울기 (초당 변화량)")
+    buf = RingBuffer(capacity=10)
+    for i in range(10):
+        buf.append(20.0 + 0.5 * i, timestamp=1000.0 + 10 * i)
+    slope = buf.stats()['slope']
+    print(f"   기울기: {slope:.4f}/초")
+    assert abs(slope - 0.05) < 1e-9
+
+    print("\n[4] 슬롯/항목별 저장소")
+    history = SensorHistory(capacity=4)
+    history.record(1, 'temp', 24.0)
+    history.record(1, 'temp', None)  # 무시
+    history.record(1, 'temp', 26.0)
+    history.record(2, 'temp', 10.0)
+    assert history.mean(1, 'temp') == 25.0
+    assert history.mean(2, 'temp') == 10.0
+    assert history.stats(3, 'temp') is None
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_sensor_history()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
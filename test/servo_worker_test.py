@@ -0,0 +1,44 @@
+"""
+서보모터 작업 스레드 테스트
+
+시뮬레이션 HAL로 set_angle()이 바로 반환되고 최신 명령만 실행되는지,
+cleanup() 이후의 명령은 기다리지 않고 바로 실패하는지 확인합니다.
+"""
+from hal.backend import set_backend, SIM
+
+set_backend(SIM)
+
+from Actuator.servomotor import ServoMotor  # noqa: E402
+
+
+def test_servo_worker():
+    print("=" * 70)
+    print("🫧 서보모터 작업 스레드 테스트")
+    print("=" * 70)
+
+    servo = ServoMotor(40, settle_time=0.0)
+
+    print("\n[1] 명령은 작업 스레드에서 처리")
+    assert servo.set_angle(90, wait=True).result(timeout=2.0) == 90
+    assert servo.angle == 90
+
+    print("\n[2] cleanup() 이후 명령은 바로 실패 (wait=True도 멈추지 않음)")
+    servo.cleanup()
+    future = servo.set_angle(0)
+    assert future.done() and isinstance(future.exception(), RuntimeError)
+    try:
+        servo.set_angle(0, wait=True)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("정리된 서보에 wait=True 명령이 통과")
+    assert servo.angle == 90
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_servo_worker()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,112 @@
+"""
+시작 시간 테스트
+
+드라이버/메인 모듈 import만으로는 하드웨어 라이브러리를 불러오지 않는지 확인하고,
+시뮬레이션 HAL(센서 지연 포함)과 로컬 브로커로 4슬롯 디바이스가 고정 대기 없이
+(슬롯 동시 초기화 → 센서 첫 값/프리셋 수신 이벤트 대기) 첫 제어 주기까지 가는 시간을 잽니다.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from hal.backend import set_backend, SIM
+
+set_backend(SIM)
+
+from hal import sim  # noqa: E402
+from benchmarks.local_broker import LocalBroker  # noqa: E402
+from mqtt.mqtt_connection import MqttConnection, set_client_factory  # noqa: E402
+from service.config import parse_config  # noqa: E402
+from service.device import FarmDevice  # noqa: E402
+from service.read_sensors import stop_sensor_caches  # noqa: E402
+from service.startup import StartupTimer  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def slot_config(slot):
+    base = 400 + slot * 10
+    actuators = {"heater": [base, base + 1], "led": [base + 2, base + 3, base + 4],
+                 "water_ib1": base + 5, "water_ib2": base + 6, "fan": [base + 7, base + 8]}
+    if slot == 1:
+        actuators["servo"] = base + 9
+    return {"actuators": actuators,
+            "sensors": {"dht11_pin": f"D{slot + 4}", "photo_channel": slot * 2 - 2,
+                        "soil_channel": slot * 2 - 1, "co2_port": f"/dev/sim{base}"}}
+
+
+CONFIG = {
+    "broker": "local",
+    "interval": 0.2,
+    "devices": [{"serial": "A4777", "slots": {str(slot): slot_config(slot) for slot in range(1, 5)},
+                 "water_tank_pin": 27}],
+}
+
+
+def test_startup():
+    print("=" * 70)
+    print("⏱️  시작 시간 테스트")
+    print("=" * 70)
+
+    print("\n[1] main/gateway import만으로는 하드웨어 모듈을 불러오지 않음 (실제 백엔드)")
+    env = dict(os.environ, SMARTFARM_HAL="real")
+    result = subprocess.run(
+        [sys.executable, "-c", "import main, gateway; from hal import backend; print(sorted(backend._modules))"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]", f"실제: {result.stdout}"
+
+    print("\n[2] 4슬롯 디바이스 시작 (센서 지연 재현)")
+    sim.reset_world()
+    sim.get_world().failure_rate['dht11'] = 0.0  # 첫 값 대기 시간을 일정하게
+    broker = LocalBroker()
+    broker.add_preset_responder()
+    set_client_factory(broker.client)
+    config = parse_config(CONFIG)
+    startup = StartupTimer()
+    connection = MqttConnection("local")
+    device = FarmDevice(config.devices[0], connection)
+    try:
+        device.setup()
+        startup.mark("slots")
+        assert len(device.controllers) == 4 and device.actuators[1]['servo'] is not None
+        device.request_presets()
+        device.start_sensors()
+        assert device.wait_sensors(timeout=3.0) == []
+        startup.mark("sensors")
+        assert device.wait_presets(timeout=2.0), "프리셋 응답 없음"
+        startup.mark("presets")
+
+        control_loop = device.create_loop(on_first_cycle=lambda: startup.finish("first_cycle"))
+
+        async def run_first_cycle():
+            task = asyncio.ensure_future(control_loop.run())
+            deadline = time.monotonic() + 3.0
+            while not startup.reported and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            control_loop.stop()
+            await task
+
+        asyncio.run(run_first_cycle())
+        timings = startup.as_dict()
+        print(f"   {startup.summary()}")
+        assert startup.reported and control_loop.cycle_count >= 1
+        assert list(timings) == ['slots', 'sensors', 'presets', 'first_cycle', 'total']
+        assert timings['total'] < 2.0, f"실제: {timings}"  # 고정 대기(3초 + 프리셋 폴링 1초 단위) 없음
+    finally:
+        device.close_clients()
+        connection.close()
+        stop_sensor_caches()
+        device.cleanup_actuators()
+        set_client_factory(None)
+
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_startup()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
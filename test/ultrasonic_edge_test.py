@@ -0,0 +1,124 @@
+"""
+에지 인터럽트 초음파 센서 테스트
+
+시뮬레이션 GPIO(hal/sim.py)의 에코 펄스로 백그라운드 측정, 즉시 반환,
+이상값 제거, 실제 수위 변화 추종, 에코 없음(타임아웃) 처리,
+에코 펄스가 끝난 뒤에 늦게 오는 콜백도 측정되는지 확인합니다.
+"""
+import queue
+import threading
+import time
+from hal.backend import set_backend, SIM
+
+set_backend(SIM)
+
+from hal import sim  # noqa: E402
+from sensor.HC_SR04 import EdgeUltrasonicSensor  # noqa: E402
+from service.sensor_scheduler import SensorScheduler  # noqa: E402
+
+TRIG, ECHO = 123, 124
+CALLBACK_DELAY = 0.005  # 근거리 에코 펄스(1ms 안팎)보다 긴 콜백 지연
+
+
+class LateCallbackGPIO:
+    """에지 콜백을 CALLBACK_DELAY만큼 늦게 전달하는 GPIO (콜백 스레드가 밀린 상황)"""
+
+    def __init__(self, gpio):
+        self._gpio = gpio
+        self._events = queue.SimpleQueue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def __getattr__(self, name):
+        return getattr(self._gpio, name)
+
+    def add_event_detect(self, channel, edge, callback=None, bouncetime=None):
+        def late(ch):
+            self._events.put((time.perf_counter() + CALLBACK_DELAY, callback, ch))
+        self._gpio.add_event_detect(channel, edge, callback=late, bouncetime=bouncetime)
+
+    def _run(self):
+        while True:
+            when, callback, channel = self._events.get()
+            time.sleep(max(when - time.perf_counter(), 0.0))
+            callback(channel)
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_ultrasonic_edge():
+    print("=" * 70)
+    print("📏 에지 인터럽트 초음파 센서 테스트")
+    print("=" * 70)
+
+    world = sim.reset_world(latency_scale=0)
+    world.wire_ultrasonic(TRIG, ECHO)
+    world.set_signal('distance', TRIG, 30.0)
+    scheduler = SensorScheduler("ultrasonic-test")
+    scheduler.start()
+    ultrasonic = EdgeUltrasonicSensor(TRIG, ECHO, interval=0.02, window=5, outlier_cm=5.0,
+                                      scheduler=scheduler, gpio_module=sim.gpio)
+
+    print("\n[1] 시작 전/첫 측정 전에는 None")
+    assert ultrasonic.read() is None
+
+    print("\n[2] 백그라운드 측정 후 read()는 대기 없이 추정값 반환")
+    ultrasonic.start()
+    assert ultrasonic.wait_ready(2.0)
+    assert wait_for(lambda: ultrasonic.measurements >= 5)
+    start = time.perf_counter()
+    distance = ultrasonic.read()
+    elapsed = time.perf_counter() - start
+    assert abs(distance - 30.0) < 3.0, f"거리: {distance}"
+    assert elapsed < 0.001, f"read() {elapsed * 1000:.3f}ms"
+
+    print("\n[3] 튀는 값 한두 번은 버림")
+    ultrasonic._lock.acquire()
+    try:
+        ultrasonic._add_sample(120.0)
+        ultrasonic._add_sample(121.0)
+    finally:
+        ultrasonic._lock.release()
+    assert abs(ultrasonic.read() - 30.0) < 3.0
+    assert ultrasonic.outliers >= 2
+
+    print("\n[4] 계속 다른 값이면 실제 변화로 보고 따라감")
+    world.set_signal('distance', TRIG, 12.0)
+    assert wait_for(lambda: abs(ultrasonic.read() - 12.0) < 3.0), f"거리: {ultrasonic.read()}"
+
+    print("\n[5] 에코가 없으면 타임아웃 집계, max_age가 지나면 None")
+    ultrasonic.max_age = 0.2
+    world.failure_rate['hcsr04'] = 1.0
+    assert wait_for(lambda: ultrasonic.timeouts >= 3)
+    assert wait_for(lambda: ultrasonic.read() is None)
+
+    ultrasonic.close()
+    print(f"   통계: {ultrasonic.stats()}")
+
+    print("\n[6] 콜백이 에코 펄스가 끝난 뒤에 와도 측정 (핀을 다시 읽지 않음)")
+    world.failure_rate['hcsr04'] = 0.0
+    world.wire_ultrasonic(TRIG + 10, ECHO + 10)
+    world.set_signal('distance', TRIG + 10, 15.0)  # 에코 펄스 약 0.9ms
+    late = EdgeUltrasonicSensor(TRIG + 10, ECHO + 10, interval=0.02, window=5,
+                                scheduler=scheduler, gpio_module=LateCallbackGPIO(sim.gpio))
+    late.start()
+    assert late.wait_ready(2.0), f"통계: {late.stats()}"
+    assert wait_for(lambda: late.measurements >= 5)
+    assert abs(late.read() - 15.0) < 3.0, f"거리: {late.read()}"
+    late.close()
+    scheduler.stop()
+    print(f"   통계: {late.stats()}")
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_ultrasonic_edge()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")
@@ -0,0 +1,111 @@
+"""
+에지 인터럽트 물받이 수위 센서 테스트
+
+시뮬레이션 GPIO(hal/sim.py)로 입력 핀을 직접 구동해서 디바운스(짧은 떨림 무시),
+상태 변경 알림, 넘침 감지 즉시 물펌프 정지(다음 제어 주기를 기다리지 않음)를 확인합니다.
+"""
+import time
+from hal.backend import set_backend, SIM
+
+set_backend(SIM)
+
+from hal import sim  # noqa: E402
+from sensor.water import EdgeWaterLevelSensor  # noqa: E402
+from service.actuator_control import ActuatorController  # noqa: E402
+from service.control_loop import ControlLoop  # noqa: E402
+from service.read_sensors import stop_sensor_caches  # noqa: E402
+from service.water_tank_monitor import WaterTankMonitor  # noqa: E402
+from Actuator.gpio_output import GPIOOutputBank  # noqa: E402
+from Actuator.heater import Heater  # noqa: E402
+from Actuator.water_pump import WaterPump  # noqa: E402
+from Actuator.ventilation_fan import VentilationFan  # noqa: E402
+from Actuator.led import LED  # noqa: E402
+
+WATER_PIN = 226
+
+
+class MockMqttClient:
+    def __init__(self):
+        self.notifications = []
+
+    def send_notification_logs(self, message):
+        self.notifications.append(message)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_water_level_edge():
+    print("=" * 70)
+    print("💧 에지 인터럽트 물받이 수위 센서 테스트")
+    print("=" * 70)
+
+    sim.reset_world(latency_scale=0)
+
+    print("\n[1] 짧은 떨림은 무시, 유지되면 한 번만 알림")
+    sensor = EdgeWaterLevelSensor(WATER_PIN, debounce=0.05, gpio_module=sim.gpio)
+    changes = []
+    sensor.add_change_listener(changes.append)
+    sensor.start()
+    assert sensor.read() is False
+    sim.gpio.set_input(WATER_PIN, 1)
+    time.sleep(0.01)
+    sim.gpio.set_input(WATER_PIN, 0)  # 물 튐
+    time.sleep(0.1)
+    assert changes == [] and sensor.read() is False, f"실제: {changes}"
+    sim.gpio.set_input(WATER_PIN, 1)
+    assert wait_for(lambda: changes == [True])
+    assert sensor.read() is True
+    sensor.close()
+
+    print("\n[2] 넘침 감지 즉시 물펌프 정지 (제어 주기 밖)")
+    sim.gpio.set_input(WATER_PIN + 1, 0)
+    bank = GPIOOutputBank(sim.gpio)
+    pump = WaterPump(300, 301, bank=bank)
+    mqtt = MockMqttClient()
+    monitor = WaterTankMonitor(mqtt, "A1900")
+    controller = ActuatorController(Heater(302, bank=bank), pump, VentilationFan(303, bank=bank),
+                                    LED(304, bank=bank), monitor)
+    loop = ControlLoop([1], {}, {1: controller}, monitor, {}, False, interval=60,
+                       water_tank_pin=WATER_PIN + 1)
+    pump.turn_on()
+    assert bank.level(300) == 1
+    start = time.monotonic()
+    sim.gpio.set_input(WATER_PIN + 1, 1)
+    assert wait_for(lambda: not pump.is_on)
+    elapsed = time.monotonic() - start
+    print(f"   넘침 -> 펌프 정지 {elapsed * 1000:.0f}ms")
+    assert bank.level(300) == 0 and bank.level(301) == 0
+    assert monitor.overflow_status == "넘침" and monitor.should_block_watering()
+    assert mqtt.notifications and "물받이" in mqtt.notifications[0]
+
+    print("\n[3] 물이 빠지면 정상으로 복귀")
+    sim.gpio.set_input(WATER_PIN + 1, 0)
+    assert wait_for(lambda: monitor.overflow_status == "정상")
+    assert not pump.is_on  # 다시 켜는 것은 제어 엔진 몫
+
+    print("\n[4] 제어 주기 중의 넘침은 주기가 끝난 직후 정지 (제어 락 공유)")
+    pump.turn_on()
+    with loop._control_lock:  # 제어 주기 진행 중
+        sim.gpio.set_input(WATER_PIN + 1, 1)
+        time.sleep(0.2)
+        assert pump.is_on and monitor.overflow_status == "정상"
+    assert wait_for(lambda: not pump.is_on)
+    assert monitor.overflow_status == "넘침" and bank.level(300) == 0
+
+    loop.close()
+    stop_sensor_caches()
+    print("\n✅ 모든 테스트 통과!")
+
+
+if __name__ == "__main__":
+    try:
+        test_water_level_edge()
+    except AssertionError as e:
+        print(f"\n❌ 테스트 실패: {e}")